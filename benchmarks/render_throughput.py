@@ -0,0 +1,111 @@
+"""Rendering throughput benchmark, per editor mode.
+
+Builds the requests of a spec once, then times rendering them into a
+complete .http file with each editor mode's compiled renderer.
+
+    python benchmarks/render_throughput.py                 # synthetic spec
+    python benchmarks/render_throughput.py path/to/spec.json --rounds 10
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import EditorMode, HttpSettings
+from http_file_generator.models.http_file.renderer import get_renderer
+
+
+def synthetic_spec(operations: int) -> dict:
+    """A spec with explicit examples everywhere, so building needs no sampling."""
+    paths = {}
+    for i in range(operations // 2):
+        id_param = {
+            "name": "id",
+            "in": "path",
+            "required": True,
+            "example": "1",
+            "schema": {"type": "string"},
+        }
+        paths[f"/resource{i}/{{id}}"] = {
+            "get": {
+                "operationId": f"get{i}",
+                "summary": f"Get resource {i}",
+                "description": "Returns a resource.\nSecond line.",
+                "parameters": [
+                    id_param,
+                    {
+                        "name": "q",
+                        "in": "query",
+                        "example": "x",
+                        "schema": {"type": "string"},
+                    },
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "examples": {
+                                    "full": {"value": {"items": list(range(20))}},
+                                    "empty": {"value": {"items": []}},
+                                }
+                            }
+                        },
+                    }
+                },
+            },
+            "post": {
+                "operationId": f"create{i}",
+                "parameters": [id_param],
+                "requestBody": {
+                    "content": {
+                        "application/json": {"example": {"a": 1, "b": [1, 2, 3]}}
+                    }
+                },
+                "responses": {"201": {"description": "Created"}},
+            },
+        }
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Benchmark", "version": "1.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": paths,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("spec", nargs="?", help="OpenAPI spec (default: synthetic)")
+    parser.add_argument("--operations", type=int, default=4000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spec = args.spec
+        if spec is None:
+            spec = Path(tmp) / "spec.json"
+            spec.write_text(json.dumps(synthetic_spec(args.operations)))
+        requests = HtttpFileGenerator(
+            spec, settings=HttpSettings(include_examples=True, include_schema=True)
+        ).requests
+
+    print(f"{len(requests)} requests, best of {args.rounds} rounds")
+    for mode in EditorMode:
+        renderer = get_renderer(mode, include_examples=True, include_schema=True)
+        best = float("inf")
+        size = 0
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            size = len(renderer.render_file(requests))
+            best = min(best, time.perf_counter() - start)
+        print(
+            f"{mode.value:>8}: {best * 1000:8.1f} ms  "
+            f"{len(requests) / best:10.0f} req/s  {size / best / 2**20:7.1f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
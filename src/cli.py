@@ -1,6 +1,14 @@
+import asyncio
 import json
+import os
+import re
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import partial
 from pathlib import Path
-from typing import Any, NoReturn
+from typing import Any, Callable, Iterator, NoReturn
+from urllib.parse import urlparse
 from pydantic_core import Url
 
 try:
@@ -11,7 +19,50 @@ except ImportError:
 import typer
 
 from http_file_generator import HtttpFileGenerator
-from http_file_generator.models import METHOD, Filemode, EditorMode, HttpSettings, OpenApiParser
+from http_file_generator.http_file_generator import local_dependencies, read_spec
+from http_file_generator.models import (
+    METHOD,
+    Filemode,
+    EditorMode,
+    HttpSettings,
+    OpenApiParser,
+    OperationSelection,
+    ShardBy,
+)
+from http_file_generator.models.manifest import (
+    BatchJournal,
+    BatchManifest,
+    BatchManifestEntry,
+    BatchReport,
+    ResultStream,
+    SpecMetrics,
+    SpecResult,
+)
+from http_file_generator.models.manifest.batch_report import is_ndjson
+from http_file_generator.models.manifest.batch_journal import BATCH_JOURNAL_FILENAME
+from http_file_generator.models.manifest.batch_manifest import BATCH_MANIFEST_FILENAME
+from http_file_generator.models.utils.archive import ArchiveWriter, archive_format
+from http_file_generator.models.utils.component_cache import (
+    ComponentCache,
+    use_component_cache,
+)
+from http_file_generator.models.utils.fetch import fetch_text_bounded
+from http_file_generator.models.utils.fingerprint import digest
+from http_file_generator.models.utils.partition import partition_by_cost
+from http_file_generator.models.utils.progress import (
+    ProgressCounter,
+    ProgressDisplay,
+    track_progress,
+)
+from http_file_generator.models.utils.process_pool import (
+    DeadlineProcessPool,
+    thread_safe_context,
+)
+from http_file_generator.models.utils.spec_stats import compute_spec_stats
+from http_file_generator.models.utils.timing import StageTimings, record_stage_timings
+from http_file_generator.models.utils.watcher import FileWatcher
+from http_file_generator.models.utils.writer import content_digest, file_digest
+from http_file_generator.watch import Regeneration, WatchSession, find_specs
 
 app = typer.Typer(
     help="Generate .http files and env files from an OpenAPI spec.",
@@ -29,6 +80,27 @@ def _json_print(data: Any) -> None:
     typer.echo(json.dumps(data, indent=2, ensure_ascii=False, default=str))
 
 
+def _secho(display: ProgressDisplay | None, message: str, **kwargs: Any) -> None:
+    """typer.secho that does not garble the progress line, if one is shown."""
+    with display.suspended() if display else nullcontext():
+        typer.secho(message, **kwargs)
+
+
+@contextmanager
+def _show_progress(counter: ProgressCounter | None) -> Iterator[None]:
+    """Count the operations built in the block and show progress, if enabled."""
+    if counter is None:
+        yield
+        return
+    with track_progress(counter), ProgressDisplay(counter):
+        yield
+
+
+def _print_progress(counter: ProgressCounter | None) -> None:
+    if counter is not None:
+        typer.echo(f"Progress: {counter.describe()}", err=True)
+
+
 def _is_url(s: str | Path) -> bool:
     """Check if the given value is a URL (starts with http:// or https://)."""
     if isinstance(s, Path):
@@ -85,6 +157,76 @@ def _method_upper_list(methods: list[str] | None) -> list[str] | None:
     return result
 
 
+def _build_selection(
+    tags: list[str] | None,
+    path_globs: list[str] | None,
+    operation_ids: list[str] | None,
+    methods: list[str] | None,
+) -> OperationSelection:
+    return OperationSelection(
+        tags=tags or [],
+        path_globs=path_globs or [],
+        operation_ids=operation_ids or [],
+        methods=_method_upper_list(methods) or [],
+    )
+
+
+def _format_size(size: int) -> str:
+    """Human-readable size, e.g. 1.2 MB."""
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
+
+
+def _multi_target_dir(out_path: Path) -> Path:
+    """Directory MULTI mode writes to for an output path."""
+    return out_path.parent / out_path.stem if out_path.suffix == ".http" else out_path
+
+
+def _mode_out_path(out_path: Path, editor_mode: EditorMode) -> Path:
+    """Output path for one editor mode when several are generated at once.
+
+    api.http becomes api.kulala.http (and the MULTI directory api.kulala/).
+    """
+    if out_path.suffix == ".http":
+        return out_path.with_name(f"{out_path.stem}.{editor_mode.value}.http")
+    return out_path.with_name(f"{out_path.name}.{editor_mode.value}")
+
+
+def _output_variant(
+    gen: HtttpFileGenerator, editor_mode: EditorMode, filemode: Filemode
+) -> HtttpFileGenerator:
+    """The generator rendering one (editor mode, filemode) output."""
+    if (editor_mode, filemode) == (gen.settings.editor_mode, gen.settings.filemode):
+        return gen
+    return gen.with_settings(editor_mode=editor_mode, filemode=filemode)
+
+
+def _archive_member(root: Path, directory: Path, filename: str) -> str:
+    """Archive path of filename in directory; files outside root go to the top."""
+    try:
+        relative = directory.resolve().relative_to(root.resolve())
+    except ValueError:
+        relative = Path()
+    return (relative / filename).as_posix()
+
+
+def _print_tool_compatibility() -> None:
+    typer.secho("\n Tool Compatibility:", fg=typer.colors.BLUE, bold=True)
+    typer.echo(" Kulala (Neovim): Full support including environment files")
+    typer.echo(" PyCharm/IntelliJ: Full support with JetBrains HTTP Client")
+    typer.echo(
+        " httpyac (VS Code): Full support - use httpyac extension, not REST Client"
+    )
+    typer.echo(
+        " VS Code REST Client: Limited support - environment variables need manual setup"
+    )
+    typer.echo("\n BASE_URL is now managed per-environment in the env files!")
+
+
 def _parse_filemode(value: str | None) -> Filemode:
     if value is None:
         return Filemode.SINGLE
@@ -93,7 +235,16 @@ def _parse_filemode(value: str | None) -> Filemode:
         return Filemode.SINGLE
     if v in ("multi", "m"):
         return Filemode.MULTI
-    _abort("Invalid value for --filemode: choose 'single' or 'multi'.")
+    if v in ("sharded", "shard"):
+        return Filemode.SHARDED
+    _abort("Invalid value for --filemode: choose 'single', 'multi' or 'sharded'.")
+
+
+def _parse_shard_by(value: str) -> ShardBy:
+    try:
+        return ShardBy(value.strip().lower())
+    except ValueError:
+        _abort("Invalid value for --shard-by: choose 'tag', 'prefix' or 'size'.")
 
 
 def _parse_editor_mode(value: str | None) -> EditorMode:
@@ -122,21 +273,35 @@ def generate(
         "-o",
         help="Output .http file path. Defaults to <spec>.http next to the spec.",
     ),
-    filemode=typer.Option(
+    filemode: list[str] | None = typer.Option(
         None,
         "--filemode",
         "-f",
-        help="File generation mode: SINGLE (one .http) or MULTI (one per path).",
+        help="File generation mode: SINGLE (one .http), MULTI (one per path) or SHARDED (see --shard-by). Can be passed multiple times.",
+    ),
+    shard_by: str = typer.Option(
+        "tag",
+        "--shard-by",
+        help="SHARDED mode grouping: tag (first tag), prefix (leading path segments) or size (limits only).",
+    ),
+    shard_prefix_depth: int = typer.Option(
+        1, "--shard-prefix-depth", min=1, help="Path segments used by --shard-by prefix."
+    ),
+    shard_max_requests: int | None = typer.Option(
+        None, "--shard-max-requests", min=1, help="Split shards above this many requests."
+    ),
+    shard_max_bytes: int | None = typer.Option(
+        None, "--shard-max-bytes", min=1, help="Split shards above this many bytes."
     ),
     base_url=typer.Option(
         None,
         "--base-url",
         help="Optional base URL to include in generated .http files.",
     ),
-    mode: str = typer.Option(
-        "default",
+    mode: list[str] | None = typer.Option(
+        None,
         "--mode",
-        help="Editor mode: default (cross-compatible), kulala (Neovim), pycharm (JetBrains), vscode (httpyac).",
+        help="Editor mode: default (cross-compatible), kulala (Neovim), pycharm (JetBrains), vscode (httpyac). Can be passed multiple times.",
     ),
     include_examples: bool = typer.Option(
         False,
@@ -148,9 +313,35 @@ def generate(
         "--include-schema/--no-include-schema",
         help="Include commented request body examples next to each request.",
     ),
+    body_file_threshold: int | None = typer.Option(
+        None,
+        "--body-file-threshold",
+        min=0,
+        help="Write bodies and examples larger than this many characters to bodies/*.json and reference them with '< ./bodies/<name>.json'.",
+    ),
     overwrite: bool = typer.Option(
         False, "--overwrite/--no-overwrite", help="Overwrite existing files if present."
     ),
+    fsync: bool = typer.Option(
+        False,
+        "--fsync",
+        help="Flush every written file to disk before replacing the previous one.",
+    ),
+    prune: bool = typer.Option(
+        False,
+        "--prune",
+        help="MULTI mode: delete .http and body files of paths no longer in the spec.",
+    ),
+    archive=typer.Option(
+        None,
+        "--archive",
+        help="Write all generated files, including env files, into this .zip or .tar(.gz/.bz2/.xz) archive instead of the file system.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Only rebuild operations that changed since the last run (implies --overwrite).",
+    ),
     env: bool = typer.Option(
         True,
         "--env/--no-env",
@@ -173,6 +364,26 @@ def generate(
         "--private-env-filename",
         help="Private env filename.",
     ),
+    tag: list[str] | None = typer.Option(
+        None,
+        "--tag",
+        help="Only generate operations with this tag; can be passed multiple times.",
+    ),
+    path_glob: list[str] | None = typer.Option(
+        None,
+        "--path-glob",
+        help="Only generate operations whose path matches this glob (e.g. '/users/*').",
+    ),
+    operation_id: list[str] | None = typer.Option(
+        None,
+        "--operation-id",
+        help="Only generate operations with this operationId; can be passed multiple times.",
+    ),
+    method: list[str] | None = typer.Option(
+        None,
+        "--method",
+        help="Only generate operations using this HTTP method; can be passed multiple times.",
+    ),
     dry_run: bool = typer.Option(
         False,
         "--dry-run",
@@ -184,6 +395,11 @@ def generate(
         "-q",
         help="Suppress informational output (only show errors and file paths).",
     ),
+    progress: bool = typer.Option(
+        False,
+        "--progress",
+        help="Show operations completed, operations per second and ETA on stderr.",
+    ),
 ) -> None:
     """
     Generate a .http file from an OpenAPI spec.
@@ -193,14 +409,12 @@ def generate(
     config = _load_config()
 
     # Apply defaults if not explicitly provided
-    if mode == "default":  # Only override if using default
+    if not mode:
         config_mode = _get_config_value(config, "mode")
-        if config_mode:
-            mode = str(config_mode)
-    if filemode is None:
+        mode = [str(config_mode)] if config_mode else ["default"]
+    if not filemode:
         config_filemode = _get_config_value(config, "filemode")
-        if config_filemode:
-            filemode = str(config_filemode)
+        filemode = [str(config_filemode)] if config_filemode else [None]
     if base_url is None:
         config_base_url = _get_config_value(config, "base_url")
         if config_base_url:
@@ -218,6 +432,9 @@ def generate(
         if config_schema is True:
             include_schema = True
 
+    # Incremental runs update the previous output in place
+    overwrite = overwrite or incremental
+
     spec = _validate_spec_source(spec)
     # Derive output path (file or directory depending on filemode)
     if out is not None:
@@ -229,49 +446,79 @@ def generate(
     else:
         out_path = Path(spec).with_suffix(".http")
 
+    archive_path = Path(archive) if archive is not None else None
+    if archive_path is not None:
+        if incremental:
+            _abort("--archive cannot be combined with --incremental")
+        try:
+            archive_format(archive_path)
+        except ValueError as e:
+            _abort(str(e))
+
+    selection = _build_selection(tag, path_glob, operation_id, method)
+    filemodes = list(dict.fromkeys(_parse_filemode(v) for v in filemode))
+    editor_modes = list(dict.fromkeys(_parse_editor_mode(v) for v in mode))
+    shard_strategy = _parse_shard_by(shard_by)
+    # Every (editor mode, filemode) combination is rendered from one build
+    outputs = [
+        (em, fm, _mode_out_path(out_path, em) if len(editor_modes) > 1 else out_path)
+        for em in editor_modes
+        for fm in filemodes
+    ]
     try:
-        fm = _parse_filemode(filemode)
-        em = _parse_editor_mode(mode)
         settings = HttpSettings(
-            filemode=fm,
+            filemode=filemodes[0],
             baseURL=Url(base_url) if base_url else None,
             include_examples=include_examples,
             include_schema=include_schema,
-            editor_mode=em,
+            editor_mode=editor_modes[0],
+            selection=selection,
+            body_file_threshold=body_file_threshold,
+            shard_by=shard_strategy,
+            shard_prefix_depth=shard_prefix_depth,
+            shard_max_requests=shard_max_requests,
+            shard_max_bytes=shard_max_bytes,
+            prune_orphans=prune,
+            fsync=fsync,
         )
-        gen = HtttpFileGenerator(spec, settings=settings)
+        counter = ProgressCounter(phase="loading spec") if progress else None
+        with _show_progress(counter):
+            gen = HtttpFileGenerator(spec, settings=settings)
     except Exception as e:
         _abort(f"Failed to parse spec: {e}")
 
     # Dry-run mode: preview output without writing
     if dry_run:
         typer.secho("=== DRY RUN MODE ===", fg=typer.colors.YELLOW, bold=True)
-        typer.secho(f"\nWould write to: {out_path}", fg=typer.colors.CYAN)
-        if fm == Filemode.MULTI:
-            target_dir = (
-                out_path.parent / out_path.stem
-                if out_path.suffix == ".http"
-                else out_path
-            )
-            typer.secho(f"Mode: MULTI (directory: {target_dir})", fg=typer.colors.CYAN)
-        else:
-            typer.secho("Mode: SINGLE", fg=typer.colors.CYAN)
+        if archive_path is not None:
+            typer.secho(f"\nWould write archive: {archive_path}", fg=typer.colors.CYAN)
+        for em, fm, target in outputs:
+            typer.secho(f"\nWould write to: {target}", fg=typer.colors.CYAN)
+            if fm != Filemode.SINGLE:
+                typer.secho(
+                    f"Mode: {fm.name} (directory: {_multi_target_dir(target)})",
+                    fg=typer.colors.CYAN,
+                )
+            else:
+                typer.secho("Mode: SINGLE", fg=typer.colors.CYAN)
+            if len(editor_modes) > 1:
+                typer.secho(f"Editor mode: {em.value}", fg=typer.colors.CYAN)
 
         typer.secho("\n--- HTTP File Content Preview ---", fg=typer.colors.BLUE)
-        content = gen.http_file.to_http_file(
-            include_examples=settings.include_examples,
-            include_schema=settings.include_schema,
-            editor_mode=settings.editor_mode,
-        )
-        # Show first 100 lines or full content if shorter
-        lines = content.splitlines()
-        preview_lines = lines[:100]
-        typer.echo("\n".join(preview_lines))
-        if len(lines) > 100:
+        # Show first 100 lines; only the requests needed for them are built
+        preview = gen.preview(max_lines=100)
+        typer.echo("\n".join(preview.lines))
+        if preview.truncated:
             typer.secho(
-                f"\n... ({len(lines) - 100} more lines truncated)",
+                f"\n... (truncated after {len(preview.lines)} lines, "
+                f"{preview.rendered} of {preview.operations} operations rendered)",
                 fg=typer.colors.YELLOW,
             )
+        typer.secho(
+            f"\nOperations: {preview.operations}, "
+            f"estimated size: {_format_size(preview.estimated_size)}",
+            fg=typer.colors.CYAN,
+        )
 
         if env:
             env_target_dir = env_dir or out_path.parent
@@ -285,36 +532,124 @@ def generate(
         typer.secho("\n=== END DRY RUN ===", fg=typer.colors.YELLOW, bold=True)
         return
 
-    # Ensure write target based on mode
-    if fm == Filemode.SINGLE:
-        _ensure_write_target(out_path, overwrite)
+    if counter is not None:
+        # Incremental runs go over every operation once per output
+        counter.begin(
+            total_operations=gen.operation_count() * (len(outputs) if incremental else 1)
+        )
+    if len(outputs) > 1 and not incremental:
+        # Sample every operation once; each output only re-renders them
         try:
-            gen.to_http_file(out_path)
+            with _show_progress(counter):
+                gen.build_requests()
         except Exception as e:
-            _abort(f"Failed to write HTTP file: {e}")
-        if not quiet:
-            typer.secho(f"HTTP file generated: {out_path}", fg=typer.colors.GREEN)
-        default_env_dir = out_path.parent
-    else:
-        # MULTI mode: resolve target directory
-        target_dir = (
-            out_path.parent / out_path.stem if out_path.suffix == ".http" else out_path
-        )
-        if target_dir.exists() and not overwrite:
-            _abort(
-                f"Refusing to overwrite existing directory without --overwrite: {target_dir}"
-            )
-        target_dir.mkdir(parents=True, exist_ok=True)
+            _abort(f"Failed to build requests: {e}")
+
+    env_dirs: list[Path] = []
+    if archive_path is not None:
+        _ensure_write_target(archive_path, overwrite)
+        root = out_path.parent
+        has_valid_base_url = True
         try:
-            gen.to_http_file(target_dir)
+            with _show_progress(counter), ArchiveWriter(
+                archive_path, fsync=fsync
+            ) as bundle:
+                for em, fm, target in outputs:
+                    variant = _output_variant(gen, em, fm)
+                    for name, content in variant.iter_output_files(target):
+                        bundle.add(name, content)
+                    default_env_dir = (
+                        target.parent
+                        if fm == Filemode.SINGLE
+                        else _multi_target_dir(target)
+                    )
+                    env_target_dir = Path(env_dir) if env_dir else default_env_dir
+                    if env_target_dir not in env_dirs:
+                        env_dirs.append(env_target_dir)
+                if env:
+                    public_env, private_env, has_valid_base_url = (
+                        gen.env_file_contents(env_name)
+                    )
+                    for env_target_dir in env_dirs:
+                        bundle.add(
+                            _archive_member(root, env_target_dir, public_env_filename),
+                            public_env,
+                        )
+                        bundle.add(
+                            _archive_member(root, env_target_dir, private_env_filename),
+                            private_env,
+                        )
         except Exception as e:
-            _abort(f"Failed to write HTTP files: {e}")
+            _abort(f"Failed to write archive: {e}")
+        _print_progress(counter)
         if not quiet:
-            typer.secho(f"HTTP files generated under: {target_dir}", fg=typer.colors.GREEN)
-        default_env_dir = target_dir
+            typer.secho(
+                f"Archive written: {archive_path} ({bundle.count} files)",
+                fg=typer.colors.GREEN,
+            )
+        if not has_valid_base_url:
+            typer.secho(
+                "\nWarning: No valid base URL found in the OpenAPI spec.",
+                fg=typer.colors.YELLOW,
+                bold=True,
+            )
+            typer.echo(
+                "  The env file contains a placeholder. Please update BASE_URL manually."
+            )
+        if not quiet:
+            _print_tool_compatibility()
+        return
 
-    if env:
+    for em, fm, target in outputs:
+        variant = _output_variant(gen, em, fm)
+        # Ensure write target based on mode
+        if fm == Filemode.SINGLE:
+            _ensure_write_target(target, overwrite)
+            try:
+                with _show_progress(counter):
+                    variant.to_http_file(target, incremental=incremental)
+            except Exception as e:
+                _abort(f"Failed to write HTTP file: {e}")
+            if not quiet:
+                typer.secho(f"HTTP file generated: {target}", fg=typer.colors.GREEN)
+            default_env_dir = target.parent
+        else:
+            # MULTI and SHARDED modes: resolve target directory
+            target_dir = _multi_target_dir(target)
+            if target_dir.exists() and not overwrite:
+                _abort(
+                    f"Refusing to overwrite existing directory without --overwrite: {target_dir}"
+                )
+            target_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                with _show_progress(counter):
+                    variant.to_http_file(target_dir, incremental=incremental)
+            except Exception as e:
+                _abort(f"Failed to write HTTP files: {e}")
+            if not quiet:
+                typer.secho(
+                    f"HTTP files generated under: {target_dir}", fg=typer.colors.GREEN
+                )
+            default_env_dir = target_dir
+
+        if variant.incremental_stats is not None and not quiet:
+            stats = variant.incremental_stats
+            typer.echo(
+                f"Incremental: {stats.added} added, {stats.changed} changed, "
+                f"{stats.removed} removed, {stats.reused} reused"
+            )
+        if variant.write_stats is not None and not quiet:
+            written = variant.write_stats
+            typer.echo(
+                f"Files: {written.written} written, {written.unchanged} unchanged, "
+                f"{written.removed} removed"
+            )
         env_target_dir = env_dir or default_env_dir
+        if env_target_dir not in env_dirs:
+            env_dirs.append(env_target_dir)
+
+    _print_progress(counter)
+    for env_target_dir in env_dirs if env else []:
         public_env = env_target_dir / public_env_filename
         private_env = env_target_dir / private_env_filename
         if not overwrite:
@@ -346,16 +681,7 @@ def generate(
 
     # Inform about tool compatibility (unless quiet mode)
     if not quiet:
-        typer.secho("\n Tool Compatibility:", fg=typer.colors.BLUE, bold=True)
-        typer.echo(" Kulala (Neovim): Full support including environment files")
-        typer.echo(" PyCharm/IntelliJ: Full support with JetBrains HTTP Client")
-        typer.echo(
-            " httpyac (VS Code): Full support - use httpyac extension, not REST Client"
-        )
-        typer.echo(
-            " VS Code REST Client: Limited support - environment variables need manual setup"
-        )
-        typer.echo("\n BASE_URL is now managed per-environment in the env files!")
+        _print_tool_compatibility()
 
 
 @app.command("env")
@@ -474,6 +800,79 @@ def info(
                 typer.echo(f"  - {s['name']}: {s['type']}")
 
 
+@app.command("stats")
+def stats(
+    spec: str = typer.Argument(
+        ..., help="Path or URL to the OpenAPI spec (yaml/json)."
+    ),
+    top: int = typer.Option(
+        10, "--top", "-n", min=1, help="Number of most expensive entries to list."
+    ),
+    json_out: bool = typer.Option(False, "--json", help="Output as JSON."),
+) -> None:
+    """
+    Estimate what generating the spec will cost, without generating any samples.
+
+    Reports operation and schema counts, schema depth, $ref fan-out, recursive
+    schemas, enum sizes and an estimated sampling cost per operation (in schema
+    nodes that have to be generated).
+    """
+    spec = _validate_spec_source(spec)
+    try:
+        data = read_spec(spec)
+    except Exception as e:
+        _abort(f"Failed to parse spec: {e}")
+    if not isinstance(data, dict):
+        _abort("Failed to parse spec: document is not a mapping")
+
+    payload = compute_spec_stats(data, top=top)
+    if json_out:
+        _json_print(payload)
+        return
+
+    ops = payload["operations"]
+    schemas = payload["schemas"]
+    refs = payload["refs"]
+    enums = payload["enums"]
+    sampling = payload["sampling"]
+    typer.secho(f"Paths: {payload['paths']}", fg=typer.colors.CYAN, bold=True)
+    typer.secho(f"Operations: {ops['total']}", fg=typer.colors.CYAN, bold=True)
+    for k, v in ops["by_method"].items():
+        typer.echo(f"  {k:<7} {v}")
+    if ops["by_tag"]:
+        typer.secho("Operations by tag:", fg=typer.colors.CYAN, bold=True)
+        for k, v in ops["by_tag"].items():
+            typer.echo(f"  {k:<20} {v}")
+    typer.secho("\nSchemas:", fg=typer.colors.CYAN, bold=True)
+    typer.echo(f"  Components:  {schemas['components']}")
+    typer.echo(f"  Max depth:   {schemas['max_depth']}")
+    typer.echo(
+        f"  Recursive:   {', '.join(schemas['recursive']) if schemas['recursive'] else 'none'}"
+    )
+    typer.secho("\nReferences:", fg=typer.colors.CYAN, bold=True)
+    typer.echo(f"  Total: {refs['total']}  Distinct: {refs['distinct']}")
+    typer.echo(f"  Max fan-out of a schema: {refs['max_fan_out']}")
+    for r in refs["most_referenced"]:
+        typer.echo(f"  {r['count']:>6}  {r['ref']}")
+    typer.secho("\nEnums:", fg=typer.colors.CYAN, bold=True)
+    typer.echo(
+        f"  Count: {enums['count']}  Max size: {enums['max_size']}  Values: {enums['total_values']}"
+    )
+    typer.secho("\nEstimated sampling cost:", fg=typer.colors.CYAN, bold=True)
+    typer.echo(f"  Total: {sampling['total_cost']}  Mean per operation: {sampling['mean_cost']}")
+    if sampling["top_operations"]:
+        typer.secho(
+            f"\nTop {len(sampling['top_operations'])} most expensive operations:",
+            fg=typer.colors.CYAN,
+            bold=True,
+        )
+        for op in sampling["top_operations"]:
+            typer.echo(
+                f"  {op['cost']:>8}  {op['method']:<7} {op['path']}"
+                f"  (depth {op['depth']}, {op['sampled_schemas']} sampled)"
+            )
+
+
 @app.command("validate")
 def validate(
     spec: str = typer.Argument(
@@ -649,10 +1048,377 @@ def sample(
     _json_print(result)
 
 
+# Shared by all specs a process handles during one batch run
+_component_cache: ComponentCache | None = None
+
+
+def _batch_component_cache(cache_dir: Path | None) -> ComponentCache:
+    global _component_cache
+    if _component_cache is None or _component_cache.cache_dir != cache_dir:
+        _component_cache = ComponentCache(cache_dir)
+    return _component_cache
+
+
+def _batch_generate(
+    spec: Path,
+    settings: HttpSettings,
+    overwrite: bool,
+    env: bool,
+    env_name: str,
+    cache_dir: Path | None = None,
+    content: str | None = None,
+    source: str | None = None,
+) -> "_BatchOutcome":
+    """Load, build, render and write env files for one spec of a batch.
+
+    Runs in a worker process, so errors are returned rather than raised or
+    printed. Returns the success message and the written outputs, or None,
+    the error message and no outputs, followed by the spec's metrics either
+    way. External documents and component samples are shared with the other
+    specs the process handles.
+
+    For a spec fetched from source, content is its text and spec only names
+    the outputs, which are written next to it.
+    """
+    cache = _batch_component_cache(cache_dir)
+    document_hits, sample_hits = cache.documents.hits, cache.sample_hits
+    timings = StageTimings()
+    start = time.perf_counter()
+    with use_component_cache(cache), record_stage_timings(timings):
+        message, error, outputs, operations = _generate_batch_spec(
+            spec, settings, overwrite, env, env_name, content, source
+        )
+    metrics = SpecMetrics(
+        seconds={stage: round(value, 6) for stage, value in timings.seconds.items()},
+        total_seconds=round(time.perf_counter() - start, 6),
+        operations=operations,
+        output_bytes=_output_bytes(outputs),
+        document_cache_hits=cache.documents.hits - document_hits,
+        sample_cache_hits=cache.sample_hits - sample_hits,
+    )
+    return message, error, outputs, metrics
+
+
+# Success message or None, error or None, written outputs, and metrics (unset
+# when the worker did not report back)
+_BatchOutcome = tuple[str | None, str | None, list[Path], SpecMetrics | None]
+
+
+def _output_bytes(outputs: list[Path]) -> int:
+    """Total size of the output files and of the files in output directories."""
+    total = 0
+    for output in outputs:
+        files = output.rglob("*") if output.is_dir() else [output]
+        for path in files:
+            try:
+                if path.is_file():
+                    total += path.stat().st_size
+            except OSError:
+                pass
+    return total
+
+
+def _generate_batch_spec(
+    spec: Path,
+    settings: HttpSettings,
+    overwrite: bool,
+    env: bool,
+    env_name: str,
+    content: str | None = None,
+    source: str | None = None,
+) -> tuple[str | None, str | None, list[Path], int]:
+    """_batch_generate without the metrics, but with the operation count."""
+    operations = 0
+    try:
+        if content is None:
+            gen = HtttpFileGenerator(spec, settings=settings)
+        else:
+            gen = HtttpFileGenerator.from_text(
+                content, settings=settings, source=source
+            )
+        operations = gen.operation_count()
+        if settings.filemode == Filemode.SINGLE:
+            out_file = spec.with_suffix(".http")
+            if out_file.exists() and not overwrite:
+                raise RuntimeError(
+                    f"Refusing to overwrite existing file without --overwrite: {out_file}"
+                )
+            gen.to_http_file(out_file)
+            env_base_dir = spec.parent
+        else:
+            target_dir = spec.parent / spec.stem
+            if target_dir.exists() and not overwrite:
+                raise RuntimeError(
+                    f"Refusing to overwrite existing directory without --overwrite: {target_dir}"
+                )
+            target_dir.mkdir(parents=True, exist_ok=True)
+            gen.to_http_file(target_dir)
+            env_base_dir = target_dir
+        if env:
+            public_env = env_base_dir / "http-client.env.json"
+            private_env = env_base_dir / "http-client.private.env.json"
+            if overwrite or (not public_env.exists() and not private_env.exists()):
+                gen.to_env_files(public_env, private_env, env_name=env_name)
+    except Exception as e:
+        return None, str(e), [], operations
+    outputs = [out_file if settings.filemode == Filemode.SINGLE else target_dir]
+    if env:
+        outputs += [public_env, private_env]
+    if settings.filemode == Filemode.SINGLE:
+        return f"Generated: {out_file}", None, outputs, operations
+    return (
+        f"Generated ({settings.filemode.name}): {source or spec} -> {env_base_dir}",
+        None,
+        outputs,
+        operations,
+    )
+
+
+def _parse_shard(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        shard_index, shard_count = int(index), int(count)
+    except ValueError:
+        _abort("Invalid value for --shard: expected INDEX/COUNT, e.g. 1/4.")
+    if not 1 <= shard_index <= shard_count:
+        _abort("Invalid value for --shard: INDEX must be between 1 and COUNT.")
+    return shard_index, shard_count
+
+
+def _finish_progress(counter: ProgressCounter, outcome: _BatchOutcome) -> None:
+    metrics = outcome[3]
+    counter.finish_spec(metrics.operations if metrics else 0)
+
+
+def _progress_future(counter: ProgressCounter, future: Future) -> None:
+    if future.cancelled():
+        return
+    if future.exception() is None:
+        _finish_progress(counter, future.result())
+    else:
+        counter.finish_spec()
+
+
+def _checkpoint_future(
+    record: Callable[[Path, Any], None], spec: Path, future: Future
+) -> None:
+    if not future.cancelled() and future.exception() is None:
+        record(spec, future.result())
+
+
+def _relative_key(root: Path, path: Path) -> str:
+    """path relative to root as a manifest key (absolute if outside root)."""
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def _dependency_digests(root: Path, spec: Path) -> dict[str, str | None]:
+    """file_digest of every local file spec $refs, keyed like manifest outputs."""
+    return {
+        _relative_key(root, path): file_digest(path)
+        for path in sorted(local_dependencies(spec))
+    }
+
+
+def _read_url_list(path: Path) -> list[str]:
+    """Spec URLs listed in path, one per line, skipping blanks and # comments."""
+    urls = []
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def _url_output_names(urls: list[str]) -> list[str]:
+    """A distinct output name per URL, taken from the last segment of its path."""
+    names: list[str] = []
+    for url in urls:
+        parsed = urlparse(url)
+        stem = Path(parsed.path).stem or parsed.netloc
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "-", stem).strip("-.") or "spec"
+        name, count = stem, 1
+        while name in names:
+            count += 1
+            name = f"{stem}-{count}"
+        names.append(name)
+    return names
+
+
+async def _generate_fetched(
+    urls: list[str],
+    anchors: list[Path],
+    submit: Callable[[str, Path, str], Future],
+    concurrency: int,
+    report: Callable[[str, _BatchOutcome], None],
+    finished: Callable[[_BatchOutcome], None] | None = None,
+) -> None:
+    """Fetch up to concurrency specs at a time and generate each as it arrives.
+
+    submit hands a fetched spec to the worker pool, so generating one spec
+    overlaps with fetching the next ones. finished is called as soon as a
+    spec is done, report in list order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(url: str, anchor: Path) -> _BatchOutcome:
+        outcome = await fetch_and_generate(url, anchor)
+        if finished is not None:
+            finished(outcome)
+        return outcome
+
+    async def fetch_and_generate(url: str, anchor: Path) -> _BatchOutcome:
+        try:
+            content = await fetch_text_bounded(url, semaphore)
+        except ValueError as e:
+            return None, str(e), [], None
+        try:
+            return await asyncio.wrap_future(submit(url, anchor, content))
+        except Exception as e:
+            return None, str(e) or type(e).__name__, [], None
+
+    tasks = [
+        asyncio.create_task(process(url, anchor)) for url, anchor in zip(urls, anchors)
+    ]
+    # Report in list order, whatever order the specs finish in
+    for url, task in zip(urls, tasks):
+        report(url, await task)
+
+
+def _batch_urls(
+    urls_file: Path,
+    out_dir: Path | None,
+    settings: HttpSettings,
+    overwrite: bool,
+    env: bool,
+    env_name: str,
+    jobs: int | None,
+    timeout_per_spec: float | None,
+    cache_dir: Path | None,
+    fetch_concurrency: int,
+    result_file: Path | None,
+    report_file: Path | None,
+    progress: bool = False,
+) -> None:
+    """batch --urls: generate every spec listed in urls_file into out_dir."""
+    try:
+        urls = _read_url_list(urls_file)
+    except OSError as e:
+        _abort(f"Could not read URL list: {e}")
+    if not urls:
+        _abort("No spec URLs found to process.")
+    out_dir = out_dir or urls_file.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    anchors = [out_dir / f"{name}.openapi" for name in _url_output_names(urls)]
+    report_data = BatchReport()
+    stack = ExitStack()
+    stream = _open_result_stream(stack, report_file)
+    counter = ProgressCounter(total_specs=len(urls)) if progress else None
+    display = stack.enter_context(ProgressDisplay(counter)) if counter else None
+
+    def report(url: str, outcome: _BatchOutcome) -> None:
+        message, error, _, metrics = outcome
+        if error is None:
+            result = SpecResult(spec=url, status="ok", metrics=metrics)
+            _secho(display, message, fg=typer.colors.GREEN)
+        else:
+            result = SpecResult(spec=url, status="failed", error=error, metrics=metrics)
+            _secho(display, f"Failed: {url} -> {error}", fg=typer.colors.RED)
+        _add_result(report_data, stream, result)
+
+    workers = min(jobs or os.cpu_count() or 1, len(urls))
+    pool: ProcessPoolExecutor | ThreadPoolExecutor | DeadlineProcessPool
+    if timeout_per_spec is not None:
+        pool = DeadlineProcessPool(max_workers=workers, timeout=timeout_per_spec)
+    elif workers > 1:
+        # Fetches run in threads, so workers must not be forked from them
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=thread_safe_context()
+        )
+    else:
+        # A single thread keeps the event loop free to fetch meanwhile
+        pool = ThreadPoolExecutor(max_workers=1)
+
+    def submit(url: str, anchor: Path, content: str) -> Future:
+        return pool.submit(
+            _batch_generate,
+            anchor,
+            settings,
+            overwrite,
+            env,
+            env_name,
+            cache_dir,
+            content,
+            url,
+        )
+
+    global _component_cache
+    _component_cache = None
+    finished = False
+    try:
+        asyncio.run(
+            _generate_fetched(
+                urls,
+                anchors,
+                submit,
+                fetch_concurrency,
+                report,
+                partial(_finish_progress, counter) if counter else None,
+            )
+        )
+        finished = True
+    finally:
+        pool.shutdown(cancel_futures=not finished)
+        stack.close()
+        _component_cache = None
+
+    _save_batch_reports(report_data, result_file, report_file)
+    _print_progress(counter)
+    _print_batch_summary(report_data)
+
+
+def _open_result_stream(
+    stack: ExitStack, report_file: Path | None
+) -> ResultStream | None:
+    """The NDJSON stream for --report, if it names an .ndjson/.jsonl file."""
+    if report_file is None or not is_ndjson(report_file):
+        return None
+    try:
+        return stack.enter_context(ResultStream(report_file))
+    except OSError as e:
+        _abort(f"Could not open report file: {e}")
+
+
+def _add_result(
+    report: BatchReport, stream: ResultStream | None, result: SpecResult
+) -> None:
+    report.results.append(result)
+    if stream is not None:
+        stream.write(result)
+
+
+def _save_batch_reports(
+    report: BatchReport, result_file: Path | None, report_file: Path | None
+) -> None:
+    """Write --result, and --report unless it was streamed as NDJSON."""
+    targets = [("result", result_file)]
+    if report_file is not None and not is_ndjson(report_file):
+        targets.append(("report", report_file))
+    for kind, path in targets:
+        if path is None:
+            continue
+        try:
+            report.save(path)
+        except OSError as e:
+            typer.secho(f"Could not write {kind} file: {e}", fg=typer.colors.YELLOW)
+
+
 @app.command("batch")
 def batch(
-    input_path: Path = typer.Argument(
-        ..., help="Path to a directory of specs or a single spec file."
+    input_path: Path | None = typer.Argument(
+        None, help="Path to a directory of specs or a single spec file."
     ),
     pattern: str = typer.Option(
         "*.json,*.yaml,*.yml",
@@ -689,16 +1455,143 @@ def batch(
     overwrite: bool = typer.Option(
         False, "--overwrite/--no-overwrite", help="Overwrite outputs if they exist."
     ),
+    fsync: bool = typer.Option(
+        False,
+        "--fsync",
+        help="Flush every written file to disk before replacing the previous one.",
+    ),
     env: bool = typer.Option(
         True, "--env/--no-env", help="Also generate env files for each spec."
     ),
     env_name: str = typer.Option("dev", "--env-name", help="Environment section name."),
+    tag: list[str] | None = typer.Option(
+        None,
+        "--tag",
+        help="Only generate operations with this tag; can be passed multiple times.",
+    ),
+    path_glob: list[str] | None = typer.Option(
+        None,
+        "--path-glob",
+        help="Only generate operations whose path matches this glob (e.g. '/users/*').",
+    ),
+    operation_id: list[str] | None = typer.Option(
+        None,
+        "--operation-id",
+        help="Only generate operations with this operationId; can be passed multiple times.",
+    ),
+    method: list[str] | None = typer.Option(
+        None,
+        "--method",
+        help="Only generate operations using this HTTP method; can be passed multiple times.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip specs whose content and settings are unchanged since the last run, tracked in .httpfilegen-batch-manifest.json (implies --overwrite).",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip specs completed by an interrupted previous run, as recorded in .httpfilegen-batch-journal.jsonl.",
+    ),
+    jobs: int | None = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of specs processed in parallel worker processes (defaults to the CPU count).",
+    ),
+    timeout_per_spec: float | None = typer.Option(
+        None,
+        "--timeout-per-spec",
+        min=0.001,
+        help="Kill the worker of a spec that runs longer than this many seconds and record it as failed.",
+    ),
+    cache_dir: Path | None = typer.Option(
+        None,
+        "--cache-dir",
+        help="Also keep generated component samples in this directory for later runs.",
+    ),
+    shard: str | None = typer.Option(
+        None,
+        "--shard",
+        help="Only process shard INDEX/COUNT (1-based, e.g. 2/4) of the specs, balanced by file size.",
+    ),
+    result_file: Path | None = typer.Option(
+        None,
+        "--result",
+        help="Write a JSON result file for batch-merge (defaults to batch-result-INDEX-of-COUNT.json with --shard).",
+    ),
+    urls_file: Path | None = typer.Option(
+        None,
+        "--urls",
+        help="Fetch and process the spec URLs listed in this file (one per line) instead of local specs.",
+    ),
+    out_dir: Path | None = typer.Option(
+        None,
+        "--out-dir",
+        help="With --urls: directory for the outputs (defaults to the URL list's directory).",
+    ),
+    fetch_concurrency: int = typer.Option(
+        8,
+        "--fetch-concurrency",
+        min=1,
+        help="With --urls: maximum number of specs fetched at once.",
+    ),
+    report_file: Path | None = typer.Option(
+        None,
+        "--report",
+        help="Write per-spec stage timings, operation counts, output sizes and cache hits as JSON (or NDJSON, streamed, for .ndjson/.jsonl).",
+    ),
+    progress: bool = typer.Option(
+        False,
+        "--progress",
+        help="Show specs and operations completed, operations per second and ETA on stderr.",
+    ),
 ) -> None:
     """
     Process a directory of OpenAPI specs (or a single file) and generate .http (+ env) for each.
     """
-    processed = 0
-    failures: list[dict[str, str]] = []
+    if (input_path is None) == (urls_file is None):
+        _abort("Pass either a spec path or --urls, but not both.")
+    if urls_file is not None and (incremental or resume or shard):
+        _abort("--urls cannot be combined with --incremental, --resume or --shard.")
+    shard_index, shard_count = _parse_shard(shard) if shard else (None, None)
+    selection = _build_selection(tag, path_glob, operation_id, method)
+    # Incremental runs update the previous output in place
+    overwrite = overwrite or incremental
+
+    fm = _parse_filemode(filemode)
+    em = _parse_editor_mode(mode)
+    try:
+        settings = HttpSettings(
+            filemode=fm,
+            baseURL=Url(base_url) if base_url else None,
+            include_examples=include_examples,
+            include_schema=include_schema,
+            editor_mode=em,
+            selection=selection,
+            fsync=fsync,
+        )
+    except Exception as e:
+        _abort(f"Invalid settings: {e}")
+    if urls_file is not None:
+        _batch_urls(
+            urls_file,
+            out_dir,
+            settings,
+            overwrite,
+            env,
+            env_name,
+            jobs,
+            timeout_per_spec,
+            cache_dir,
+            fetch_concurrency,
+            result_file,
+            report_file,
+            progress,
+        )
+        return
 
     files: list[Path] = []
     if input_path.is_file():
@@ -707,71 +1600,366 @@ def batch(
         pats = [p.strip() for p in pattern.split(",") if p.strip()]
         for pat in pats:
             files.extend(input_path.glob(pat))
-        files = sorted(set(files))
+        files = sorted(f for f in set(files) if f.name != BATCH_MANIFEST_FILENAME)
     else:
         _abort(f"Path not found: {input_path}")
 
     if not files:
         _abort("No spec files found to process.")
-
-    for spec in files:
-        spec = spec.resolve()
+    specs = [spec.resolve() for spec in files]
+    root = (input_path if input_path.is_dir() else input_path.parent).resolve()
+    report_data = BatchReport(shard_index=shard_index, shard_count=shard_count)
+    journal_name = BATCH_JOURNAL_FILENAME
+    if shard_index is not None and shard_count is not None:
+        # Every runner computes the same partition from the same spec tree
+        costs = {_relative_key(root, spec): spec.stat().st_size for spec in specs}
+        selected = set(partition_by_cost(costs, shard_count)[shard_index - 1])
+        shard_specs = [spec for spec in specs if _relative_key(root, spec) in selected]
+        journal_name = journal_name.replace(
+            ".jsonl", f"-{shard_index}-of-{shard_count}.jsonl"
+        )
+        if result_file is None:
+            result_file = Path(f"batch-result-{shard_index}-of-{shard_count}.json")
+    else:
+        shard_specs = specs
+
+    # Incremental runs skip specs whose inputs match the previous run
+    manifest_path = root / BATCH_MANIFEST_FILENAME
+    previous = BatchManifest.load(manifest_path) if incremental else None
+    manifest = BatchManifest()
+    if previous and shard_specs is not specs:
+        # Keep what other shards recorded in a shared output tree
+        manifest.entries = {
+            key: value
+            for key, value in previous.entries.items()
+            if key not in {_relative_key(root, spec) for spec in shard_specs}
+        }
+    specs = shard_specs
+    # Completed specs are checkpointed so an interrupted run can be resumed
+    journal = BatchJournal(root / journal_name, fsync=fsync)
+    checkpoints = journal.load() if resume else {}
+    settings_digest = digest(
+        {
+            "settings": settings.model_dump(mode="json", exclude={"fsync"}),
+            "env": env,
+            "env_name": env_name,
+        }
+    )
+    spec_digests: dict[Path, str] = {}
+    # Only for specs that are generated; reused entries keep their own
+    dependency_digests: dict[Path, dict[str, str | None]] = {}
+    up_to_date: set[Path] = set()
+    resumed: set[Path] = set()
+    for spec in specs:
         try:
-            fm = _parse_filemode(filemode)
-            em = _parse_editor_mode(mode)
-            settings = HttpSettings(
-                filemode=fm,
-                baseURL=Url(base_url) if base_url else None,
-                include_examples=include_examples,
-                include_schema=include_schema,
-                editor_mode=em,
+            spec_digests[spec] = content_digest(spec.read_bytes())
+        except OSError:
+            continue
+        key = _relative_key(root, spec)
+        checkpoint = checkpoints.get(key)
+        if checkpoint is not None and checkpoint.inputs_match(
+            spec_digests[spec], settings_digest, root
+        ):
+            manifest.entries[key] = checkpoint
+            resumed.add(spec)
+        elif previous and previous.is_up_to_date(
+            key, spec_digests[spec], settings_digest, root
+        ):
+            manifest.entries[key] = previous.entries[key]
+            up_to_date.add(spec)
+        else:
+            dependency_digests[spec] = _dependency_digests(root, spec)
+    stale = [spec for spec in specs if spec not in up_to_date | resumed]
+
+    def entry(spec: Path, outputs: list[Path]) -> BatchManifestEntry:
+        return BatchManifestEntry(
+            spec_digest=spec_digests[spec],
+            settings_digest=settings_digest,
+            dependencies=dependency_digests[spec],
+            outputs=[_relative_key(root, output) for output in outputs],
+        )
+
+    def record(spec: Path, result: _BatchOutcome) -> None:
+        _, error, outputs, _ = result
+        if error is None and spec in spec_digests:
+            journal.record(_relative_key(root, spec), entry(spec, outputs))
+
+    def report(spec: Path, outcome: _BatchOutcome) -> None:
+        message, error, outputs, metrics = outcome
+        key = _relative_key(root, spec)
+        if error is None:
+            result = SpecResult(spec=key, status="ok", metrics=metrics)
+            _secho(display, message, fg=typer.colors.GREEN)
+            if spec in spec_digests:
+                manifest.entries[key] = entry(spec, outputs)
+        else:
+            result = SpecResult(spec=key, status="failed", error=error, metrics=metrics)
+            _secho(display, f"Failed: {spec} -> {error}", fg=typer.colors.RED)
+        _add_result(report_data, stream, result)
+
+    workers = min(jobs or os.cpu_count() or 1, len(stale))
+    pool: ProcessPoolExecutor | DeadlineProcessPool | None = None
+    if timeout_per_spec is not None and stale:
+        # Overrunning specs can only be stopped in a process of their own
+        pool = DeadlineProcessPool(max_workers=workers, timeout=timeout_per_spec)
+    elif workers > 1:
+        # The progress display runs in a thread, so workers are not forked
+        pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=thread_safe_context()
+        )
+    stack = ExitStack()
+    stream = _open_result_stream(stack, report_file)
+    # Up-to-date and resumed specs are not processed, so they do not count
+    counter = ProgressCounter(total_specs=len(stale)) if progress else None
+    display = stack.enter_context(ProgressDisplay(counter)) if counter else None
+    journal.open(resume=resume)
+    finished = False
+    global _component_cache
+    # Start every batch with an empty in-memory cache
+    _component_cache = None
+    try:
+        futures = {
+            spec: pool.submit(
+                _batch_generate, spec, settings, overwrite, env, env_name, cache_dir
             )
-            gen = HtttpFileGenerator(spec, settings=settings)
-            if fm == Filemode.SINGLE:
-                out_file = spec.with_suffix(".http")
-                _ensure_write_target(out_file, overwrite)
-                content = gen.http_file.to_http_file(
-                    include_examples=settings.include_examples,
-                    include_schema=settings.include_schema,
-                    editor_mode=settings.editor_mode,
+            for spec in (stale if pool else [])
+        }
+        for spec, future in futures.items():
+            # Checkpoint as soon as a worker finishes, not when it is reported
+            future.add_done_callback(partial(_checkpoint_future, record, spec))
+            if counter is not None:
+                future.add_done_callback(partial(_progress_future, counter))
+        # Report in input order, whatever order the workers finish in
+        for spec in specs:
+            if spec in resumed:
+                _add_result(
+                    report_data,
+                    stream,
+                    SpecResult(spec=_relative_key(root, spec), status="resumed"),
                 )
-                out_file.write_text(content)
-                env_base_dir = spec.parent
-            else:
-                target_dir = spec.parent / spec.stem
-                if target_dir.exists() and not overwrite:
-                    raise RuntimeError(
-                        f"Refusing to overwrite existing directory without --overwrite: {target_dir}"
-                    )
-                target_dir.mkdir(parents=True, exist_ok=True)
-                gen.to_http_file(target_dir)
-                env_base_dir = target_dir
-            if env:
-                public_env = env_base_dir / "http-client.env.json"
-                private_env = env_base_dir / "http-client.private.env.json"
-                if overwrite or (not public_env.exists() and not private_env.exists()):
-                    gen.to_env_files(public_env, private_env, env_name=env_name)
-            processed += 1
-            if fm == Filemode.SINGLE:
-                typer.secho(f"Generated: {out_file}", fg=typer.colors.GREEN)
-            else:
-                typer.secho(
-                    f"Generated (MULTI): {spec} -> {env_base_dir}",
-                    fg=typer.colors.GREEN,
+                _secho(
+                    display,
+                    f"Resumed: {spec} (completed by the interrupted run)",
+                    fg=typer.colors.BLUE,
                 )
-        except Exception as e:
-            failures.append({"spec": str(spec), "error": str(e)})
-            typer.secho(f"Failed: {spec} -> {e}", fg=typer.colors.RED)
+                continue
+            if spec in up_to_date:
+                _add_result(
+                    report_data,
+                    stream,
+                    SpecResult(spec=_relative_key(root, spec), status="up-to-date"),
+                )
+                _secho(display, f"Up-to-date: {spec}", fg=typer.colors.BLUE)
+                continue
+            if spec not in futures:
+                result = _batch_generate(
+                    spec, settings, overwrite, env, env_name, cache_dir
+                )
+                record(spec, result)
+                if counter is not None:
+                    _finish_progress(counter, result)
+            else:
+                try:
+                    result = futures[spec].result()
+                except Exception as e:
+                    result = (None, str(e) or type(e).__name__, [], None)
+            report(spec, result)
+        finished = True
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=not finished)
+        journal.close(finished)
+        stack.close()
+        _component_cache = None
+
+    if incremental:
+        try:
+            manifest.save(manifest_path, fsync=fsync)
+        except OSError as e:
+            typer.secho(f"Could not write batch manifest: {e}", fg=typer.colors.YELLOW)
 
+    _save_batch_reports(report_data, result_file, report_file)
+    _print_progress(counter)
+    _print_batch_summary(report_data, up_to_date=incremental, resumed=resume)
+
+
+def _print_batch_summary(
+    report: BatchReport, up_to_date: bool = False, resumed: bool = False
+) -> None:
     typer.echo("")
     typer.secho(
-        f"Done. OK: {processed}  Failed: {len(failures)}",
+        f"Done. OK: {report.count('ok')}  "
+        + (f"Up-to-date: {report.count('up-to-date')}  " if up_to_date else "")
+        + (f"Resumed: {report.count('resumed')}  " if resumed else "")
+        + f"Failed: {report.count('failed')}",
         fg=typer.colors.CYAN,
         bold=True,
     )
-    if failures:
-        for f in failures:
-            typer.echo(f"  - {f['spec']}: {f['error']}")
+    for failure in report.failures:
+        typer.echo(f"  - {failure.spec}: {failure.error}")
+
+
+@app.command("batch-merge")
+def batch_merge(
+    result_files: list[Path] = typer.Argument(
+        ..., help="Result files written by batch --shard (or batch --result)."
+    ),
+    out: Path | None = typer.Option(
+        None, "--out", "-o", help="Also write the merged result to this file."
+    ),
+) -> None:
+    """
+    Combine the result files of a sharded batch into one summary.
+    """
+    try:
+        reports = [BatchReport.load(path) for path in result_files]
+        merged = BatchReport.merge(reports)
+        if out is not None:
+            merged.save(out)
+    except (OSError, ValueError) as e:
+        _abort(f"Failed to merge batch results: {e}")
+    _print_batch_summary(
+        merged,
+        up_to_date=merged.count("up-to-date") > 0,
+        resumed=merged.count("resumed") > 0,
+    )
+    missing = BatchReport.missing_shards(reports)
+    if missing:
+        _abort(
+            "Missing results for shard(s): "
+            + ", ".join(f"{index}/{merged.shard_count}" for index in missing)
+        )
+
+
+def _print_regeneration(result: Regeneration) -> None:
+    if result.error is not None:
+        typer.secho(
+            f"Failed: {result.spec}: {result.error}", fg=typer.colors.RED, err=True
+        )
+        return
+    summary = f"{result.seconds:.2f}s"
+    if result.stats is not None:
+        stats = result.stats
+        summary += (
+            f"; {stats.added} added, {stats.changed} changed, "
+            f"{stats.removed} removed, {stats.reused} reused"
+        )
+    typer.secho(
+        f"Regenerated: {result.spec} -> {result.output} ({summary})",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command("watch")
+def watch(
+    input_path: Path = typer.Argument(
+        ..., help="Spec file, or directory of specs, to watch."
+    ),
+    pattern: str = typer.Option(
+        "*.json,*.yaml,*.yml",
+        "--pattern",
+        "-p",
+        help="Glob(s) for spec files in a directory, comma-separated.",
+    ),
+    out: Path | None = typer.Option(
+        None,
+        "--out",
+        "-o",
+        help="Output .http file (SINGLE) or directory (MULTI) for a single spec (defaults to next to the spec).",
+    ),
+    filemode: str | None = typer.Option(
+        None,
+        "--filemode",
+        "-f",
+        help="File generation mode: SINGLE (one .http) or MULTI (one per path).",
+    ),
+    base_url: str | None = typer.Option(
+        None,
+        "--base-url",
+        help="Optional base URL to include in generated .http files.",
+    ),
+    mode: str = typer.Option(
+        "default",
+        "--mode",
+        help="Editor mode: default, kulala, pycharm, or httpyac.",
+    ),
+    include_examples: bool = typer.Option(
+        False,
+        "--include-examples/--no-include-examples",
+        help="Include commented response examples next to each request.",
+    ),
+    include_schema: bool = typer.Option(
+        False,
+        "--include-schema/--no-include-schema",
+        help="Include commented request body examples next to each request.",
+    ),
+    env: bool = typer.Option(
+        True,
+        "--env/--no-env",
+        help="Also generate env files for each spec, when they do not exist yet.",
+    ),
+    env_name: str = typer.Option("dev", "--env-name", help="Environment section name."),
+    debounce: float = typer.Option(
+        0.2,
+        "--debounce",
+        min=0.0,
+        help="Seconds without further changes to wait before regenerating, so a burst of saves regenerates once.",
+    ),
+    poll: bool = typer.Option(
+        False,
+        "--poll",
+        help="Poll modification times instead of using inotify (e.g. on network filesystems).",
+    ),
+) -> None:
+    """
+    Regenerate .http (+ env) files whenever a spec or a file it $refs changes.
+    """
+    fm = _parse_filemode(filemode)
+    em = _parse_editor_mode(mode)
+    try:
+        settings = HttpSettings(
+            filemode=fm,
+            baseURL=Url(base_url) if base_url else None,
+            include_examples=include_examples,
+            include_schema=include_schema,
+            editor_mode=em,
+        )
+    except Exception as e:
+        _abort(f"Invalid settings: {e}")
+    if settings.filemode == Filemode.SHARDED:
+        _abort("watch supports --filemode SINGLE or MULTI, not SHARDED.")
+    if input_path.is_dir():
+        if out is not None:
+            _abort("--out can only be used when watching a single spec file.")
+        patterns = [p.strip() for p in pattern.split(",") if p.strip()]
+        directory = input_path.resolve()
+        discover: Callable[[], list[Path]] | None = partial(
+            find_specs, directory, patterns
+        )
+        directories = [directory]
+    elif input_path.is_file():
+        patterns = []
+        discover = None
+        directories = []
+    else:
+        _abort(f"Path not found: {input_path}")
+
+    session = WatchSession(settings, out=out, env=env, env_name=env_name)
+    session.set_specs(discover() if discover is not None else [input_path])
+    for spec in session.specs:
+        _print_regeneration(session.regenerate(spec))
+    with FileWatcher(
+        session.watched_files(), directories, patterns, polling=poll
+    ) as watcher:
+        typer.secho(
+            f"Watching {len(session.specs)} spec(s) ({watcher.backend}). "
+            "Press Ctrl+C to stop.",
+            fg=typer.colors.CYAN,
+        )
+        try:
+            session.run(watcher, _print_regeneration, debounce, discover=discover)
+        except KeyboardInterrupt:
+            typer.echo("Stopped watching.")
 
 
 def main() -> None:
@@ -1,15 +1,47 @@
+import copy
 import json
-import urllib.error
-import urllib.request
+from collections.abc import MutableMapping
 from pathlib import Path
-from urllib.parse import urlparse
-from typing import Any
+from urllib.parse import unquote, urljoin, urlparse
+from typing import Any, Callable, Iterator
 
-from prance import ResolvingParser, ValidationError
+from prance import BaseParser, ValidationError
+from prance.util.resolver import RefResolver
 
-from .models import BaseURL, HttpClientBaseEnv, HttpFileData, OpenApiParser
+from .models import (
+    BaseURL,
+    HttpClientBaseEnv,
+    HttpFileData,
+    OpenApiParser,
+)
 from .models.env_file.generator import generate_env_dicts
+from .models.http_file.http_file_data import iter_operations
+from .models.http_file.ir import RequestIR
+from .models.http_file.preview import RenderPreview
+from .models.http_file.renderer import BODIES_DIR, HttpRenderer, get_renderer
+from .models.manifest import GenerationManifest, IncrementalStats, ManifestEntry
 from .models.settings.settings import Filemode, HttpSettings
+from .models.utils.component_cache import active_component_cache
+from .models.utils.fetch import fetch_text
+from .models.utils.fingerprint import digest, operation_fingerprint
+from .models.utils.progress import count_operation
+from .models.utils.sharding import (
+    INDEX_FILENAME as SHARD_INDEX_FILENAME,
+    shard_filename,
+    shard_key,
+    split_blocks,
+)
+from .models.utils.timing import timed, timed_iter
+from .models.utils.writer import (
+    FileWriter,
+    WriteStats,
+    atomic_open,
+    atomic_write_text,
+)
+
+MANIFEST_FILENAME = ".httpfilegen-manifest.json"
+PUBLIC_ENV_FILENAME = "http-client.env.json"
+PRIVATE_ENV_FILENAME = "http-client.private.env.json"
 
 
 def _parse_spec_content(content: str) -> Any:
@@ -39,39 +71,92 @@ def _parse_spec_content(content: str) -> Any:
         raise ValueError(f"Failed to parse spec content: {e}")
 
 
-def load_data(file: Path | str) -> Any:
+def read_spec(file: Path | str) -> Any:
+    """Read and parse a spec from a local path or URL without resolving $refs."""
     if isinstance(file, Path):
         content = Path(file).read_text()
         data = _parse_spec_content(content)
     else:
-        parsed = urlparse(file)
-        if parsed.scheme in ("http", "https") and parsed.netloc:
-            try:
-                with urllib.request.urlopen(file, timeout=30) as resp:
-                    charset = resp.headers.get_content_charset() or "utf-8"
-                    content = resp.read().decode(charset)
-                data = _parse_spec_content(content)
-            except urllib.error.HTTPError as e:
-                raise ValueError(
-                    f"HTTP error fetching spec from '{file}': {e.code} {e.reason}"
-                )
-            except urllib.error.URLError as e:
-                raise ValueError(
-                    f"Network error fetching spec from '{file}': {e.reason}"
-                )
-            except TimeoutError:
-                raise ValueError(
-                    f"Timeout fetching spec from '{file}' (30s limit exceeded)"
-                )
-            except Exception as e:
-                raise ValueError(f"Failed to fetch spec from '{file}': {e}")
+        if _is_remote(file):
+            data = _parse_spec_content(fetch_text(file))
         else:
             # Treat as a local file path string
             content = Path(file).read_text()
             data = _parse_spec_content(content)
+    return data
+
+
+def _absolute_refs(value: Any, base_url: str) -> Any:
+    """value with every relative external $ref made absolute against base_url."""
+    if isinstance(value, dict):
+        result = {key: _absolute_refs(item, base_url) for key, item in value.items()}
+        ref = value.get("$ref")
+        if isinstance(ref, str) and not ref.startswith("#"):
+            result["$ref"] = urljoin(base_url, ref)
+        return result
+    if isinstance(value, list):
+        return [_absolute_refs(item, base_url) for item in value]
+    return value
+
+
+class _RefResolver(RefResolver):
+    """RefResolver that also resolves relative $refs in remote documents.
+
+    prance only resolves relative references against file URLs, so those in
+    documents fetched over HTTP are made absolute before resolving.
+    """
+
+    def _resolve_partial(self, base_url: Any, partial: Any, recursions: Any) -> Any:
+        if base_url is not None and base_url.scheme in ("http", "https"):
+            partial = _absolute_refs(partial, base_url.geturl())
+        return super()._resolve_partial(base_url, partial, recursions)
+
+
+class _ResolvingParser(BaseParser):
+    """prance's ResolvingParser with a base URL and a shareable reference cache.
+
+    Relative external $refs are resolved against base_url (the location of
+    the spec) rather than the working directory.
+    """
+
+    def __init__(
+        self,
+        spec_string: str,
+        base_url: str | None = None,
+        reference_cache: MutableMapping | None = None,
+    ) -> None:
+        self._base_url = base_url
+        self._reference_cache = {} if reference_cache is None else reference_cache
+        super().__init__(spec_string=spec_string)
+
+    def _validate(self) -> None:
+        resolver = _RefResolver(
+            self.specification,
+            self._base_url or self.url,
+            reference_cache=self._reference_cache,
+        )
+        resolver.resolve_references()
+        self.specification = resolver.specs
+        BaseParser._validate(self)
+
+
+def resolve_spec(data: Any, base_url: str | None = None) -> Any:
+    """Validate a parsed spec and resolve all of its $refs.
+
+    External documents are shared with other specs through the active
+    component cache, if any.
+    """
+    cache = active_component_cache()
+    reference_cache = cache.documents if cache is not None else None
+
+    def parse() -> Any:
+        with timed("resolve"):
+            return _ResolvingParser(
+                json.dumps(data), base_url=base_url, reference_cache=reference_cache
+            ).specification
 
     try:
-        return ResolvingParser(spec_string=json.dumps(data)).specification
+        return parse()
     except ValidationError as e:
         # Try to recover from OpenAPI 3.1+ validation issues
         openapi_version = data.get("openapi", "unknown")
@@ -79,7 +164,7 @@ def load_data(file: Path | str) -> Any:
             major, minor, patch = str(openapi_version).split(".")
             if int(major) == 3 and (int(minor) > 0 or int(patch) > 0):
                 data["openapi"] = "3.1.0"
-                return ResolvingParser(spec_string=json.dumps(data)).specification
+                return parse()
         except (ValueError, AttributeError):
             pass
         raise ValueError(
@@ -87,6 +172,85 @@ def load_data(file: Path | str) -> Any:
         )
 
 
+def _base_url(file: Path | str) -> str:
+    """URL that relative $refs of the spec at file are resolved against."""
+    if isinstance(file, str) and _is_remote(file):
+        return file
+    return Path(file).resolve().as_uri()
+
+
+def _is_remote(file: str) -> bool:
+    parsed = urlparse(file)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+
+def iter_refs(value: Any) -> Iterator[str]:
+    """Every $ref string in value, depth first."""
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for item in value.values():
+            yield from iter_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from iter_refs(item)
+
+
+def local_ref_target(ref: str, base_dir: Path) -> Path | None:
+    """The local file a $ref in a document in base_dir points into, if any."""
+    target = urlparse(ref.split("#", 1)[0])
+    if not target.path or target.scheme not in ("", "file"):
+        return None
+    return (base_dir / unquote(target.path)).resolve()
+
+
+def local_dependencies(file: Path, data: Any = None) -> set[Path]:
+    """Local files that the spec at file $refs, directly or through other files.
+
+    data is the parsed content of file, if already at hand. Documents that
+    cannot be read or parsed are still listed, but their own references are
+    not followed.
+    """
+    root = file.resolve()
+    found: set[Path] = set()
+    pending = [root]
+    while pending:
+        path = pending.pop()
+        try:
+            content = data if path == root and data is not None else read_spec(path)
+        except (OSError, ValueError):
+            continue
+        for ref in iter_refs(content):
+            dependency = local_ref_target(ref, path.parent)
+            if dependency is None or dependency == root or dependency in found:
+                continue
+            found.add(dependency)
+            pending.append(dependency)
+    return found
+
+
+def load_data(file: Path | str) -> Any:
+    with timed("load"):
+        data = read_spec(file)
+    return resolve_spec(data, base_url=_base_url(file))
+
+
+class _ScopedSidecars(dict):
+    """Sidecars of one operation that avoid names other operations use.
+
+    The renderer picks a free name by checking membership, so names in
+    taken count as used while only this operation's sidecars are stored.
+    """
+
+    def __init__(self, taken: set[str]) -> None:
+        super().__init__()
+        self._taken = taken
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._taken or super().__contains__(name)
+
+
 class HtttpFileGenerator:
     env_files: dict[Path, HttpClientBaseEnv]
 
@@ -94,55 +258,246 @@ class HtttpFileGenerator:
         """Initialize with a local file path or a remote URL to an OpenAPI spec.
 
         settings controls generation behavior (e.g., filemode). If not provided,
-        defaults are loaded (SINGLE mode by default).
-        """
-        data = load_data(file)
-        parser = OpenApiParser(data)
-        components = parser.model.components
-        security_schemes = components.securitySchemes if components else None
-        self.http_file = HttpFileData.from_paths(
-            server=parser.model.servers,
-            paths=parser.model.paths or {},
-            root_security=parser.model.security,
-            security_schemes=security_schemes,  # type: ignore[arg-type]
-        )
-        self._openapi_model = parser.model
+        defaults are loaded (SINGLE mode by default). settings.selection limits
+        which operations are built at all.
+
+        Requests are built lazily on first access to http_file, so incremental
+        generation can skip building operations that did not change.
+        """
+        self._setup(load_data(file), settings)
+
+    @classmethod
+    def from_text(
+        cls,
+        content: str,
+        settings: HttpSettings | None = None,
+        source: str | None = None,
+    ) -> "HtttpFileGenerator":
+        """Initialize from the text of a spec that was already read or fetched.
+
+        source is where the spec came from (a URL or path), against which
+        relative external $refs are resolved.
+        """
+        gen = cls.__new__(cls)
+        with timed("load"):
+            data = _parse_spec_content(content)
+        gen._setup(
+            resolve_spec(data, base_url=_base_url(source) if source else None),
+            settings,
+        )
+        return gen
+
+    @classmethod
+    def from_resolved(
+        cls, data: Any, settings: HttpSettings | None = None
+    ) -> "HtttpFileGenerator":
+        """Initialize from a spec already validated and resolved by resolve_spec."""
+        gen = cls.__new__(cls)
+        gen._setup(data, settings)
+        return gen
+
+    def _setup(self, data: Any, settings: HttpSettings | None) -> None:
+        with timed("model_build"):
+            self._openapi_model = OpenApiParser(data).model
         # Settings (defaults to SINGLE mode)
         self.settings = settings or HttpSettings()
-        # If a baseURL is provided in settings, add it to the shared base URLs
-        if self.settings.baseURL:
-            try:
-                self.http_file.base_urls.add(
-                    BaseURL(value=str(self.settings.baseURL), description="")
+        self._requests: list[RequestIR] | None = None
+        self._http_file: HttpFileData | None = None
+        # Populated by incremental runs of to_http_file
+        self.incremental_stats: IncrementalStats | None = None
+        # Populated by writes of MULTI and SHARDED output
+        self.write_stats: WriteStats | None = None
+
+    @property
+    def http_file(self) -> HttpFileData:
+        """All selected requests as validated models, built on first access."""
+        if self._http_file is None:
+            requests = self.requests
+            with timed("model_build"):
+                self._http_file = HttpFileData(
+                    base_urls=HttpFileData.base_urls_from_servers(
+                        self._openapi_model.servers
+                    ),
+                    requests=[request.to_model() for request in requests],
                 )
-            except Exception:
-                # Be defensive; if for any reason adding fails, continue with parsed servers
-                pass
+            # If a baseURL is provided in settings, add it to the shared base URLs
+            if self.settings.baseURL:
+                try:
+                    self._http_file.base_urls.add(
+                        BaseURL(value=str(self.settings.baseURL), description="")
+                    )
+                except Exception:
+                    # Be defensive; if for any reason adding fails, continue with parsed servers
+                    pass
+        return self._http_file
 
-    def to_http_file(self, out_path: Path) -> None:
+    @property
+    def requests(self) -> list[RequestIR]:
+        """All selected requests in the compact internal form used for rendering.
+
+        Unlike http_file, these are not validated again, since they are built
+        from the already validated OpenAPI model.
+        """
+        return self.build_requests()
+
+    def build_requests(self) -> list[RequestIR]:
+        """Build every selected request now, so later renders reuse them."""
+        if self._requests is None:
+            self._requests = list(self._iter_requests())
+        return self._requests
+
+    def _iter_requests(self) -> Iterator[RequestIR]:
+        """Build the selected requests one at a time, in spec order."""
+        if self._requests is not None:
+            yield from self._requests
+            return
+        root_security = self._openapi_model.security
+        security_schemes = self._security_schemes()
+        for path, method, operation in iter_operations(
+            self._openapi_model.paths or {}, self.settings.selection
+        ):
+            with timed("model_build"):
+                request = RequestIR.from_operation(
+                    path=path,
+                    method=method,  # type: ignore[arg-type]
+                    operation=operation,
+                    root_security=root_security,  # type: ignore[arg-type]
+                    security_schemes=security_schemes,  # type: ignore[arg-type]
+                )
+            count_operation()
+            yield request
+
+    def with_settings(self, **updates: Any) -> "HtttpFileGenerator":
+        """Return a generator for the same spec with some settings changed.
+
+        The parsed spec and, unless the selection changes, the requests built
+        so far are shared. Call build_requests first to build them once for
+        every variant, so rendering other editor modes or filemodes only repeats
+        the cheap render step.
+        """
+        variant = copy.copy(self)
+        variant.settings = self.settings.model_copy(update=updates)
+        variant.incremental_stats = None
+        variant.write_stats = None
+        if "selection" in updates:
+            variant._requests = None
+            variant._http_file = None
+        elif "baseURL" in updates:
+            variant._http_file = None
+        return variant
+
+    def operation_count(self) -> int:
+        """Number of selected operations, counted without building any request."""
+        return sum(
+            1
+            for _ in iter_operations(
+                self._openapi_model.paths or {}, self.settings.selection
+            )
+        )
+
+    def preview(self, max_lines: int = 100) -> RenderPreview:
+        """Render only as many requests as needed to fill max_lines.
+
+        Requests are built and rendered lazily and rendering stops as soon as
+        the line budget is exceeded, so previewing a huge spec costs about as
+        much as its first few operations.
+        """
+        renderer = self._renderer()
+        rendered = 0
+
+        def blocks() -> Iterator[str]:
+            nonlocal rendered
+            for request in self._iter_requests():
+                rendered += 1
+                yield renderer.render_request(request)
+
+        lines: list[str] = []
+        pending = ""
+        chars = 0
+        truncated = False
+        for chunk in renderer.iter_blocks(blocks()):
+            chars += len(chunk)
+            *complete, pending = (pending + chunk).split("\n")
+            lines.extend(complete)
+            if len(lines) > max_lines:
+                truncated = True
+                break
+        if not truncated and pending:
+            lines.append(pending)
+            truncated = len(lines) > max_lines
+        return RenderPreview(
+            lines=lines[:max_lines],
+            truncated=truncated,
+            operations=self.operation_count() if truncated else rendered,
+            rendered=rendered,
+            rendered_chars=chars,
+        )
+
+    def _renderer(self) -> HttpRenderer:
+        """The compiled renderer for the configured editor mode and options."""
+        return get_renderer(
+            self.settings.editor_mode,
+            include_examples=self.settings.include_examples,
+            include_schema=self.settings.include_schema,
+            body_threshold=self.settings.body_file_threshold,
+        )
+
+    def _write_sidecars(self, base_dir: Path, sidecars: dict[str, str]) -> None:
+        """Write externalised bodies relative to the .http file referencing them."""
+        for name, content in sidecars.items():
+            target = base_dir / name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(target, content, fsync=self.settings.fsync)
+
+    def _security_schemes(self) -> dict | None:
+        components = self._openapi_model.components
+        return components.securitySchemes if components else None
+
+    def to_http_file(self, out_path: Path, incremental: bool = False) -> None:
         """Write HTTP file(s) based on the configured filemode.
 
         - SINGLE: Write a single .http file to out_path (existing behavior).
         - MULTI:  Create a directory structure under out_path (or out_path.stem if
                   out_path looks like a file), and write one .http per API path
                   (folder structure mirrors the path segments, file named index.http).
+
+        With incremental=True a manifest of per-operation fingerprints is kept
+        next to the output (see manifest_path). Only operations that were added
+        or changed since the previous run are rebuilt; the rendered blocks of
+        all other operations are reused, and unchanged files are not rewritten.
         """
+        with timed("render"):
+            self._to_http_file(out_path, incremental)
+
+    def _to_http_file(self, out_path: Path, incremental: bool) -> None:
         if self.settings.filemode == Filemode.SINGLE:
-            lines = self.http_file.to_http_file(
-                include_examples=self.settings.include_examples,
-                include_schema=self.settings.include_schema,
-                editor_mode=self.settings.editor_mode,
-            )
-            with Path.open(out_path, "w") as f:
-                # Using write for a single string payload
-                f.write(lines)
+            if incremental:
+                self._to_http_file_incremental(out_path)
+                return
+            # Stream each request to disk as soon as it is rendered; unless
+            # requests were already built, only one is held in memory at a time.
+            sidecars: dict[str, str] = {}
+            blocks = self._renderer().iter_file(self._iter_requests(), sidecars)
+            with atomic_open(out_path, fsync=self.settings.fsync) as f:
+                f.writelines(timed_iter("render", blocks))
+            self._write_sidecars(out_path.parent, sidecars)
             return
 
-        # MULTI mode: derive an output directory from out_path
+        # MULTI and SHARDED modes: derive an output directory from out_path
         if out_path.suffix == ".http":
             out_dir = out_path.parent / out_path.stem
         else:
             out_dir = out_path
+        if self.settings.filemode == Filemode.SHARDED:
+            if incremental:
+                raise ValueError(
+                    "Incremental generation does not support SHARDED mode"
+                )
+            self.to_http_shards(out_dir)
+            return
+        if incremental:
+            self._to_http_files_incremental(out_dir)
+            return
         self.to_http_files(out_dir)
 
     def to_env_files(
@@ -155,37 +510,135 @@ class HtttpFileGenerator:
         Returns:
             True if a valid base URL was found, False if placeholder was used.
         """
+        with timed("env"):
+            public_env, private_env, has_valid_base_url = self.env_file_contents(
+                env_name
+            )
+        atomic_write_text(public_out, public_env, fsync=self.settings.fsync)
+        atomic_write_text(private_out, private_env, fsync=self.settings.fsync)
+        return has_valid_base_url
+
+    def env_file_contents(self, env_name: str = "dev") -> tuple[str, str, bool]:
+        """Public and private env file JSON, and whether a valid base URL was found."""
         servers = self._openapi_model.servers or []
         base_url_override = (
             str(self.settings.baseURL) if self.settings.baseURL else None
         )
-
         public_env, private_env, has_valid_base_url = generate_env_dicts(
             self._openapi_model,
             env_name=env_name,
             servers=servers,
             base_url_override=base_url_override,
         )
-        with Path.open(public_out, "w") as f:
-            json.dump(public_env, f, indent=2)
-        with Path.open(private_out, "w") as f:
-            json.dump(private_env, f, indent=2)
+        return (
+            json.dumps(public_env, indent=2),
+            json.dumps(private_env, indent=2),
+            has_valid_base_url,
+        )
 
-        return has_valid_base_url
+    def iter_output_files(self, out_path: Path) -> Iterator[tuple[str, str]]:
+        """Yield (relative path, content) for every file to_http_file would write.
+
+        Paths use forward slashes and are relative to out_path.parent, so the
+        files can be placed in an archive (or anywhere else) with the same
+        layout they would have on disk. Nothing is written; incremental output
+        is not supported.
+        """
+        if self.settings.filemode == Filemode.SINGLE:
+            sidecars: dict[str, str] = {}
+            content = "".join(
+                self._renderer().iter_file(self._iter_requests(), sidecars)
+            )
+            yield out_path.name, content
+            for name, sidecar in sidecars.items():
+                yield name, sidecar
+            return
+
+        base = out_path.stem if out_path.suffix == ".http" else out_path.name
+        if self.settings.filemode == Filemode.SHARDED:
+            shard_sidecars: dict[str, str] = {}
+            index = []
+            for info, content in self._iter_shards(shard_sidecars):
+                index.append(info)
+                yield f"{base}/{info['file']}", content
+            for name, sidecar in shard_sidecars.items():
+                yield f"{base}/{name}", sidecar
+            yield f"{base}/{SHARD_INDEX_FILENAME}", self._shard_index_json(index)
+            return
+
+        renderer = self._renderer()
+        for path, reqs in self._group_requests_by_path().items():
+            target = self._target_file(Path(base), path, "index.http")
+            sidecars = {}
+            yield target.as_posix(), renderer.render_file(reqs, sidecars)
+            for name, sidecar in sidecars.items():
+                yield (target.parent / name).as_posix(), sidecar
+
+    def iter_outputs(
+        self,
+        name: str = "api.http",
+        env_name: str | None = "dev",
+        public_env_filename: str = PUBLIC_ENV_FILENAME,
+        private_env_filename: str = PRIVATE_ENV_FILENAME,
+    ) -> Iterator[tuple[str, str]]:
+        """Lazily yield (relative path, content) for all output, without file I/O.
+
+        name is a file name playing the role of out_path: the .http file in
+        SINGLE mode, the directory (name without .http) in MULTI and SHARDED
+        mode. Env files
+        follow in the same place the CLI writes them by default, unless
+        env_name is None. Files are rendered as they are consumed.
+        """
+        out_path = Path(name)
+        yield from self.iter_output_files(out_path)
+        if env_name is None:
+            return
+        env_dir = Path()
+        if self.settings.filemode != Filemode.SINGLE:
+            env_dir = Path(
+                out_path.stem if out_path.suffix == ".http" else out_path.name
+            )
+        public_env, private_env, _ = self.env_file_contents(env_name)
+        yield (env_dir / public_env_filename).as_posix(), public_env
+        yield (env_dir / private_env_filename).as_posix(), private_env
+
+    def render_outputs(
+        self,
+        name: str = "api.http",
+        env_name: str | None = "dev",
+        public_env_filename: str = PUBLIC_ENV_FILENAME,
+        private_env_filename: str = PRIVATE_ENV_FILENAME,
+    ) -> dict[str, str]:
+        """All output as a mapping of relative path to content (see iter_outputs)."""
+        return dict(
+            self.iter_outputs(
+                name, env_name, public_env_filename, private_env_filename
+            )
+        )
 
     # --- Multi-file helpers ---
-    def _group_requests_by_path(self) -> dict[str, list]:
-        """Group HttpRequest objects by their base path (without query lines).
+    def _group_requests_by_path(self) -> dict[str, list[RequestIR]]:
+        """Group requests by their base path (without query lines).
 
         Some paths may contain newlines with query placeholders; only the first
         line (the actual path) is used for grouping and directory structure.
         """
-        groups: dict[str, list] = {}
-        for req in self.http_file.requests:
+        groups: dict[str, list[RequestIR]] = {}
+        for req in self.requests:
             base_path = req.path.split("\n", 1)[0]
             groups.setdefault(base_path, []).append(req)
         return groups
 
+    @staticmethod
+    def _target_file(out_dir: Path, path: str, filename: str) -> Path:
+        """Return out_dir/<path segments>/filename for an API path."""
+        # Normalize and split path into segments, ignoring leading '/'
+        parts = [seg for seg in path.split("/") if seg]
+        target_dir = out_dir
+        for seg in parts:
+            target_dir = target_dir / seg
+        return target_dir / filename
+
     def to_http_files(self, out_dir: Path, filename: str = "index.http") -> None:
         """Write one .http file per API path under out_dir.
 
@@ -193,23 +646,306 @@ class HtttpFileGenerator:
         like "/api/v1/users/{id}" will be written to:
             out_dir/api/v1/users/{id}/index.http
         The file content includes the shared block and all methods for that path.
+
+        Files are written in parallel and only if their content changed. With
+        settings.prune_orphans, .http and body files of paths that no longer
+        exist are deleted. Counts are stored in write_stats.
         """
         out_dir.mkdir(parents=True, exist_ok=True)
-        groups = self._group_requests_by_path()
-        for path, reqs in groups.items():
-            # Normalize and split path into segments, ignoring leading '/'
-            parts = [seg for seg in path.split("/") if seg]
-            target_dir = out_dir
-            for seg in parts:
-                target_dir = target_dir / seg
-            target_dir.mkdir(parents=True, exist_ok=True)
-            target_file = target_dir / filename
-
-            data = HttpFileData(base_urls=self.http_file.base_urls, requests=reqs)
-            content = data.to_http_file(
-                include_examples=self.settings.include_examples,
-                include_schema=self.settings.include_schema,
-                editor_mode=self.settings.editor_mode,
+        renderer = self._renderer()
+        prune_globs = (
+            (f"**/{filename}", f"**/{BODIES_DIR}/*.json")
+            if self.settings.prune_orphans
+            else ()
+        )
+        with FileWriter(out_dir, fsync=self.settings.fsync) as writer:
+            for path, reqs in self._group_requests_by_path().items():
+                target = self._target_file(out_dir, path, filename).relative_to(
+                    out_dir
+                )
+                # Render the group directly; wrapping it in a new HttpFileData
+                # would validate every request of the spec a second time.
+                sidecars: dict[str, str] = {}
+                writer.add(target, renderer.render_file(reqs, sidecars))
+                for name, content in sidecars.items():
+                    writer.add(target.parent / name, content)
+            self.write_stats = writer.commit(prune_globs=prune_globs)
+
+    def to_http_shards(self, out_dir: Path) -> list[dict[str, Any]]:
+        """Split the requests into shard files under out_dir, plus index.json.
+
+        Requests are grouped by settings.shard_by (first tag, path prefix, or
+        all together); groups over shard_max_requests or shard_max_bytes are
+        split into consecutive parts. Shards are written in parallel, shards
+        listed by a previous index but no longer produced are removed, and the
+        returned shard list is also written to out_dir/index.json.
+        """
+        out_dir.mkdir(parents=True, exist_ok=True)
+        sidecars: dict[str, str] = {}
+        index: list[dict[str, Any]] = []
+        with FileWriter(out_dir, fsync=self.settings.fsync) as writer:
+            for info, content in self._iter_shards(sidecars):
+                writer.add(info["file"], content)
+                index.append(info)
+            for name, content in sidecars.items():
+                writer.add(name, content)
+            self.write_stats = writer.commit()
+
+        index_file = out_dir / SHARD_INDEX_FILENAME
+        self._remove_stale_shards(
+            out_dir, index_file, {info["file"] for info in index}
+        )
+        atomic_write_text(
+            index_file, self._shard_index_json(index), fsync=self.settings.fsync
+        )
+        return index
+
+    def _iter_shards(
+        self, sidecars: dict[str, str]
+    ) -> Iterator[tuple[dict[str, Any], str]]:
+        """Yield every shard file as (index info, content).
+
+        All requests are rendered before the first shard is yielded, so
+        sidecars is complete by then. Each group's blocks are released once
+        its shards have been yielded.
+        """
+        settings = self.settings
+        renderer = self._renderer()
+
+        groups: dict[str, list[str]] = {}
+        operations = iter_operations(
+            self._openapi_model.paths or {}, settings.selection
+        )
+        for (path, _, operation), request in zip(operations, self.requests):
+            key = shard_key(
+                path, operation, settings.shard_by, settings.shard_prefix_depth
             )
-            with Path.open(target_file, "w") as f:
-                f.write(content)
+            block = renderer.render_request(request, sidecars)
+            groups.setdefault(key, []).append(block)
+
+        taken: set[str] = set()
+        while groups:
+            key = next(iter(groups))
+            blocks = groups.pop(key)
+            for part in split_blocks(
+                blocks, settings.shard_max_requests, settings.shard_max_bytes
+            ):
+                content = renderer.render_blocks(part)
+                info = {
+                    "file": shard_filename(key, taken),
+                    "key": key,
+                    "requests": len(part),
+                    "bytes": len(content.encode()),
+                }
+                yield info, content
+
+    def _shard_index_json(self, index: list[dict[str, Any]]) -> str:
+        return json.dumps(
+            {
+                "shard_by": self.settings.shard_by.value,
+                "requests": sum(info["requests"] for info in index),
+                "shards": index,
+            },
+            indent=2,
+        )
+
+    @staticmethod
+    def _remove_stale_shards(out_dir: Path, index_file: Path, keep: set[str]) -> None:
+        try:
+            previous = json.loads(index_file.read_text())["shards"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        for info in previous:
+            name = info.get("file") if isinstance(info, dict) else None
+            if name and name not in keep and Path(name).name == name:
+                (out_dir / name).unlink(missing_ok=True)
+
+    # --- Incremental helpers ---
+    def manifest_path(self, out_path: Path) -> Path:
+        """Location of the incremental manifest for the given output path."""
+        if self.settings.filemode == Filemode.SINGLE:
+            return out_path.parent / f".{out_path.name}.manifest.json"
+        if out_path.suffix == ".http":
+            return out_path.parent / out_path.stem / MANIFEST_FILENAME
+        return out_path / MANIFEST_FILENAME
+
+    def _context_digest(self) -> str:
+        """Digest of everything besides the operation that shapes its block."""
+        return digest(
+            {
+                "settings": self.settings.model_dump(
+                    mode="json",
+                    include={
+                        "include_examples",
+                        "include_schema",
+                        "editor_mode",
+                        "body_file_threshold",
+                    },
+                ),
+                "root_security": self._openapi_model.security,
+                "security_schemes": self._security_schemes(),
+            }
+        )
+
+    def _build_manifest(
+        self, previous: GenerationManifest | None
+    ) -> tuple[GenerationManifest, IncrementalStats]:
+        """Fingerprint every selected operation, rebuilding only changed ones.
+
+        Sidecar names are unique across the operations sharing a bodies
+        directory (the whole file in SINGLE mode, one path in MULTI mode),
+        as in a full render; names of reused operations are kept.
+        """
+        context = self._context_digest()
+        old_entries = previous.entries if previous else {}
+        entries: dict[str, ManifestEntry] = {}
+        stats = IncrementalStats()
+        root_security = self._openapi_model.security
+        security_schemes = self._security_schemes()
+        renderer = self._renderer()
+        single = self.settings.filemode == Filemode.SINGLE
+
+        operations = []
+        # bodies directory scope -> sidecar names in use
+        taken: dict[str, set[str]] = {}
+        for path, method, operation in iter_operations(
+            self._openapi_model.paths or {}, self.settings.selection
+        ):
+            key = f"{method} {path}"
+            fingerprint = operation_fingerprint(path, method, operation, context)
+            old = old_entries.get(key)
+            reused = old is not None and old.fingerprint == fingerprint
+            if old is not None and reused:
+                scope = "" if single else old.group
+                taken.setdefault(scope, set()).update(old.sidecars)
+            operations.append((key, path, method, operation, fingerprint, old, reused))
+
+        for key, path, method, operation, fingerprint, old, reused in operations:
+            if old is not None and reused:
+                entries[key] = old
+                stats.reused += 1
+                count_operation()
+                continue
+            with timed("model_build"):
+                request = RequestIR.from_operation(
+                    path=path,
+                    method=method,  # type: ignore[arg-type]
+                    operation=operation,
+                    root_security=root_security,  # type: ignore[arg-type]
+                    security_schemes=security_schemes,  # type: ignore[arg-type]
+                )
+            count_operation()
+            group = request.path.split("\n", 1)[0]
+            scope_taken = taken.setdefault("" if single else group, set())
+            sidecars = _ScopedSidecars(scope_taken)
+            block = renderer.render_request(request, sidecars)
+            scope_taken.update(sidecars)
+            entries[key] = ManifestEntry(
+                fingerprint=fingerprint,
+                group=group,
+                block=block,
+                sidecars=dict(sidecars),
+            )
+            if old is None:
+                stats.added += 1
+            else:
+                stats.changed += 1
+        stats.removed = len(old_entries.keys() - entries.keys())
+        return GenerationManifest(context=context, entries=entries), stats
+
+    @staticmethod
+    def _remove_stale_sidecars(
+        previous: GenerationManifest | None,
+        manifest: GenerationManifest,
+        base_dir: Callable[[str], Path],
+    ) -> int:
+        """Delete sidecars previous referenced that manifest no longer does.
+
+        base_dir maps an entry's group to the directory its sidecar names are
+        relative to. Returns the number of files removed.
+        """
+        if previous is None:
+            return 0
+
+        def sidecar_paths(m: GenerationManifest) -> set[Path]:
+            return {
+                base_dir(entry.group) / name
+                for entry in m.entries.values()
+                for name in entry.sidecars
+            }
+
+        removed = 0
+        for path in sidecar_paths(previous) - sidecar_paths(manifest):
+            if path.is_file():
+                path.unlink()
+                removed += 1
+        return removed
+
+    def _to_http_file_incremental(self, out_path: Path) -> None:
+        manifest_file = self.manifest_path(out_path)
+        previous = GenerationManifest.load(manifest_file)
+        manifest, stats = self._build_manifest(previous)
+        self.incremental_stats = stats
+        if previous is not None and not stats.has_changes and out_path.exists():
+            return
+        with atomic_open(out_path, fsync=self.settings.fsync) as f:
+            f.writelines(
+                HttpFileData.iter_blocks(
+                    (entry.block for entry in manifest.entries.values()),
+                    editor_mode=self.settings.editor_mode,
+                )
+            )
+        for entry in manifest.entries.values():
+            self._write_sidecars(out_path.parent, entry.sidecars)
+        self._remove_stale_sidecars(previous, manifest, lambda _: out_path.parent)
+        manifest.save(manifest_file, fsync=self.settings.fsync)
+
+    def _to_http_files_incremental(
+        self, out_dir: Path, filename: str = "index.http"
+    ) -> None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = self.manifest_path(out_dir)
+        previous = GenerationManifest.load(manifest_file)
+        manifest, stats = self._build_manifest(previous)
+        self.incremental_stats = stats
+
+        old_groups = previous.groups() if previous else {}
+        with FileWriter(out_dir, fsync=self.settings.fsync) as writer:
+            for path, keys in manifest.groups().items():
+                target_file = self._target_file(out_dir, path, filename)
+                unchanged = (
+                    previous is not None
+                    and old_groups.get(path) == keys
+                    and all(
+                        previous.entries[k].fingerprint
+                        == manifest.entries[k].fingerprint
+                        for k in keys
+                    )
+                )
+                if unchanged and target_file.exists():
+                    continue
+                target = target_file.relative_to(out_dir)
+                writer.add(
+                    target,
+                    HttpFileData.join_blocks(
+                        (manifest.entries[k].block for k in keys),
+                        editor_mode=self.settings.editor_mode,
+                    ),
+                )
+                for k in keys:
+                    for name, content in manifest.entries[k].sidecars.items():
+                        writer.add(target.parent / name, content)
+            self.write_stats = writer.commit()
+
+        # Remove files of API paths that no longer have any operations
+        for path in old_groups.keys() - manifest.groups().keys():
+            orphan = self._target_file(out_dir, path, filename)
+            if orphan.exists():
+                orphan.unlink()
+                self.write_stats.removed += 1
+        self.write_stats.removed += self._remove_stale_sidecars(
+            previous,
+            manifest,
+            lambda group: self._target_file(out_dir, group, filename).parent,
+        )
+        manifest.save(manifest_file, fsync=self.settings.fsync)
@@ -4,7 +4,8 @@ from .http_file.request import HttpRequest
 from .http_file.scripts import HttpScript
 from .http_file.var import HttpVariable, BaseURL
 from .http_file.open_api_parser import OpenApiParser
-from .settings.settings import HttpSettings, Filemode, EditorMode
+from .settings.settings import HttpSettings, Filemode, EditorMode, ShardBy
+from .utils.selection import OperationSelection
 from .enums import METHOD
 
 __all__ = [
@@ -18,5 +19,7 @@ __all__ = [
     "HttpSettings",
     "Filemode",
     "EditorMode",
+    "ShardBy",
+    "OperationSelection",
     "METHOD",
 ]
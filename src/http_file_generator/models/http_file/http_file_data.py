@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Iterable, Iterator, TextIO, Union
 from openapi_pydantic import PathItem
 from openapi_pydantic.v3.v3_0 import Server as Server3_0
 from openapi_pydantic.v3.v3_1 import Server as Server3_1
@@ -8,16 +8,42 @@ from openapi_pydantic.v3.v3_0 import Reference as Reference3_0
 from openapi_pydantic.v3.v3_1 import Reference as Reference3_1
 from pydantic import BaseModel, Field
 
-from .request import HttpRequest
+from .ir import RequestIR
+from .renderer import RENDERERS, get_renderer
+from .request import HttpRequest, Operation
 from ..enums import METHOD
 from .var import BaseURL
 from ..settings.settings import EditorMode
+from ..utils.selection import OperationSelection
 
 Server = Union[Server3_0, Server3_1]
 SecurityScheme = Union[SecurityScheme3_0, SecurityScheme3_1]
 Reference = Union[Reference3_0, Reference3_1]
 
 
+def iter_operations(
+    paths: dict[str, PathItem], selection: OperationSelection | None = None
+) -> Iterator[tuple[str, str, Operation]]:
+    """Yield (path, METHOD, operation) for every operation kept by the selection.
+
+    Operations are discovered from the PathItem field order, so the output
+    order matches the spec without dumping whole path items.
+    """
+    for path, path_item in paths.items():
+        for field in type(path_item).model_fields:
+            method = field.upper()
+            if method not in METHOD:
+                continue
+            operation = getattr(path_item, field, None)
+            if not operation:
+                continue
+            if selection is not None and not selection.matches(
+                path, method, operation
+            ):
+                continue
+            yield path, method, operation
+
+
 class HttpFileData(BaseModel):
     base_urls: set[BaseURL] = Field(..., description="Base URL for all requests")
     # auth: str | None = Field(None, description="Authorization header value")
@@ -30,24 +56,32 @@ class HttpFileData(BaseModel):
         paths: dict[str, PathItem],
         root_security: list[dict] | None = None,
         security_schemes: dict[str, Union[SecurityScheme, Reference]] | None = None,
+        selection: OperationSelection | None = None,
     ) -> "HttpFileData":
         """
         Convert a paths object to a list of HTTP requests
+
+        Operations not kept by selection are skipped before any sampling.
         """
         requests = []
-        for path, path_item in paths.items():
-            for method in path_item.model_dump(exclude_none=True):
-                if method.upper() in METHOD:
-                    operation = getattr(path_item, method)
-                    if operation:
-                        request = HttpRequest.from_operation(
-                            path=path,
-                            method=method.upper(),
-                            operation=operation,
-                            root_security=root_security,  # type: ignore[arg-type]
-                            security_schemes=security_schemes,  # type: ignore[arg-type]
-                        )
-                        requests.append(request)
+        for path, method, operation in iter_operations(paths, selection):
+            request = HttpRequest.from_operation(
+                path=path,
+                method=method,  # type: ignore[arg-type]
+                operation=operation,
+                root_security=root_security,  # type: ignore[arg-type]
+                security_schemes=security_schemes,  # type: ignore[arg-type]
+            )
+            requests.append(request)
+
+        return cls(
+            base_urls=cls.base_urls_from_servers(server),
+            requests=requests,
+        )
+
+    @staticmethod
+    def base_urls_from_servers(server: list[Server]) -> set[BaseURL]:
+        """Collect the usable server URLs of a spec as BaseURL variables."""
         base_urls = set()
         for srv in server:
             # Skip invalid server URLs (empty, "/", or whitespace-only)
@@ -57,11 +91,7 @@ class HttpFileData(BaseModel):
             base_urls.add(
                 BaseURL(value=srv.url, description=srv.description or "")
             )
-
-        return cls(
-            base_urls=base_urls,
-            requests=requests,
-        )
+        return base_urls
 
     def to_http_file(
         self,
@@ -72,46 +102,105 @@ class HttpFileData(BaseModel):
         """
         Convert the data to an HTTP file string
         """
-        parts = []
+        return self.render_requests(
+            self.requests,
+            include_examples=include_examples,
+            include_schema=include_schema,
+            editor_mode=editor_mode,
+        )
 
-        # Add editor-specific header
-        header = self._get_editor_header(editor_mode)
-        if header:
-            parts.append(header)
+    def render_into(
+        self,
+        stream: TextIO,
+        include_examples: bool = False,
+        include_schema: bool = False,
+        editor_mode: EditorMode = EditorMode.DEFAULT,
+    ) -> None:
+        """Write the HTTP file to a text stream chunk by chunk."""
+        self.render_requests_into(
+            stream,
+            self.requests,
+            include_examples=include_examples,
+            include_schema=include_schema,
+            editor_mode=editor_mode,
+        )
 
-        # requests
-        requests_content = "\n\n".join(
-            request.to_http_file(
-                base_url="{{BASE_URL}}",
+    @classmethod
+    def render_requests(
+        cls,
+        requests: Iterable[HttpRequest | RequestIR],
+        include_examples: bool = False,
+        include_schema: bool = False,
+        editor_mode: EditorMode = EditorMode.DEFAULT,
+    ) -> str:
+        """Render requests into an HTTP file string without wrapping them.
+
+        Lets callers render any subset of existing requests (e.g. one API path
+        in MULTI mode) without building and re-validating a new HttpFileData.
+        """
+        return "".join(
+            cls.iter_requests_rendered(
+                requests,
                 include_examples=include_examples,
                 include_schema=include_schema,
+                editor_mode=editor_mode,
             )
-            for request in self.requests
         )
-        parts.append(requests_content)
 
-        return "\n\n".join(parts)
+    @classmethod
+    def render_requests_into(
+        cls,
+        stream: TextIO,
+        requests: Iterable[HttpRequest | RequestIR],
+        include_examples: bool = False,
+        include_schema: bool = False,
+        editor_mode: EditorMode = EditorMode.DEFAULT,
+    ) -> None:
+        """Stream rendered requests to a text stream.
+
+        Requests are consumed one at a time, so with a lazy iterable only the
+        request being rendered is held in memory.
+        """
+        write = stream.write
+        for chunk in cls.iter_requests_rendered(
+            requests,
+            include_examples=include_examples,
+            include_schema=include_schema,
+            editor_mode=editor_mode,
+        ):
+            write(chunk)
+
+    @classmethod
+    def iter_requests_rendered(
+        cls,
+        requests: Iterable[HttpRequest | RequestIR],
+        include_examples: bool = False,
+        include_schema: bool = False,
+        editor_mode: EditorMode = EditorMode.DEFAULT,
+    ) -> Iterator[str]:
+        """Yield the chunks of an HTTP file, in the layout of join_blocks."""
+        renderer = get_renderer(
+            editor_mode,
+            include_examples=include_examples,
+            include_schema=include_schema,
+        )
+        return renderer.iter_file(requests)
+
+    @classmethod
+    def join_blocks(
+        cls, blocks: Iterable[str], editor_mode: EditorMode = EditorMode.DEFAULT
+    ) -> str:
+        """Assemble rendered request blocks into a complete HTTP file string."""
+        return "".join(cls.iter_blocks(blocks, editor_mode=editor_mode))
+
+    @classmethod
+    def iter_blocks(
+        cls, blocks: Iterable[str], editor_mode: EditorMode = EditorMode.DEFAULT
+    ) -> Iterator[str]:
+        """Yield the chunks of join_blocks without building the whole string."""
+        return get_renderer(editor_mode).iter_blocks(blocks)
 
-    def _get_editor_header(self, editor_mode: EditorMode) -> str:
+    @staticmethod
+    def _get_editor_header(editor_mode: EditorMode) -> str:
         """Generate editor-specific header comments."""
-        if editor_mode == EditorMode.DEFAULT:
-            return ""
-        elif editor_mode == EditorMode.KULALA:
-            return (
-                "# Kulala.nvim HTTP file\n"
-                "# https://github.com/mistweaverco/kulala.nvim\n"
-                "# Supports: {{variable}}, # @name, pre/post scripts"
-            )
-        elif editor_mode == EditorMode.PYCHARM:
-            return (
-                "# JetBrains HTTP Client file\n"
-                "# Supports: {{variable}}, # @name, > {% %} response handlers\n"
-                "# Docs: https://www.jetbrains.com/help/idea/http-client-in-product-code-editor.html"
-            )
-        elif editor_mode == EditorMode.HTTPYAC:
-            return (
-                "# httpyac HTTP file\n"
-                "# https://httpyac.github.io/\n"
-                "# Supports: {{variable}}, {{$dynamic}}, # @name, IntelliJ syntax"
-            )
-        return ""
+        return RENDERERS[editor_mode].header
@@ -0,0 +1,72 @@
+from dataclasses import dataclass, field
+from typing import Any, Union
+
+from ..enums import METHOD
+from .request import (
+    HttpRequest,
+    Operation,
+    Reference,
+    SecurityScheme,
+    _RequestRendering,
+)
+from .scripts import HttpScript
+from .var import VariableIR
+
+
+@dataclass(slots=True)
+class RequestIR(_RequestRendering):
+    """Compact, unvalidated request used inside the generation pipeline.
+
+    Built from operations that were already validated as part of the OpenAPI
+    model, so it skips pydantic validation and stores its fields (and its
+    params, as VariableIR) in slots.
+    Use to_model() to hand a validated HttpRequest to callers.
+    """
+
+    method: METHOD
+    path: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+    summary: str | None = None
+    description: str | None = None
+    params: list[VariableIR] = field(default_factory=list)
+    pre_script: HttpScript | None = None
+    post_script: HttpScript | None = None
+    response_examples: list[dict[str, Any]] | None = None
+    request_examples: list[dict[str, Any]] | None = None
+
+    @classmethod
+    def from_operation(
+        cls,
+        method: METHOD,
+        path: str,
+        operation: Operation,
+        root_security: list[dict] | None = None,
+        security_schemes: dict[str, Union[SecurityScheme, Reference]] | None = None,
+    ) -> "RequestIR":
+        fields = HttpRequest._operation_fields(
+            method=method,
+            path=path,
+            operation=operation,
+            root_security=root_security,
+            security_schemes=security_schemes,
+            variable=VariableIR,
+        )
+        fields["method"] = METHOD(fields["method"])
+        return cls(**fields)
+
+    def to_model(self) -> HttpRequest:
+        """Return the validated public HttpRequest for this request."""
+        return HttpRequest(
+            method=self.method,
+            path=self.path,
+            headers=self.headers,
+            body=self.body,
+            summary=self.summary,
+            description=self.description,
+            params=[param.to_model() for param in self.params],
+            pre_script=self.pre_script,
+            post_script=self.post_script,
+            response_examples=self.response_examples,
+            request_examples=self.request_examples,
+        )
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+
+
+class RenderPreview(BaseModel):
+    """The first lines of a rendered HTTP file plus cheap size estimates."""
+
+    lines: list[str] = Field(..., description="Preview lines, at most the budget")
+    truncated: bool = Field(False, description="Whether more content follows")
+    operations: int = Field(0, description="Number of selected operations")
+    rendered: int = Field(0, description="Requests rendered to fill the preview")
+    rendered_chars: int = Field(
+        0, description="Characters rendered to fill the preview, header included"
+    )
+
+    @property
+    def estimated_size(self) -> int:
+        """Estimated size of the complete file in characters.
+
+        Extrapolated from the average size of the requests rendered so far;
+        exact when the preview was not truncated.
+        """
+        if not self.truncated or not self.rendered:
+            return self.rendered_chars
+        return round(self.rendered_chars / self.rendered * self.operations)
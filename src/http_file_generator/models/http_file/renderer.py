@@ -0,0 +1,306 @@
+import json
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator
+
+from ..settings.settings import EditorMode
+
+SEPARATOR = "#" * 53 + "\n"
+# Directory, relative to the .http file, that externalised bodies are written to
+BODIES_DIR = "bodies"
+
+
+class HttpRenderer:
+    """Render requests into .http text for one editor mode.
+
+    Everything that does not depend on a request (the file header, the fixed
+    fragments around each field, the base URL and which optional sections are
+    rendered) is compiled once when the renderer is created. Rendering a
+    request then only collects its field values into a list and joins it.
+
+    Subclasses adapt the output to a specific editor by overriding header or
+    _compile. Use get_renderer to obtain a cached renderer for a mode.
+    """
+
+    editor_mode: EditorMode = EditorMode.DEFAULT
+    header: str = ""
+
+    def __init__(
+        self,
+        base_url: str = "{{BASE_URL}}",
+        include_examples: bool = False,
+        include_schema: bool = False,
+        body_threshold: int | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.include_examples = include_examples
+        self.include_schema = include_schema
+        self.body_threshold = body_threshold
+        self._compile()
+
+    def _compile(self) -> None:
+        """Precompute the fixed fragments used while rendering."""
+        self.file_prefix = f"{self.header}\n\n" if self.header else ""
+        self.request_separator = "\n\n"
+        self._request_title = SEPARATOR + "### Request: "
+        self._summary_title = "### Summary: "
+        self._description_title = "### Description: "
+        self._frontmatter_end = SEPARATOR + "\n\n"
+        self._url_prefix = " " + self.base_url
+        self._pre_script = ("< {% ", " %}\n\n")
+        self._post_script = ("\n\n> {% ", " %}")
+        self._request_examples_title = (
+            "\n### Request Examples\n" if self.include_schema else None
+        )
+        self._response_examples_title = (
+            "\n### Response Examples\n" if self.include_examples else None
+        )
+
+    # --- Whole files ---
+    def iter_file(
+        self, requests: Iterable[Any], sidecars: dict[str, str] | None = None
+    ) -> Iterator[str]:
+        """Yield the header and every rendered request, one chunk per request."""
+        return self.iter_blocks(
+            self.render_request(request, sidecars) for request in requests
+        )
+
+    def iter_blocks(self, blocks: Iterable[str]) -> Iterator[str]:
+        """Yield already rendered request blocks laid out as a file."""
+        if self.file_prefix:
+            yield self.file_prefix
+        first = True
+        for block in blocks:
+            if not first:
+                yield self.request_separator
+            first = False
+            yield block
+
+    def render_blocks(self, blocks: Iterable[str]) -> str:
+        return "".join(self.iter_blocks(blocks))
+
+    def render_file(
+        self, requests: Iterable[Any], sidecars: dict[str, str] | None = None
+    ) -> str:
+        return "".join(self.iter_file(requests, sidecars))
+
+    # --- Single requests ---
+    def render_request(
+        self, request: Any, sidecars: dict[str, str] | None = None
+    ) -> str:
+        """Render one HttpRequest or RequestIR into its .http block.
+
+        With a body_threshold and a sidecars mapping, bodies and examples
+        larger than the threshold are added to sidecars (relative path to
+        content) and referenced from the block instead of being inlined.
+        """
+        limit = self.body_threshold if sidecars is not None else None
+        parts: list[str] = []
+        append = parts.append
+        method = request.method
+        path = request.path
+
+        append(self._request_title)
+        append(method)
+        append(" ")
+        append(path.replace("\n", ""))
+        append("\n")
+        if request.summary:
+            append(self._summary_title)
+            append(request.summary.rstrip("\n") or "No summary provided")
+            append("\n")
+        if request.description:
+            append(self._description_title)
+            append(self._description(request.description))
+            append("\n")
+        append(self._frontmatter_end)
+
+        for param in request.params or ():
+            append(str(param))
+            append("\n")
+
+        # Pre-request script (IntelliJ format)
+        if request.pre_script:
+            append(self._pre_script[0])
+            append(request.pre_script.script)
+            append(self._pre_script[1])
+
+        append(method)
+        append(self._url_prefix)
+        append(path)
+        append("\n")
+        for key, value in request.headers.items():
+            append(f"{key}: {value}\n")
+        append("\n")
+        if request.body:
+            body = json.dumps(request.body, indent=4)
+            if limit is not None and sidecars is not None and len(body) > limit:
+                name = self._add_sidecar(sidecars, request, "", body + "\n")
+                append(f"< ./{name}")
+            else:
+                append(body)
+
+        # Post-request script (response handler, IntelliJ format)
+        if request.post_script:
+            append(self._post_script[0])
+            append(request.post_script.script)
+            append(self._post_script[1])
+
+        if self._request_examples_title and request.request_examples:
+            append(self._request_examples_title)
+            self._append_examples(
+                append,
+                request.request_examples,
+                True,
+                request if limit is not None else None,
+                sidecars,
+            )
+        if self._response_examples_title and request.response_examples:
+            append(self._response_examples_title)
+            self._append_examples(
+                append,
+                request.response_examples,
+                False,
+                request if limit is not None else None,
+                sidecars,
+            )
+        return "".join(parts)
+
+    @staticmethod
+    def _add_sidecar(
+        sidecars: dict[str, str], request: Any, suffix: str, content: str
+    ) -> str:
+        """Store content under a name derived from the request; return its path."""
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", request.path.split("\n", 1)[0])
+        stem = f"{request.method.lower()}_{slug.strip('_') or 'root'}{suffix}"
+        name = f"{BODIES_DIR}/{stem}.json"
+        counter = 1
+        while name in sidecars:
+            counter += 1
+            name = f"{BODIES_DIR}/{stem}_{counter}.json"
+        sidecars[name] = content
+        return name
+
+    @staticmethod
+    def _description(description: str) -> str:
+        if "\n" in description:
+            return "\n" + "\n".join(
+                f"###  {line}".rstrip() for line in description.splitlines()
+            )
+        return description
+
+    def _append_examples(
+        self,
+        append: Any,
+        examples: list[dict[str, Any]],
+        request: bool,
+        owner: Any = None,
+        sidecars: dict[str, str] | None = None,
+    ) -> None:
+        """Append commented examples; owner enables externalising large ones."""
+        append("\n")
+        for ex in examples:
+            ctype = ex.get("content_type")
+            name = ex.get("name")
+            if request:
+                append("## Request example (")
+                if ctype:
+                    append(ctype)
+            else:
+                append(f"## Response example ({ex.get('status')}")
+                if ctype:
+                    append(" ")
+                    append(ctype)
+            if name:
+                append(" - ")
+                append(name)
+            append(")\n")
+            value = ex.get("value")
+            if value is None:
+                append("# <no example available>\n\n")
+                continue
+            rendered = self.render_example_value(value)
+            limit = self.body_threshold
+            if (
+                owner is not None
+                and sidecars is not None
+                and limit is not None
+                and len(rendered) > limit
+            ):
+                kind = "request" if request else f"response_{ex.get('status')}"
+                sidecar = self._add_sidecar(
+                    sidecars, owner, f".{kind}_example", self._example_json(value)
+                )
+                append(f"# <example in ./{sidecar}>\n\n")
+                continue
+            append(rendered)
+
+    @staticmethod
+    def _example_json(value: Any) -> str:
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                return json.dumps(value) + "\n"
+        return json.dumps(value, indent=2) + "\n"
+
+    @staticmethod
+    def render_example_value(value: Any) -> str:
+        """Render an example value as a block of comment lines."""
+        if isinstance(value, (dict, list)):
+            body = json.dumps(value, indent=2)
+        elif isinstance(value, (int, float, bool)):
+            body = json.dumps(value)
+        else:
+            body = str(value)
+        return "".join(f"# {ln}\n" for ln in body.splitlines()) + "\n"
+
+
+class KulalaRenderer(HttpRenderer):
+    editor_mode = EditorMode.KULALA
+    header = (
+        "# Kulala.nvim HTTP file\n"
+        "# https://github.com/mistweaverco/kulala.nvim\n"
+        "# Supports: {{variable}}, # @name, pre/post scripts"
+    )
+
+
+class PycharmRenderer(HttpRenderer):
+    editor_mode = EditorMode.PYCHARM
+    header = (
+        "# JetBrains HTTP Client file\n"
+        "# Supports: {{variable}}, # @name, > {% %} response handlers\n"
+        "# Docs: https://www.jetbrains.com/help/idea/http-client-in-product-code-editor.html"
+    )
+
+
+class HttpyacRenderer(HttpRenderer):
+    editor_mode = EditorMode.HTTPYAC
+    header = (
+        "# httpyac HTTP file\n"
+        "# https://httpyac.github.io/\n"
+        "# Supports: {{variable}}, {{$dynamic}}, # @name, IntelliJ syntax"
+    )
+
+
+RENDERERS: dict[EditorMode, type[HttpRenderer]] = {
+    renderer.editor_mode: renderer
+    for renderer in (HttpRenderer, KulalaRenderer, PycharmRenderer, HttpyacRenderer)
+}
+
+
+@lru_cache(maxsize=64)
+def get_renderer(
+    editor_mode: EditorMode = EditorMode.DEFAULT,
+    base_url: str = "{{BASE_URL}}",
+    include_examples: bool = False,
+    include_schema: bool = False,
+    body_threshold: int | None = None,
+) -> HttpRenderer:
+    """Return the compiled renderer for an editor mode and render options."""
+    return RENDERERS[EditorMode(editor_mode)](
+        base_url=base_url,
+        include_examples=include_examples,
+        include_schema=include_schema,
+        body_threshold=body_threshold,
+    )
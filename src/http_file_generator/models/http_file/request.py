@@ -1,5 +1,4 @@
-import json
-from typing import Union, Any
+from typing import Any, TextIO, Union
 from openapi_pydantic.v3.v3_1 import (
     Parameter as Parameter3_1,
     RequestBody as RequestBody3_1,
@@ -22,11 +21,13 @@ from jsf import JSF
 from http_file_generator.models.utils.body_parsing import handle_body
 from http_file_generator.models.utils.parameter_parsing import handle_params
 from http_file_generator.models.utils.auth_parsing import apply_security
+from http_file_generator.models.utils.component_cache import cached_sample
 
 from ..enums import METHOD
 
+from .renderer import get_renderer
 from .scripts import HttpScript
-from .var import HttpVariable
+from .var import HttpVariable, VariableType
 
 Parameter = Union[Parameter3_0, Parameter3_1]
 RequestBody = Union[RequestBody3_0, RequestBody3_1]
@@ -35,10 +36,46 @@ Operation = Union[Operation3_0, Operation3_1]
 SecurityScheme = Union[SecurityScheme3_0, SecurityScheme3_1]
 Reference = Union[Reference3_0, Reference3_1]
 
-SEPARATOR = "#" * 53 + "\n"
+class _RequestRendering:
+    """Rendering of a single request into .http text.
 
+    Shared by the public HttpRequest model and the internal RequestIR; the
+    actual formatting lives in the compiled renderers (see renderer.py).
+    """
 
-class HttpRequest(BaseModel):
+    __slots__ = ()
+
+    def to_http_file(
+        self,
+        base_url: str,
+        include_examples: bool = False,
+        include_schema: bool = False,
+    ) -> str:
+        renderer = get_renderer(
+            base_url=base_url,
+            include_examples=include_examples,
+            include_schema=include_schema,
+        )
+        return renderer.render_request(self)
+
+    def render_into(
+        self,
+        stream: TextIO,
+        base_url: str,
+        include_examples: bool = False,
+        include_schema: bool = False,
+    ) -> None:
+        """Write the rendered request to a text stream."""
+        stream.write(
+            self.to_http_file(
+                base_url=base_url,
+                include_examples=include_examples,
+                include_schema=include_schema,
+            )
+        )
+
+
+class HttpRequest(_RequestRendering, BaseModel):
     method: METHOD = Field(..., description="HTTP method, e.g., GET, POST")
     path: str = Field(..., description="Request URL")
     headers: dict[str, str] = Field(
@@ -68,77 +105,6 @@ class HttpRequest(BaseModel):
         description=("List of request examples: {content_type, name?, value}."),
     )
 
-    def _frontmatter(self) -> str:
-        lines = ""
-        lines += SEPARATOR
-        lines += f"### Request: {self.method} {self.path.replace('\n', '')}\n"
-        if self.summary:
-            lines += (
-                f"### Summary: {self.summary.rstrip('\n') or 'No summary provided'}\n"
-            )
-        if self.description:
-            if "\n" in self.description:
-                desc = "\n" + "\n".join(
-                    [f"###  {line}".rstrip() for line in self.description.splitlines()]
-                )
-            else:
-                desc = self.description
-            lines += f"### Description: {desc or 'No description provided'}\n"
-        lines += SEPARATOR
-        lines += "\n\n"
-        return lines
-
-    def _body(self) -> str:
-        lines = ""
-        if self.body:
-            lines += json.dumps(self.body, indent=4)
-            lines += "\n"
-        return lines
-
-    def _params(self) -> str:
-        lines = ""
-        if not self.params:
-            return lines
-        for param in self.params:
-            lines += f"{str(param)}\n"
-        return lines
-
-    def to_http_file(
-        self,
-        base_url: str,
-        include_examples: bool = False,
-        include_schema: bool = False,
-    ) -> str:
-        lines = ""
-        lines += self._frontmatter()
-        lines += self._params()
-
-        # Add pre-request script if present (IntelliJ format)
-        if self.pre_script:
-            lines += f"< {{% {self.pre_script.script} %}}\n\n"
-
-        lines += f"{self.method} {base_url}{self.path}\n"
-        if self.headers:
-            for k, v in self.headers.items():
-                lines += f"{k}: {v}\n"
-        lines += "\n"
-        if self.body:
-            lines += json.dumps(self.body, indent=4)
-
-        # Add post-request script (response handler) if present (IntelliJ format)
-        if self.post_script:
-            lines += f"\n\n> {{% {self.post_script.script} %}}"
-
-        # Append commented request body examples if enabled
-        if include_schema and self.request_examples:
-            lines += "\n### Request Examples\n"
-            lines += self._render_request_examples(self.request_examples)
-        # Append commented response examples if enabled
-        if include_examples and self.response_examples:
-            lines += "\n### Response Examples\n"
-            lines += self._render_response_examples(self.response_examples)
-        return lines
-
     @classmethod
     def from_operation(
         cls,
@@ -151,13 +117,38 @@ class HttpRequest(BaseModel):
         """
         Create an HttpRequest object from an OpenAPI operation object.
         """
+        return cls(
+            **cls._operation_fields(
+                method=method,
+                path=path,
+                operation=operation,
+                root_security=root_security,
+                security_schemes=security_schemes,
+            )
+        )
+
+    @classmethod
+    def _operation_fields(
+        cls,
+        method: METHOD,
+        path: str,
+        operation: Operation,
+        root_security: list[dict] | None = None,
+        security_schemes: dict[str, Union[SecurityScheme, Reference]] | None = None,
+        variable: VariableType = HttpVariable,
+    ) -> dict[str, Any]:
+        """Parse an operation into the field values of a request.
+
+        Shared by from_operation and the unvalidated internal RequestIR, which
+        passes its own variable class for the params.
+        """
         # Handle request body - safely extract first content type
         bodies = handle_body(path, operation.requestBody)
         body_values = list(bodies.values()) if bodies else []
         (body, headers) = body_values[0] if body_values else (None, None)
 
         # Handle parameters
-        path, params = handle_params(path, operation.parameters)
+        path, params = handle_params(path, operation.parameters, variable)
 
         # Apply security requirements (OpenAPI security + Kulala semantics)
         path, headers, params = apply_security(
@@ -177,7 +168,7 @@ class HttpRequest(BaseModel):
         # Extract pre/post request scripts from OpenAPI extensions
         pre_script, post_script = cls._extract_scripts(operation)
 
-        return cls(
+        return dict(
             body=body,
             description=operation.description,
             headers=headers,
@@ -195,9 +186,9 @@ class HttpRequest(BaseModel):
     def _generate_sample_from_schema(schema: dict) -> Any:
         """Generate a sample value from a JSON schema. Returns None on failure."""
         try:
-            faker = JSF(schema=schema)
-            sample = faker.generate()
-            return sample
+            return cached_sample(
+                "example", schema, lambda: JSF(schema=schema).generate()
+            )
         except (ValueError, TypeError, KeyError, AttributeError):
             # Schema may be malformed or unsupported by JSF
             return None
@@ -299,35 +290,6 @@ class HttpRequest(BaseModel):
                     )
         return examples
 
-    @staticmethod
-    def _render_response_examples(examples: list[dict[str, Any]]) -> str:
-        lines = "\n"
-        for ex in examples:
-            status = ex.get("status")
-            ctype = ex.get("content_type")
-            name = ex.get("name")
-            header = f"## Response example ({status}"
-            if ctype:
-                header += f" {ctype}"
-            if name:
-                header += f" - {name}"
-            header += ")\n"
-            lines += header
-            value = ex.get("value")
-            if value is None:
-                lines += "# <no example available>\n\n"
-                continue
-            if isinstance(value, (dict, list)):
-                body = json.dumps(value, indent=2)
-            elif isinstance(value, (int, float, bool)):
-                body = json.dumps(value)
-            else:
-                body = str(value)
-            for ln in body.splitlines():
-                lines += f"# {ln}\n"
-            lines += "\n"
-        return lines
-
     @classmethod
     def _collect_request_examples(cls, operation: Operation) -> list[dict[str, Any]]:
         examples: list[dict[str, Any]] = []
@@ -366,31 +328,3 @@ class HttpRequest(BaseModel):
                     {"content_type": content_type, "name": None, "value": None}
                 )
         return examples
-
-    @staticmethod
-    def _render_request_examples(examples: list[dict[str, Any]]) -> str:
-        lines = "\n"
-        for ex in examples:
-            ctype = ex.get("content_type")
-            name = ex.get("name")
-            header = "## Request example ("
-            if ctype:
-                header += f"{ctype}"
-            if name:
-                header += f" - {name}"
-            header += ")\n"
-            lines += header
-            value = ex.get("value")
-            if value is None:
-                lines += "# <no example available>\n\n"
-                continue
-            if isinstance(value, (dict, list)):
-                body = json.dumps(value, indent=2)
-            elif isinstance(value, (int, float, bool)):
-                body = json.dumps(value)
-            else:
-                body = str(value)
-            for ln in body.splitlines():
-                lines += f"# {ln}\n"
-            lines += "\n"
-        return lines
@@ -1,32 +1,61 @@
+from dataclasses import dataclass
+
 from pydantic import BaseModel, Field
 
 
+def _render_variable(name: str, value: str, description: str) -> str:
+    lines = ""
+    if description:
+        if "\n" in description:
+            desc = "\n".join(
+                [f"# {line}".rstrip() for line in description.splitlines()]
+            )
+        else:
+            desc = f"# {description}"
+        lines += f"{desc + '\n' or ''}"
+    if value:
+        lines += f"@{name}={value}\n"
+        return lines
+    lines += f"# @prompt{name}\n"
+    return lines
+
+
 class HttpVariable(BaseModel):
     name: str = Field(..., description="Name of the variable")
     value: str = Field(..., description="Value of the variable")
     description: str = Field("", description="Description of the variable")
 
     def __str__(self) -> str:
-        lines = ""
-        if self.description:
-            if "\n" in self.description:
-                desc = "\n".join(
-                    [f"# {line}".rstrip() for line in self.description.splitlines()]
-                )
-            else:
-                desc = f"# {self.description}"
-            lines += f"{desc + '\n' or ''}"
-        if self.value:
-            lines += f"@{self.name}={self.value}\n"
-            return lines
-            # return f"{'# ' + self.description + '\n' if self.description else ''}@{self.name}={self.value}\n"
-        lines += f"# @prompt{self.name}\n"
-        return lines
-        # return f"{'# ' + self.description + '\n' if self.description else ''}# @prompt {self.name}\n"
+        return _render_variable(self.name, self.value, self.description)
 
     def __hash__(self) -> int:
         return hash((self.name, self.value))
 
 
+@dataclass(slots=True)
+class VariableIR:
+    """Compact, unvalidated HttpVariable used inside the generation pipeline.
+
+    Renders exactly like HttpVariable; see RequestIR.
+    """
+
+    name: str
+    value: str
+    description: str = ""
+
+    def __str__(self) -> str:
+        return _render_variable(self.name, self.value, self.description)
+
+    def to_model(self) -> HttpVariable:
+        return HttpVariable(
+            name=self.name, value=self.value, description=self.description
+        )
+
+
+# Either kind of variable, and the class parameter parsing builds them with
+Variable = HttpVariable | VariableIR
+VariableType = type[HttpVariable] | type[VariableIR]
+
+
 class BaseURL(HttpVariable):
     name: str = Field("BASE_URL", description="Name of the variable")
@@ -0,0 +1,17 @@
+from .manifest import GenerationManifest, ManifestEntry, IncrementalStats
+from .batch_manifest import BatchManifest, BatchManifestEntry
+from .batch_journal import BatchJournal
+from .batch_report import BatchReport, ResultStream, SpecMetrics, SpecResult
+
+__all__ = [
+    "GenerationManifest",
+    "ManifestEntry",
+    "IncrementalStats",
+    "BatchManifest",
+    "BatchManifestEntry",
+    "BatchJournal",
+    "BatchReport",
+    "ResultStream",
+    "SpecMetrics",
+    "SpecResult",
+]
@@ -0,0 +1,69 @@
+import os
+import threading
+from pathlib import Path
+from typing import IO
+
+from pydantic import BaseModel, ValidationError
+
+from .batch_manifest import BatchManifestEntry
+
+BATCH_JOURNAL_FILENAME = ".httpfilegen-batch-journal.jsonl"
+
+
+class JournalRecord(BaseModel):
+    spec: str
+    entry: BatchManifestEntry
+
+
+class BatchJournal:
+    """Append-only checkpoint of the specs a batch run has completed.
+
+    Every completed spec is appended as one JSON line and flushed right
+    away, so a run that is killed part way leaves a journal that a later
+    run can resume from. A torn last line is ignored on load. The journal
+    is removed once a run finishes.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False) -> None:
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._file: IO[str] | None = None
+
+    def load(self) -> dict[str, BatchManifestEntry]:
+        """Specs completed by previous, unfinished runs, by spec key."""
+        completed: dict[str, BatchManifestEntry] = {}
+        try:
+            lines = self.path.read_text().splitlines()
+        except OSError:
+            return completed
+        for line in lines:
+            try:
+                record = JournalRecord.model_validate_json(line)
+            except ValidationError:
+                continue
+            completed[record.spec] = record.entry
+        return completed
+
+    def open(self, resume: bool = False) -> None:
+        """Start recording; a fresh run discards the previous journal."""
+        self._file = self.path.open("a" if resume else "w", encoding="utf-8")
+
+    def record(self, spec: str, entry: BatchManifestEntry) -> None:
+        line = JournalRecord(spec=spec, entry=entry).model_dump_json()
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def close(self, finished: bool) -> None:
+        """Stop recording, removing the journal if the run finished."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        if finished:
+            self.path.unlink(missing_ok=True)
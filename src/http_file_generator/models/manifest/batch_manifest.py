@@ -0,0 +1,89 @@
+import json
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..utils.writer import atomic_write_text, file_digest
+
+BATCH_MANIFEST_VERSION = 1
+BATCH_MANIFEST_FILENAME = ".httpfilegen-batch-manifest.json"
+
+
+def tool_version() -> str:
+    """Installed httpfilegen version, recorded so upgrades regenerate everything."""
+    try:
+        return version("httpfilegen")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class BatchManifestEntry(BaseModel):
+    spec_digest: str = Field(..., description="sha256 of the spec file content")
+    settings_digest: str = Field(..., description="Digest of the effective settings")
+    dependencies: dict[str, str | None] = Field(
+        default_factory=dict,
+        description="sha256 of every local file the spec $refs (None if unreadable), "
+        "keyed relative to the manifest",
+    )
+    outputs: list[str] = Field(
+        default_factory=list,
+        description="Generated files and directories, relative to the manifest",
+    )
+
+    def inputs_match(self, spec_digest: str, settings_digest: str, root: Path) -> bool:
+        """Whether the spec, the files it $refs and the settings are unchanged."""
+        return (
+            self.spec_digest == spec_digest
+            and self.settings_digest == settings_digest
+            and all(
+                file_digest(root / path) == value
+                for path, value in self.dependencies.items()
+            )
+        )
+
+
+class BatchManifest(BaseModel):
+    """What each spec of a previous batch run was generated from.
+
+    Entries are keyed by the spec path relative to the batch root. A spec is
+    up to date when its content, the local files it $refs and the settings
+    hash the same as recorded and all of its outputs still exist. Manifests
+    written by another tool version are ignored, so upgrades regenerate
+    everything.
+    """
+
+    version: int = Field(BATCH_MANIFEST_VERSION, description="Manifest format version")
+    tool_version: str = Field(default_factory=tool_version)
+    entries: dict[str, BatchManifestEntry] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchManifest | None":
+        """Load a manifest, returning None if it is missing, unreadable or stale."""
+        if not path.is_file():
+            return None
+        try:
+            manifest = cls.model_validate_json(path.read_text())
+        except (OSError, ValidationError):
+            return None
+        if (
+            manifest.version != BATCH_MANIFEST_VERSION
+            or manifest.tool_version != tool_version()
+        ):
+            return None
+        return manifest
+
+    def save(self, path: Path, fsync: bool = False) -> None:
+        atomic_write_text(
+            path, json.dumps(self.model_dump(mode="json"), indent=2), fsync=fsync
+        )
+
+    def is_up_to_date(
+        self, key: str, spec_digest: str, settings_digest: str, root: Path
+    ) -> bool:
+        entry = self.entries.get(key)
+        return (
+            entry is not None
+            and entry.inputs_match(spec_digest, settings_digest, root)
+            and all((root / output).exists() for output in entry.outputs)
+        )
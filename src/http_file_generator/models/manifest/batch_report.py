@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Iterable, Literal
+
+from pydantic import BaseModel, Field
+
+from ..utils.writer import atomic_write_text
+
+BATCH_REPORT_VERSION = 1
+
+SpecStatus = Literal["ok", "up-to-date", "resumed", "failed"]
+
+
+class SpecMetrics(BaseModel):
+    """Where the time of one spec went, and how much it produced."""
+
+    seconds: dict[str, float] = Field(
+        default_factory=dict,
+        description="Wall time per pipeline stage (see timing.STAGES)",
+    )
+    total_seconds: float = 0.0
+    operations: int = 0
+    output_bytes: int = 0
+    document_cache_hits: int = 0
+    sample_cache_hits: int = 0
+
+
+class SpecResult(BaseModel):
+    spec: str = Field(..., description="Spec path relative to the batch root")
+    status: SpecStatus
+    error: str | None = None
+    metrics: SpecMetrics | None = Field(
+        None, description="Set for specs that were generated in this run"
+    )
+
+
+class BatchReport(BaseModel):
+    """Outcome of a batch run (or one shard of it), mergeable across shards."""
+
+    version: int = Field(BATCH_REPORT_VERSION, description="Report format version")
+    shard_index: int | None = Field(None, description="1-based shard, if sharded")
+    shard_count: int | None = None
+    results: list[SpecResult] = Field(default_factory=list)
+
+    def count(self, status: SpecStatus) -> int:
+        return sum(1 for result in self.results if result.status == status)
+
+    @property
+    def failures(self) -> list[SpecResult]:
+        return [result for result in self.results if result.status == "failed"]
+
+    def save(self, path: Path) -> None:
+        atomic_write_text(path, json.dumps(self.model_dump(mode="json"), indent=2))
+
+    @classmethod
+    def load(cls, path: Path) -> "BatchReport":
+        return cls.model_validate_json(path.read_text())
+
+    @classmethod
+    def merge(cls, reports: Iterable["BatchReport"]) -> "BatchReport":
+        """Combine shard reports into one, ordered by spec.
+
+        Raises ValueError if the reports belong to differently sized shardings
+        or the same shard appears twice.
+        """
+        reports = list(reports)
+        counts = {report.shard_count for report in reports}
+        if len(counts) > 1:
+            raise ValueError(
+                "Reports come from different shard counts: "
+                + ", ".join(str(count) for count in sorted(counts, key=str))
+            )
+        seen: set[int] = set()
+        for report in reports:
+            if report.shard_index is None:
+                continue
+            if report.shard_index in seen:
+                raise ValueError(f"Shard {report.shard_index} was given twice")
+            seen.add(report.shard_index)
+        results = [result for report in reports for result in report.results]
+        return cls(
+            shard_count=counts.pop() if counts else None,
+            results=sorted(results, key=lambda result: result.spec),
+        )
+
+    @staticmethod
+    def missing_shards(reports: Iterable["BatchReport"]) -> list[int]:
+        """Shards of a sharded run that none of the reports cover."""
+        reports = list(reports)
+        counts = {report.shard_count for report in reports} - {None}
+        if len(counts) != 1:
+            return []
+        present = {report.shard_index for report in reports}
+        return [i for i in range(1, counts.pop() + 1) if i not in present]
+
+
+def is_ndjson(path: Path) -> bool:
+    return path.suffix.lower() in (".ndjson", ".jsonl")
+
+
+class ResultStream:
+    """Append spec results to an NDJSON file, one line as each is reported.
+
+    Unlike a saved BatchReport, the file is usable while the batch is still
+    running and keeps the results of an interrupted one.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: IO[str] | None = None
+
+    def __enter__(self) -> "ResultStream":
+        self._file = self.path.open("w", encoding="utf-8")
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, result: SpecResult) -> None:
+        if self._file is None:
+            raise RuntimeError("ResultStream must be used as a context manager")
+        self._file.write(result.model_dump_json() + "\n")
+        self._file.flush()
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from ..utils.writer import atomic_write_text
+
+MANIFEST_VERSION = 1
+
+
+class ManifestEntry(BaseModel):
+    fingerprint: str = Field(..., description="Fingerprint of the resolved operation")
+    group: str = Field(..., description="API path used to group the request")
+    block: str = Field(..., description="Rendered .http block for the operation")
+    sidecars: dict[str, str] = Field(
+        default_factory=dict,
+        description="Externalised bodies referenced by the block, by relative path",
+    )
+
+
+class GenerationManifest(BaseModel):
+    """Per-operation fingerprints and rendered blocks from a previous run.
+
+    Entries are keyed by "METHOD /path" and kept in spec order, so the output
+    can be reassembled without rebuilding unchanged operations.
+    """
+
+    version: int = Field(MANIFEST_VERSION, description="Manifest format version")
+    context: str = Field(..., description="Digest of the generation settings")
+    entries: dict[str, ManifestEntry] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "GenerationManifest | None":
+        """Load a manifest, returning None if it is missing, unreadable or stale."""
+        if not path.is_file():
+            return None
+        try:
+            manifest = cls.model_validate_json(path.read_text())
+        except (OSError, ValidationError):
+            return None
+        if manifest.version != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def save(self, path: Path, fsync: bool = False) -> None:
+        atomic_write_text(
+            path,
+            json.dumps(self.model_dump(mode="json"), separators=(",", ":")),
+            fsync=fsync,
+        )
+
+    def groups(self) -> dict[str, list[str]]:
+        """Map each API path to the entry keys rendered into its file."""
+        groups: dict[str, list[str]] = {}
+        for key, entry in self.entries.items():
+            groups.setdefault(entry.group, []).append(key)
+        return groups
+
+
+class IncrementalStats(BaseModel):
+    added: int = Field(0, description="Operations new since the last run")
+    changed: int = Field(0, description="Operations whose fingerprint changed")
+    reused: int = Field(0, description="Operations reused from the manifest")
+    removed: int = Field(0, description="Operations no longer present")
+
+    @property
+    def rebuilt(self) -> int:
+        return self.added + self.changed
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
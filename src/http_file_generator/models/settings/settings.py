@@ -3,10 +3,21 @@ from pydantic import Field
 from pydantic_core import Url
 from pydantic_settings import BaseSettings
 
+from ..utils.selection import OperationSelection
+
 
 class Filemode(StrEnum):
     SINGLE = auto()
     MULTI = auto()
+    SHARDED = auto()
+
+
+class ShardBy(StrEnum):
+    """How SHARDED mode groups requests into files."""
+
+    TAG = auto()  # First OpenAPI tag of the operation
+    PREFIX = auto()  # First shard_prefix_depth path segments
+    SIZE = auto()  # Only by shard_max_requests / shard_max_bytes
 
 
 class EditorMode(StrEnum):
@@ -24,3 +35,18 @@ class HttpSettings(BaseSettings):
     include_examples: bool = Field(default=False, frozen=True)
     include_schema: bool = Field(default=False, frozen=True)
     editor_mode: EditorMode = Field(default=EditorMode.DEFAULT, frozen=True)
+    selection: OperationSelection = Field(
+        default_factory=OperationSelection, frozen=True
+    )
+    # Bodies and examples larger than this many characters are written to
+    # sidecar files under bodies/ next to the .http file (None inlines all)
+    body_file_threshold: int | None = Field(default=None, ge=0, frozen=True)
+    # SHARDED mode: grouping, then optional per-file limits splitting each group
+    shard_by: ShardBy = Field(default=ShardBy.TAG, frozen=True)
+    shard_prefix_depth: int = Field(default=1, ge=1, frozen=True)
+    shard_max_requests: int | None = Field(default=None, ge=1, frozen=True)
+    shard_max_bytes: int | None = Field(default=None, ge=1, frozen=True)
+    # MULTI mode: delete .http and body files of paths no longer in the spec
+    prune_orphans: bool = Field(default=False, frozen=True)
+    # Flush every written file (and its directory entry) to disk before rename
+    fsync: bool = Field(default=False, frozen=True)
@@ -0,0 +1,93 @@
+import io
+import tarfile
+import time
+import zipfile
+from contextlib import ExitStack
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+
+from .writer import atomic_open
+
+# Archive suffix -> tarfile mode, or "zip"
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "w",
+    ".tar.gz": "w:gz",
+    ".tgz": "w:gz",
+    ".tar.bz2": "w:bz2",
+    ".tar.xz": "w:xz",
+}
+
+
+def archive_format(path: Path) -> str:
+    """The archive format for path, chosen by its suffix."""
+    name = path.name.lower()
+    # Longest suffixes first so .tar.gz is not taken for .gz
+    for suffix in sorted(ARCHIVE_FORMATS, key=len, reverse=True):
+        if name.endswith(suffix):
+            return ARCHIVE_FORMATS[suffix]
+    raise ValueError(
+        f"Unsupported archive type: {path.name} "
+        f"(expected one of {', '.join(ARCHIVE_FORMATS)})"
+    )
+
+
+class ArchiveWriter:
+    """Stream text files into a zip or tar archive without writing them to disk.
+
+    The archive itself is written atomically (see atomic_open): it only
+    replaces path once every file has been added.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False) -> None:
+        self.path = path
+        self.format = archive_format(path)
+        self.fsync = fsync
+        self.count = 0
+        self._mtime = time.time()
+        self._stack = ExitStack()
+        self._archive: zipfile.ZipFile | tarfile.TarFile | None = None
+
+    def __enter__(self) -> "ArchiveWriter":
+        with ExitStack() as stack:
+            stream: IO[bytes] = stack.enter_context(
+                atomic_open(self.path, "wb", fsync=self.fsync)
+            )
+            archive: zipfile.ZipFile | tarfile.TarFile
+            if self.format == "zip":
+                archive = zipfile.ZipFile(
+                    stream, "w", compression=zipfile.ZIP_DEFLATED
+                )
+            else:
+                archive = tarfile.open(fileobj=stream, mode=self.format)
+            self._archive = stack.enter_context(archive)
+            self._stack = stack.pop_all()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool | None:
+        self._archive = None
+        return self._stack.__exit__(exc_type, exc, tb)
+
+    def add(self, name: str, content: str) -> None:
+        """Add a file at name (a relative, forward-slash path)."""
+        data = content.encode()
+        if isinstance(self._archive, zipfile.ZipFile):
+            info = zipfile.ZipInfo(name, time.localtime(self._mtime)[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o644 << 16
+            self._archive.writestr(info, data)
+        elif isinstance(self._archive, tarfile.TarFile):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(self._mtime)
+            info.mode = 0o644
+            self._archive.addfile(info, io.BytesIO(data))
+        else:
+            raise RuntimeError("ArchiveWriter must be used as a context manager")
+        self.count += 1
@@ -5,7 +5,7 @@ from openapi_pydantic.v3.v3_1 import SecurityScheme as SecurityScheme3_1
 from openapi_pydantic.v3.v3_0 import Operation as Operation3_0
 from openapi_pydantic.v3.v3_1 import Operation as Operation3_1
 
-from ..http_file.var import HttpVariable
+from ..http_file.var import Variable
 
 SecurityScheme = Union[SecurityScheme3_0, SecurityScheme3_1]
 Operation = Union[Operation3_0, Operation3_1]
@@ -34,11 +34,11 @@ def _choose_effective_security(
 def apply_security(
     path: str,
     headers: Dict[str, str] | None,
-    params: List[HttpVariable] | None,
+    params: List[Variable] | None,
     operation: Operation,
     root_security: List[dict] | None,
     security_schemes: Dict[str, SecurityScheme] | None,
-) -> Tuple[str, Dict[str, str], List[HttpVariable]]:
+) -> Tuple[str, Dict[str, str], List[Variable]]:
     """
     Apply OpenAPI security requirements to the request by mutating path, headers and params.
 
@@ -60,7 +60,7 @@ def apply_security(
 
     # Work on a copy of headers
     out_headers: Dict[str, str] = dict(headers or {})
-    out_params: List[HttpVariable] = list(params or [])
+    out_params: List[Variable] = list(params or [])
 
     for scheme_name, _scopes in first_alt.items():
         scheme = security_schemes.get(scheme_name) if security_schemes else None
@@ -17,6 +17,8 @@ from openapi_pydantic.v3.v3_0 import (
 )
 from jsf import JSF
 
+from .component_cache import cached_sample
+
 
 Parameter = Union[Parameter3_0, Parameter3_1]
 RequestBody = Union[RequestBody3_0, RequestBody3_1]
@@ -62,8 +64,13 @@ def handle_body(
 def _generate_sample_body_from_schema(schema: dict) -> dict:
     """Generate a sample dict conforming to the given JSON schema using jsf."""
     try:
-        faker = JSF(schema=schema, allow_none_optionals=0)
-        sample = faker.generate(n=1, use_defaults=True, use_examples=True)
+        sample = cached_sample(
+            "body",
+            schema,
+            lambda: JSF(schema=schema, allow_none_optionals=0).generate(
+                n=1, use_defaults=True, use_examples=True
+            ),
+        )
         if isinstance(sample, list):
             if sample:
                 return sample[0]
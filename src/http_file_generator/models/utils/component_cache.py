@@ -0,0 +1,173 @@
+import copy
+import json
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib.parse import unquote, urlparse
+
+from .fingerprint import digest
+from .timing import timed
+from .writer import atomic_write_text, content_digest
+
+_active: "ComponentCache | None" = None
+
+
+def _local_path(key: Any) -> Path | None:
+    """The local file behind a prance reference cache key, if any.
+
+    prance keys documents by "text_<url>" for the raw text and by
+    (<url>, strict) for the parsed content.
+    """
+    url = key[0] if isinstance(key, tuple) else key
+    if not isinstance(url, str):
+        return None
+    url = url.removeprefix("text_")
+    parsed = urlparse(url)
+    if parsed.scheme not in ("", "file"):
+        return None
+    return Path(unquote(parsed.path))
+
+
+class DocumentCache(MutableMapping):
+    """prance reference cache shared by every spec resolved while it is active.
+
+    Entries for local files remember the content hash of the file they were
+    read from and are dropped once the file changes, so a shared cache never
+    serves stale documents. Remote documents are kept for the cache's
+    lifetime.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[Any, tuple[str | None, Any]] = {}
+        # path -> (mtime_ns, size, digest), so unchanged files are hashed once
+        self._digests: dict[Path, tuple[int, int, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _file_digest(self, path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        known = self._digests.get(path)
+        if known and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return known[2]
+        try:
+            value = content_digest(path.read_bytes())
+        except OSError:
+            return None
+        self._digests[path] = (stat.st_mtime_ns, stat.st_size, value)
+        return value
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            version, value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        path = _local_path(key)
+        if path is not None and self._file_digest(path) != version:
+            del self._entries[key]
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        path = _local_path(key)
+        version = self._file_digest(path) if path is not None else None
+        self._entries[key] = (version, value)
+
+    def __delitem__(self, key: Any) -> None:
+        del self._entries[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ComponentCache:
+    """Resolved external documents and generated samples shared across specs.
+
+    Documents are shared through prance's reference cache (see
+    DocumentCache). Samples are keyed by a hash of the schema they were
+    generated from, so a component used by many operations or specs is
+    sampled once. With cache_dir, samples are also kept on disk, one file
+    per schema, for later runs of the same tool version.
+    """
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        self.cache_dir = cache_dir
+        self.documents = DocumentCache()
+        self._samples: dict[str, Any] = {}
+        self.sample_hits = 0
+        self.sample_misses = 0
+        self.sample_dir: Path | None = None
+        if cache_dir is not None:
+            from ..manifest.batch_manifest import tool_version
+
+            self.sample_dir = cache_dir / tool_version() / "samples"
+
+    def sample(self, kind: str, schema: dict, generate: Callable[[], Any]) -> Any:
+        """Return the cached sample for schema, generating it on first use.
+
+        kind separates samplers that produce different values for the same
+        schema. Callers get their own copy of the cached value.
+        """
+        key = digest({"kind": kind, "schema": schema})
+        if key not in self._samples and not self._load_sample(key):
+            self.sample_misses += 1
+            self._samples[key] = generate()
+            self._store_sample(key)
+        else:
+            self.sample_hits += 1
+        return copy.deepcopy(self._samples[key])
+
+    def _load_sample(self, key: str) -> bool:
+        if self.sample_dir is None:
+            return False
+        try:
+            content = (self.sample_dir / f"{key}.json").read_text()
+            self._samples[key] = json.loads(content)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _store_sample(self, key: str) -> None:
+        if self.sample_dir is None:
+            return
+        try:
+            content = json.dumps(self._samples[key])
+        except (TypeError, ValueError):
+            return
+        try:
+            self.sample_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.sample_dir / f"{key}.json", content)
+        except OSError:
+            pass
+
+
+@contextmanager
+def use_component_cache(cache: ComponentCache | None) -> Iterator[None]:
+    """Make cache the active component cache for the duration of the block."""
+    global _active
+    previous, _active = _active, cache
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+def active_component_cache() -> ComponentCache | None:
+    return _active
+
+
+def cached_sample(kind: str, schema: dict, generate: Callable[[], Any]) -> Any:
+    """generate(), memoized by schema in the active component cache, if any."""
+    with timed("sample"):
+        if _active is None:
+            return generate()
+        return _active.sample(kind, schema, generate)
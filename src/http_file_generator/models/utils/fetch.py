@@ -0,0 +1,36 @@
+import asyncio
+import urllib.error
+import urllib.request
+
+# Seconds allowed for fetching one spec
+FETCH_TIMEOUT = 30.0
+
+
+def fetch_text(url: str, timeout: float = FETCH_TIMEOUT) -> str:
+    """Fetch url and decode it as text, raising ValueError on any failure."""
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as resp:
+            charset = resp.headers.get_content_charset() or "utf-8"
+            return resp.read().decode(charset)
+    except urllib.error.HTTPError as e:
+        raise ValueError(f"HTTP error fetching spec from '{url}': {e.code} {e.reason}")
+    except urllib.error.URLError as e:
+        raise ValueError(f"Network error fetching spec from '{url}': {e.reason}")
+    except TimeoutError:
+        raise ValueError(
+            f"Timeout fetching spec from '{url}' ({timeout:g}s limit exceeded)"
+        )
+    except Exception as e:
+        raise ValueError(f"Failed to fetch spec from '{url}': {e}")
+
+
+async def fetch_text_bounded(
+    url: str, semaphore: asyncio.Semaphore, timeout: float = FETCH_TIMEOUT
+) -> str:
+    """fetch_text without blocking the event loop, once semaphore admits it.
+
+    The request itself runs in a thread, so up to the semaphore's limit of
+    fetches wait on the network at once.
+    """
+    async with semaphore:
+        return await asyncio.to_thread(fetch_text, url, timeout)
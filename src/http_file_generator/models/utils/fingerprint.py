@@ -0,0 +1,44 @@
+import hashlib
+import json
+from typing import Any, Union
+
+from openapi_pydantic.v3.v3_0 import Operation as Operation3_0
+from openapi_pydantic.v3.v3_1 import Operation as Operation3_1
+from pydantic import BaseModel
+
+Operation = Union[Operation3_0, Operation3_1]
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def digest(value: Any) -> str:
+    """Return a stable sha256 hex digest of a JSON-serializable value.
+
+    Pydantic models are dumped first; dict keys are sorted so that equal
+    content always hashes the same regardless of insertion order.
+    """
+    payload = json.dumps(
+        _jsonable(value), sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def operation_fingerprint(
+    path: str, method: str, operation: Operation, context: str = ""
+) -> str:
+    """Fingerprint a resolved operation together with its generation context.
+
+    context should be a digest of everything outside the operation that still
+    influences its rendered block (settings, security schemes, ...).
+    """
+    return digest(
+        {"path": path, "method": method, "operation": operation, "context": context}
+    )
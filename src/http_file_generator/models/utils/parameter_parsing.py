@@ -15,8 +15,8 @@ from openapi_pydantic.v3.v3_0 import (
 )
 from jsf import JSF
 
-
-from ..http_file.var import HttpVariable
+from ..http_file.var import HttpVariable, Variable, VariableType
+from .component_cache import cached_sample
 
 
 def _encode_query_param_name(name: str) -> str:
@@ -32,10 +32,13 @@ Operation = Union[Operation3_0, Operation3_1]
 
 
 def handle_params(
-    path: str, parameters: list[Parameter]
-) -> tuple[str, list[HttpVariable]]:
+    path: str, parameters: list[Parameter], variable: VariableType = HttpVariable
+) -> tuple[str, list[Variable]]:
     """
     Handle parameters in the request path.
+
+    Variables are built with variable: the validated HttpVariable by default,
+    or the pipeline's unvalidated VariableIR.
     """
     params = []
     if parameters:
@@ -48,32 +51,34 @@ def handle_params(
             loc = param.param_in
             loc_value = getattr(loc, "value", loc)
             if loc_value == "query":
-                path, hv = handle_query_params(path, param)
+                path, hv = handle_query_params(path, param, variable)
                 if hv:
                     params.append(hv)
             elif loc_value == "header":
-                hv = handle_header_params(path, param)
+                hv = handle_header_params(path, param, variable)
                 if hv:
                     params.append(hv)
             elif loc_value == "path":
-                path, hv = handle_path_params(path, param)
+                path, hv = handle_path_params(path, param, variable)
                 if hv:
                     params.append(hv)
             elif loc_value == "cookie":
-                hv = handle_cookie_params(path, param)
+                hv = handle_cookie_params(path, param, variable)
                 if hv:
                     params.append(hv)
             else:
                 raise NotImplementedError(
                     f"Parameter location {param.param_in} is not supported"
                 )
-    path, missing_params = handle_missing_path_parasm(path)
+    path, missing_params = handle_missing_path_parasm(path, variable)
     if missing_params:
         params.extend(missing_params)
     return path, params
 
 
-def handle_path_params(path: str, param: Parameter) -> tuple[str, HttpVariable]:
+def handle_path_params(
+    path: str, param: Parameter, variable: VariableType = HttpVariable
+) -> tuple[str, Variable]:
     """
     Handle path parameters in the request path.
 
@@ -106,7 +111,7 @@ def handle_path_params(path: str, param: Parameter) -> tuple[str, HttpVariable]:
         )
     else:
         value = {}
-    return path, HttpVariable(
+    return path, variable(
         name=param.name,
         value=str(value) or "",
         description=param.description or "",
@@ -116,8 +121,13 @@ def handle_path_params(path: str, param: Parameter) -> tuple[str, HttpVariable]:
 def _generate_sample_body_from_schema(schema: dict) -> dict:
     """Generate a sample dict conforming to the given JSON schema using jsf."""
     try:
-        faker = JSF(schema=schema, allow_none_optionals=0)
-        sample = faker.generate(n=1, use_defaults=True, use_examples=True)
+        sample = cached_sample(
+            "body",
+            schema,
+            lambda: JSF(schema=schema, allow_none_optionals=0).generate(
+                n=1, use_defaults=True, use_examples=True
+            ),
+        )
         if isinstance(sample, list):
             if sample:
                 return sample[0]
@@ -133,8 +143,13 @@ def _generate_sample_body_from_schema(schema: dict) -> dict:
 def _generate_sample_param_from_schema(schema: dict) -> Union[int, str, float, bool]:
     """Generate a sample dict conforming to the given JSON schema using jsf."""
     try:
-        faker = JSF(schema=schema)
-        sample = faker.generate(n=1, use_defaults=True, use_examples=True)
+        sample = cached_sample(
+            "param",
+            schema,
+            lambda: JSF(schema=schema).generate(
+                n=1, use_defaults=True, use_examples=True
+            ),
+        )
         if isinstance(sample, list):
             if sample:
                 return sample[0]
@@ -150,7 +165,9 @@ def _generate_sample_param_from_schema(schema: dict) -> Union[int, str, float, b
         raise ValueError(f"Failed to generate sample from schema: {e}")
 
 
-def handle_query_params(path: str, param: Parameter) -> tuple[str, HttpVariable]:
+def handle_query_params(
+    path: str, param: Parameter, variable: VariableType = HttpVariable
+) -> tuple[str, Variable]:
     """
     Handle query parameters in the request path.
     """
@@ -174,14 +191,16 @@ def handle_query_params(path: str, param: Parameter) -> tuple[str, HttpVariable]
         )
     else:
         value = {}
-    return path, HttpVariable(
+    return path, variable(
         name=param.name,
         value=str(value) or "",
         description=param.description or "",
     )
 
 
-def handle_header_params(path: str, param: Parameter) -> HttpVariable | None:
+def handle_header_params(
+    path: str, param: Parameter, variable: VariableType = HttpVariable
+) -> Variable | None:
     """
     Handle header parameters by creating a variable placeholder.
     The actual header line can be added manually by the user using the variable.
@@ -200,14 +219,16 @@ def handle_header_params(path: str, param: Parameter) -> HttpVariable | None:
         )
     else:
         value = {}
-    return HttpVariable(
+    return variable(
         name=param.name,
         value=str(value) or "",
         description=param.description or "",
     )
 
 
-def handle_cookie_params(path: str, param: Parameter) -> HttpVariable | None:
+def handle_cookie_params(
+    path: str, param: Parameter, variable: VariableType = HttpVariable
+) -> Variable | None:
     """
     Handle cookie parameters by creating a variable placeholder.
     """
@@ -229,10 +250,12 @@ def handle_cookie_params(path: str, param: Parameter) -> HttpVariable | None:
         desc = param.description.strip()
     else:
         desc = ""
-    return HttpVariable(name=param.name, value=str(value) or "", description=desc)
+    return variable(name=param.name, value=str(value) or "", description=desc)
 
 
-def handle_missing_path_parasm(path: str) -> tuple[str, list[HttpVariable]]:
+def handle_missing_path_parasm(
+    path: str, variable: VariableType = HttpVariable
+) -> tuple[str, list[Variable]]:
     """
     Find path parameters that weren't declared in the OpenAPI parameters list.
 
@@ -265,7 +288,7 @@ def handle_missing_path_parasm(path: str) -> tuple[str, list[HttpVariable]]:
             raise ValueError(f"Parameter {param_name} not found in path {path}")
 
         params.append(
-            HttpVariable(
+            variable(
                 name=param_name,
                 value="",
                 description="",
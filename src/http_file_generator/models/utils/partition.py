@@ -0,0 +1,18 @@
+import heapq
+
+
+def partition_by_cost(costs: dict[str, int], count: int) -> list[list[str]]:
+    """Split keys into count parts with roughly equal total cost.
+
+    Greedy longest-processing-time: keys are taken from most to least costly
+    and each goes to the part with the lowest total so far. Ties are broken by
+    key and part number, so every caller with the same costs gets the same
+    partition. Each part keeps its keys in sorted order.
+    """
+    parts: list[list[str]] = [[] for _ in range(count)]
+    loads = [(0, index) for index in range(count)]
+    for key in sorted(costs, key=lambda k: (-costs[k], k)):
+        load, index = heapq.heappop(loads)
+        parts[index].append(key)
+        heapq.heappush(loads, (load + costs[key], index))
+    return [sorted(part) for part in parts]
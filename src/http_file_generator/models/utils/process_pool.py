@@ -0,0 +1,172 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable
+
+# How often the manager thread looks for new submissions while waiting
+_POLL_INTERVAL = 0.05
+
+
+def thread_safe_context() -> Any:
+    """A multiprocessing context that is safe to use from a threaded parent.
+
+    Plain fork does not support multi-threaded parents safely; forkserver
+    children still start quickly.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _call(conn: Connection, fn: Callable[..., Any], args: tuple[Any, ...]) -> None:
+    # The deadline starts now, after the worker has started up
+    conn.send(("started", None))
+    try:
+        outcome: tuple[str, Any] = ("ok", fn(*args))
+    except BaseException as e:
+        outcome = ("error", e)
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # Unpicklable result or exception
+        conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+    finally:
+        conn.close()
+
+
+class DeadlineProcessPool:
+    """Process pool that kills any call running longer than timeout seconds.
+
+    Unlike ProcessPoolExecutor, every call gets a process of its own, so an
+    overrunning call can be killed without affecting the others. Its future
+    then fails with TimeoutError stating the elapsed time, and the next
+    queued call starts. At most max_workers calls run at once.
+    """
+
+    def __init__(self, max_workers: int, timeout: float) -> None:
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self._ctx = thread_safe_context()
+        self._pending: deque[tuple[Future, Callable[..., Any], tuple[Any, ...]]] = (
+            deque()
+        )
+        # Start time is None until the worker reports that it has started
+        self._running: dict[Connection, tuple[Future, Any, float | None]] = {}
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> "DeadlineProcessPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown(cancel_futures=exc_info[0] is not None)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            if self._thread is None:
+                if self._ctx.get_start_method() == "forkserver":
+                    # Children fork from a server with the modules imported
+                    self._ctx.set_forkserver_preload([__name__, fn.__module__])
+                self._thread = threading.Thread(target=self._manage, daemon=True)
+                self._thread.start()
+            self._pending.append((future, fn, args))
+        return future
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._pending:
+                    self._pending.popleft()[0].cancel()
+                # Their futures fail once the manager sees the workers exit
+                for _, process, _ in self._running.values():
+                    process.kill()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def _start_pending(self) -> None:
+        while self._pending and len(self._running) < self.max_workers:
+            future, fn, args = self._pending.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            receiver, sender = self._ctx.Pipe(duplex=False)
+            process = self._ctx.Process(
+                target=_call, args=(sender, fn, args), daemon=True
+            )
+            try:
+                process.start()
+            except Exception as e:
+                receiver.close()
+                future.set_exception(e)
+                continue
+            finally:
+                sender.close()
+            self._running[receiver] = (future, process, None)
+
+    def _manage(self) -> None:
+        while True:
+            with self._lock:
+                self._start_pending()
+                if not self._running and not self._pending and self._shutdown:
+                    return
+                connections = list(self._running)
+                deadlines = [
+                    start for _, _, start in self._running.values() if start is not None
+                ]
+            wait_for = _POLL_INTERVAL
+            if deadlines:
+                remaining = min(deadlines) + self.timeout - time.monotonic()
+                wait_for = max(0.0, min(wait_for, remaining))
+            ready = wait(connections, timeout=wait_for) if connections else []
+            if not connections:
+                time.sleep(wait_for)
+            with self._lock:
+                for conn in ready:
+                    self._finish(conn)
+                now = time.monotonic()
+                for conn, (future, process, start) in list(self._running.items()):
+                    if start is not None and now - start >= self.timeout:
+                        process.kill()
+                        process.join()
+                        conn.close()
+                        del self._running[conn]
+                        if not future.cancelled():
+                            future.set_exception(
+                                TimeoutError(
+                                    f"Timed out after {now - start:.1f}s "
+                                    f"(limit {self.timeout:g}s)"
+                                )
+                            )
+
+    def _finish(self, conn: Connection) -> None:
+        """Handle a message (or the exit) of the worker behind conn."""
+        entry = self._running.get(conn)
+        if entry is None:
+            return
+        future, process, _ = entry
+        try:
+            kind, value = conn.recv()
+        except (EOFError, OSError):
+            process.join()
+            kind, value = "error", RuntimeError(
+                f"Worker exited unexpectedly (exit code {process.exitcode})"
+            )
+        if kind == "started":
+            self._running[conn] = (future, process, time.monotonic())
+            return
+        del self._running[conn]
+        conn.close()
+        process.join()
+        if future.cancelled():
+            return
+        if kind == "ok":
+            future.set_result(value)
+        else:
+            future.set_exception(value)
@@ -0,0 +1,169 @@
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+# Seconds between redraws on a terminal, and between lines elsewhere (logs)
+TTY_INTERVAL = 0.1
+LOG_INTERVAL = 10.0
+
+_active: "ProgressCounter | None" = None
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class ProgressCounter:
+    """Specs and operations completed so far, with throughput and ETA.
+
+    Operations are counted as the pipeline builds them (see
+    count_operation) while the counter is tracked, and when a spec
+    finishes elsewhere (such as in a worker process) from the count it
+    reports. The ETA extrapolates from operations if their total is known,
+    otherwise from specs. While phase is set (e.g. while loading, before the
+    totals are known), only the phase and the elapsed time are shown.
+    """
+
+    def __init__(
+        self,
+        total_specs: int | None = None,
+        total_operations: int | None = None,
+        phase: str | None = None,
+    ) -> None:
+        self.total_specs = total_specs
+        self.total_operations = total_operations
+        self.phase = phase
+        self.specs = 0
+        self.operations = 0
+        self.start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def begin(
+        self, total_specs: int | None = None, total_operations: int | None = None
+    ) -> None:
+        """End the phase and start counting towards the given totals."""
+        self.total_specs = total_specs
+        self.total_operations = total_operations
+        self.phase = None
+        self.start = time.monotonic()
+
+    def add_operations(self, count: int = 1) -> None:
+        with self._lock:
+            self.operations += count
+
+    def finish_spec(self, operations: int = 0) -> None:
+        with self._lock:
+            self.specs += 1
+            self.operations += operations
+
+    def eta(self, now: float | None = None) -> float | None:
+        """Estimated seconds until done, or None before there is any progress."""
+        elapsed = (now or time.monotonic()) - self.start
+        if self.total_operations and self.operations:
+            done, total = self.operations, self.total_operations
+        elif self.total_specs and self.specs:
+            done, total = self.specs, self.total_specs
+        else:
+            return None
+        return max(0.0, elapsed / done * (total - done))
+
+    def describe(self, now: float | None = None) -> str:
+        now = now or time.monotonic()
+        if self.phase is not None:
+            return f"{self.phase}, elapsed {_format_duration(now - self.start)}"
+        elapsed = max(now - self.start, 1e-9)
+        parts = []
+        if self.total_specs is not None:
+            parts.append(f"{self.specs}/{self.total_specs} specs")
+        operations = f"{self.operations:,}"
+        if self.total_operations is not None:
+            operations += f"/{self.total_operations:,}"
+        parts.append(f"{operations} operations")
+        parts.append(f"{self.operations / elapsed:,.0f} ops/s")
+        eta = self.eta(now)
+        parts.append(f"ETA {_format_duration(eta) if eta is not None else '?'}")
+        parts.append(f"elapsed {_format_duration(now - self.start)}")
+        return ", ".join(parts)
+
+
+@contextmanager
+def track_progress(counter: ProgressCounter | None) -> Iterator[None]:
+    """Count the operations built during the block into counter."""
+    global _active
+    previous, _active = _active, counter
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+def count_operation() -> None:
+    """Called by the pipeline for every operation it builds."""
+    if _active is not None:
+        _active.add_operations()
+
+
+class ProgressDisplay:
+    """Show a counter's progress on stream (stderr by default) until stopped.
+
+    On a terminal a single status line is redrawn in place and erased when
+    the display stops; call clear() before printing anything else to the
+    terminal. Elsewhere, such as in CI logs, a status line is appended every
+    LOG_INTERVAL seconds instead.
+    """
+
+    def __init__(
+        self, counter: ProgressCounter, stream: TextIO | None = None
+    ) -> None:
+        self.counter = counter
+        self.stream = stream or sys.stderr
+        self.tty = self.stream.isatty()
+        self.interval = TTY_INTERVAL if self.tty else LOG_INTERVAL
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._drawn = False
+
+    def __enter__(self) -> "ProgressDisplay":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.clear()
+
+    def clear(self) -> None:
+        """Erase the status line so other output starts on a clean line."""
+        with self._lock:
+            self._clear()
+
+    @contextmanager
+    def suspended(self) -> Iterator[None]:
+        """Erase the status line and keep it from being redrawn in the block."""
+        with self._lock:
+            self._clear()
+            yield
+
+    def _clear(self) -> None:
+        if self.tty and self._drawn:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+            self._drawn = False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            line = f"Progress: {self.counter.describe()}"
+            with self._lock:
+                if self.tty:
+                    self.stream.write(f"\r\x1b[K{line}")
+                    self._drawn = True
+                else:
+                    self.stream.write(f"{line}\n")
+                self.stream.flush()
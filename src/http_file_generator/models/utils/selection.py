@@ -0,0 +1,48 @@
+from fnmatch import fnmatchcase
+from typing import Union
+
+from openapi_pydantic.v3.v3_0 import Operation as Operation3_0
+from openapi_pydantic.v3.v3_1 import Operation as Operation3_1
+from pydantic import BaseModel, Field
+
+Operation = Union[Operation3_0, Operation3_1]
+
+
+class OperationSelection(BaseModel):
+    """Select a subset of operations from a spec before requests are built.
+
+    Each non-empty criterion must match (AND); within one criterion any of the
+    given values may match (OR). An empty selection matches every operation.
+    """
+
+    tags: list[str] = Field(
+        default_factory=list, description="Keep operations carrying any of these tags"
+    )
+    path_globs: list[str] = Field(
+        default_factory=list,
+        description="Keep operations whose path matches any of these glob patterns",
+    )
+    operation_ids: list[str] = Field(
+        default_factory=list, description="Keep operations with these operationIds"
+    )
+    methods: list[str] = Field(
+        default_factory=list, description="Keep operations using these HTTP methods"
+    )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.tags or self.path_globs or self.operation_ids or self.methods)
+
+    def matches(self, path: str, method: str, operation: Operation) -> bool:
+        """Return True if the operation at path/method is part of the selection."""
+        if self.methods and method.upper() not in {m.upper() for m in self.methods}:
+            return False
+        if self.path_globs and not any(
+            fnmatchcase(path, pattern) for pattern in self.path_globs
+        ):
+            return False
+        if self.operation_ids and operation.operationId not in self.operation_ids:
+            return False
+        if self.tags and not set(operation.tags or []) & set(self.tags):
+            return False
+        return True
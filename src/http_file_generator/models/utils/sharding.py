@@ -0,0 +1,61 @@
+import re
+from typing import Iterable, Iterator, Union
+
+from openapi_pydantic.v3.v3_0 import Operation as Operation3_0
+from openapi_pydantic.v3.v3_1 import Operation as Operation3_1
+
+from ..settings.settings import ShardBy
+
+Operation = Union[Operation3_0, Operation3_1]
+
+INDEX_FILENAME = "index.json"
+UNTAGGED = "untagged"
+
+
+def shard_key(
+    path: str, operation: Operation, shard_by: ShardBy, prefix_depth: int = 1
+) -> str:
+    """Name of the group an operation belongs to before size limits apply."""
+    if shard_by == ShardBy.TAG:
+        return operation.tags[0] if operation.tags else UNTAGGED
+    if shard_by == ShardBy.PREFIX:
+        segments = [seg for seg in path.split("/") if seg][:prefix_depth]
+        return "/".join(segments) or "root"
+    return "requests"
+
+
+def shard_filename(key: str, taken: set[str]) -> str:
+    """A file-system safe, unique .http filename for a shard key."""
+    stem = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("_.") or "shard"
+    name = f"{stem}.http"
+    counter = 1
+    while name in taken:
+        counter += 1
+        name = f"{stem}-{counter}.http"
+    taken.add(name)
+    return name
+
+
+def split_blocks(
+    blocks: Iterable[str],
+    max_requests: int | None = None,
+    max_bytes: int | None = None,
+) -> Iterator[list[str]]:
+    """Split rendered blocks into consecutive parts within the given limits.
+
+    A single block larger than max_bytes still gets a part of its own.
+    """
+    part: list[str] = []
+    size = 0
+    for block in blocks:
+        block_size = len(block.encode())
+        full = (max_requests is not None and len(part) >= max_requests) or (
+            max_bytes is not None and part and size + block_size > max_bytes
+        )
+        if full:
+            yield part
+            part, size = [], 0
+        part.append(block)
+        size += block_size
+    if part:
+        yield part
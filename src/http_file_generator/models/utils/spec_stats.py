@@ -0,0 +1,282 @@
+from collections import Counter
+from typing import Any, Iterator
+
+from ..enums import METHOD
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# Keywords whose value is a single subschema (or a list of them for "items")
+_SUBSCHEMA_KEYS = (
+    "items",
+    "additionalProperties",
+    "additionalItems",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+    "contains",
+    "propertyNames",
+    "not",
+    "if",
+    "then",
+    "else",
+)
+# Keywords whose value maps names to subschemas
+_SUBSCHEMA_MAP_KEYS = ("properties", "patternProperties", "$defs", "definitions")
+# Keywords whose value is a list of subschemas
+_SUBSCHEMA_LIST_KEYS = ("allOf", "anyOf", "oneOf", "prefixItems")
+
+
+def _resolve_pointer(spec: dict, ref: str) -> Any | None:
+    """Resolve a local JSON pointer like '#/components/schemas/User'."""
+    if not ref.startswith("#/"):
+        return None
+    node: Any = spec
+    for part in ref[2:].split("/"):
+        part = part.replace("~1", "/").replace("~0", "~")
+        if not isinstance(node, dict) or part not in node:
+            return None
+        node = node[part]
+    return node
+
+
+def _deref(spec: dict, obj: Any) -> Any:
+    """Follow $ref chains of non-schema objects (parameters, bodies, responses)."""
+    seen: set[str] = set()
+    while isinstance(obj, dict) and isinstance(obj.get("$ref"), str):
+        ref = obj["$ref"]
+        if ref in seen:
+            return None
+        seen.add(ref)
+        obj = _resolve_pointer(spec, ref)
+    return obj
+
+
+def _schema_children(schema: dict) -> Iterator[Any]:
+    for key in _SUBSCHEMA_KEYS:
+        child = schema.get(key)
+        if isinstance(child, dict):
+            yield child
+        elif key == "items" and isinstance(child, list):
+            yield from child
+    for key in _SUBSCHEMA_MAP_KEYS:
+        children = schema.get(key)
+        if isinstance(children, dict):
+            yield from children.values()
+    for key in _SUBSCHEMA_LIST_KEYS:
+        children = schema.get(key)
+        if isinstance(children, list):
+            yield from children
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    """Yield every $ref value found anywhere below node."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for value in node.values():
+            yield from _iter_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_refs(value)
+
+
+def _iter_enums(node: Any, pointer: str = "#") -> Iterator[tuple[str, int]]:
+    """Yield (JSON pointer, size) for every enum list below node."""
+    if isinstance(node, dict):
+        enum = node.get("enum")
+        if isinstance(enum, list):
+            yield pointer, len(enum)
+        for key, value in node.items():
+            escaped = str(key).replace("~", "~0").replace("/", "~1")
+            yield from _iter_enums(value, f"{pointer}/{escaped}")
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from _iter_enums(value, f"{pointer}/{index}")
+
+
+class _SchemaAnalyzer:
+    """Measure schemas with $refs expanded, without generating any samples.
+
+    The size of a schema is the number of schema nodes a sampler has to visit;
+    references are expanded (and memoized), recursive references count as a
+    single node and mark every component on the cycle as recursive.
+    """
+
+    def __init__(self, spec: dict) -> None:
+        self.spec = spec
+        self.recursive: set[str] = set()
+        self._memo: dict[str, tuple[int, int]] = {}
+        self._stack: list[str] = []
+
+    def measure(self, schema: Any) -> tuple[int, int]:
+        """Return (node count, depth) of a schema."""
+        if not isinstance(schema, dict):
+            return 0, 0
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            return self._measure_ref(ref)
+        nodes, depth = 1, 0
+        for child in _schema_children(schema):
+            child_nodes, child_depth = self.measure(child)
+            nodes += child_nodes
+            depth = max(depth, child_depth)
+        return nodes, depth + 1
+
+    def _measure_ref(self, ref: str) -> tuple[int, int]:
+        if ref in self._stack:
+            self.recursive.update(self._stack[self._stack.index(ref) :])
+            return 1, 1
+        if ref in self._memo:
+            return self._memo[ref]
+        target = _resolve_pointer(self.spec, ref)
+        if not isinstance(target, dict):
+            # External or unresolvable reference; count it as an opaque node
+            return 1, 1
+        self._stack.append(ref)
+        result = self.measure(target)
+        self._stack.pop()
+        self._memo[ref] = result
+        return result
+
+
+def _has_example(media_or_param: dict) -> bool:
+    return "example" in media_or_param or bool(media_or_param.get("examples"))
+
+
+def _operation_cost(
+    spec: dict, analyzer: _SchemaAnalyzer, path_item: dict, operation: dict
+) -> dict[str, int]:
+    """Estimate how much schema sampling generating one operation requires.
+
+    Mirrors what request building samples: parameters and bodies without
+    examples, where request bodies are sampled twice (body and examples).
+    """
+    cost = 0
+    depth = 0
+    sampled = 0
+
+    def add(schema: Any, times: int = 1) -> None:
+        nonlocal cost, depth, sampled
+        nodes, schema_depth = analyzer.measure(schema)
+        cost += nodes * times
+        depth = max(depth, schema_depth)
+        sampled += times
+
+    for param in [*path_item.get("parameters", []), *operation.get("parameters", [])]:
+        param = _deref(spec, param)
+        if isinstance(param, dict) and not _has_example(param) and "schema" in param:
+            add(param["schema"])
+
+    body = _deref(spec, operation.get("requestBody"))
+    if isinstance(body, dict):
+        for media in (body.get("content") or {}).values():
+            if isinstance(media, dict) and not _has_example(media) and "schema" in media:
+                add(media["schema"], times=2)
+
+    for response in (operation.get("responses") or {}).values():
+        response = _deref(spec, response)
+        if not isinstance(response, dict):
+            continue
+        for media in (response.get("content") or {}).values():
+            if isinstance(media, dict) and not _has_example(media) and "schema" in media:
+                add(media["schema"])
+
+    refs = len(set(_iter_refs(operation)))
+    return {"cost": cost, "depth": depth, "sampled_schemas": sampled, "refs": refs}
+
+
+def iter_spec_operations(spec: dict) -> Iterator[tuple[str, str, dict, dict]]:
+    """Yield (path, METHOD, path item, operation) from an unresolved spec."""
+    for path, path_item in (spec.get("paths") or {}).items():
+        path_item = _deref(spec, path_item)
+        if not isinstance(path_item, dict):
+            continue
+        for key, operation in path_item.items():
+            method = key.upper()
+            if method in METHOD and isinstance(operation, dict):
+                yield path, method, path_item, operation
+
+
+def compute_spec_stats(spec: dict, top: int = 10) -> dict[str, Any]:
+    """Compute size and cost statistics for a parsed, unresolved OpenAPI spec.
+
+    Nothing is sampled; costs are estimates in schema nodes to be generated.
+    """
+    analyzer = _SchemaAnalyzer(spec)
+
+    schemas = (spec.get("components") or {}).get("schemas") or {}
+    max_depth = 0
+    fan_out: dict[str, int] = {}
+    for name, schema in schemas.items():
+        _, depth = analyzer.measure({"$ref": SCHEMA_REF_PREFIX + name})
+        max_depth = max(max_depth, depth)
+        fan_out[name] = len(set(_iter_refs(schema)))
+
+    by_method: Counter[str] = Counter()
+    by_tag: Counter[str] = Counter()
+    operations = []
+    for path, method, path_item, operation in iter_spec_operations(spec):
+        by_method[method] += 1
+        for tag in operation.get("tags") or ["(untagged)"]:
+            by_tag[tag] += 1
+        estimate = _operation_cost(spec, analyzer, path_item, operation)
+        max_depth = max(max_depth, estimate["depth"])
+        operations.append(
+            {
+                "method": method,
+                "path": path,
+                "operation_id": operation.get("operationId"),
+                **estimate,
+            }
+        )
+
+    ref_counts = Counter(_iter_refs(spec))
+    enums = sorted(_iter_enums(spec), key=lambda e: e[1], reverse=True)
+    total_cost = sum(op["cost"] for op in operations)
+    most_expensive = sorted(operations, key=lambda op: op["cost"], reverse=True)
+
+    return {
+        "paths": len(spec.get("paths") or {}),
+        "operations": {
+            "total": len(operations),
+            "by_method": dict(sorted(by_method.items())),
+            "by_tag": dict(sorted(by_tag.items())),
+        },
+        "schemas": {
+            "components": len(schemas),
+            "max_depth": max_depth,
+            "recursive": sorted(
+                ref.removeprefix(SCHEMA_REF_PREFIX) for ref in analyzer.recursive
+            ),
+        },
+        "refs": {
+            "total": sum(ref_counts.values()),
+            "distinct": len(ref_counts),
+            "most_referenced": [
+                {"ref": ref, "count": count}
+                for ref, count in ref_counts.most_common(top)
+            ],
+            "max_fan_out": max(fan_out.values(), default=0),
+            "top_fan_out": [
+                {"schema": name, "refs": count}
+                for name, count in sorted(
+                    fan_out.items(), key=lambda item: item[1], reverse=True
+                )[:top]
+                if count
+            ],
+        },
+        "enums": {
+            "count": len(enums),
+            "max_size": enums[0][1] if enums else 0,
+            "total_values": sum(size for _, size in enums),
+            "largest": [
+                {"location": location, "size": size} for location, size in enums[:top]
+            ],
+        },
+        "sampling": {
+            "total_cost": total_cost,
+            "mean_cost": round(total_cost / len(operations), 2) if operations else 0,
+            "operations": operations,
+            "top_operations": most_expensive[:top],
+        },
+    }
@@ -0,0 +1,77 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Pipeline stages, in the order a spec passes through them
+STAGES = ("load", "resolve", "model_build", "sample", "render", "write", "env")
+
+_active: "StageTimings | None" = None
+
+
+class StageTimings:
+    """Wall time spent in each pipeline stage.
+
+    Stages nest: samples are generated while requests are built, which
+    happens while rendering, which may happen while writing a streamed file.
+    Time is charged to the innermost stage only, so the durations never
+    overlap and add up to the time spent in any stage. Only the creating
+    thread is timed; time it spends waiting on other threads is charged to
+    its current stage.
+    """
+
+    def __init__(self) -> None:
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.thread = threading.get_ident()
+        self._stack: list[str] = []
+        self._since = 0.0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._switch(time.perf_counter())
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._switch(time.perf_counter())
+            self._stack.pop()
+
+    def _switch(self, now: float) -> None:
+        if self._stack:
+            self.seconds[self._stack[-1]] += now - self._since
+        self._since = now
+
+
+@contextmanager
+def record_stage_timings(timings: StageTimings | None) -> Iterator[None]:
+    """Record stage durations into timings for the duration of the block."""
+    global _active
+    previous, _active = _active, timings
+    try:
+        yield
+    finally:
+        _active = previous
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Charge the block to stage, if stage timings are being recorded."""
+    if _active is None or _active.thread != threading.get_ident():
+        yield
+        return
+    with _active.stage(stage):
+        yield
+
+
+def timed_iter(stage: str, iterable: Iterable[T]) -> Iterator[T]:
+    """Iterate iterable, charging the time spent producing items to stage."""
+    iterator = iter(iterable)
+    while True:
+        with timed(stage):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
@@ -0,0 +1,229 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+# How often the polling backend checks files, and the stop event is checked
+POLL_INTERVAL = 0.25
+
+# inotify event masks (see inotify(7))
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+# Editors save in place or write a new file and rename it over the old one
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+)
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Changes to files in watched directories, via Linux inotify."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._rm_watch = libc.inotify_rm_watch
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._watches: dict[int, Path] = {}
+
+    def watch(self, directories: set[Path]) -> None:
+        for wd, directory in list(self._watches.items()):
+            if directory not in directories:
+                self._rm_watch(self.fd, wd)
+                del self._watches[wd]
+        for directory in directories - set(self._watches.values()):
+            wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = directory
+
+    def read(self, timeout: float) -> set[Path] | None:
+        """Paths changed within timeout, or None if events were lost."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                return None
+            directory = self._watches.get(wd)
+            if directory is not None and name:
+                changed.add(directory / os.fsdecode(name))
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Wait for changes to a set of files and to files in directories.
+
+    In directories, only files whose names match one of patterns are
+    watched, so writing outputs next to the inputs does not count as a
+    change. Uses inotify on Linux and falls back to polling modification
+    times elsewhere (or with polling=True). Either way, wait() reports the
+    changed paths once saves have settled (see wait).
+    """
+
+    def __init__(
+        self,
+        files: Iterable[Path] = (),
+        directories: Iterable[Path] = (),
+        patterns: Iterable[str] = ("*",),
+        polling: bool = False,
+        poll_interval: float = POLL_INTERVAL,
+    ) -> None:
+        self.poll_interval = poll_interval
+        self.patterns = list(patterns)
+        self.files: set[Path] = set()
+        self.directories: set[Path] = set()
+        self._inotify: _Inotify | None = None
+        if not polling and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        self._snapshot: dict[Path, tuple[int, int]] = {}
+        self.set_paths(files, directories)
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def set_paths(
+        self, files: Iterable[Path], directories: Iterable[Path] = ()
+    ) -> None:
+        """Replace the watched files and directories."""
+        previous = self._snapshot
+        was_watched = set(self._scan())
+        self.files = {path.resolve() for path in files}
+        self.directories = {path.resolve() for path in directories}
+        if self._inotify is not None:
+            # Watch the directories holding the files to see them replaced
+            self._inotify.watch(
+                {path.parent for path in self.files} | self.directories
+            )
+        # Keep known states, so changes made meanwhile are still reported,
+        # including files created in a directory that was already watched
+        self._snapshot = {
+            path: previous.get(path, state)
+            for path, state in self._scan().items()
+            if path in previous or path not in was_watched
+        }
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def wait(
+        self, debounce: float = 0.1, stop: threading.Event | None = None
+    ) -> set[Path]:
+        """Block until a watched path changes, and return the changed paths.
+
+        Changes are collected until none has been seen for debounce seconds,
+        so a burst of saves is reported once. Returns an empty set once stop
+        is set.
+        """
+        changed: set[Path] = set()
+        while not changed:
+            if stop is not None and stop.is_set():
+                return set()
+            changed = self._changes(self.poll_interval)
+        while True:
+            more = self._changes(debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def _relevant(self, path: Path) -> bool:
+        if path in self.files:
+            return True
+        return path.parent in self.directories and any(
+            fnmatch.fnmatch(path.name, pattern) for pattern in self.patterns
+        )
+
+    def _changes(self, timeout: float) -> set[Path]:
+        if self._inotify is None:
+            return self._poll(timeout)
+        deadline = time.monotonic() + timeout
+        while True:
+            events = self._inotify.read(max(0.0, deadline - time.monotonic()))
+            if events is None:
+                # Events were lost; compare with the last scan instead
+                return self._poll(0)
+            changed = {path for path in events if self._relevant(path)}
+            if changed or time.monotonic() >= deadline:
+                self._snapshot = self._scan()
+                return changed
+
+    def _poll(self, timeout: float) -> set[Path]:
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {
+                path
+                for path in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(path) != self._snapshot.get(path)
+            }
+            self._snapshot = snapshot
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.poll_interval, remaining))
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        """(mtime, size) of the watched files and the directories' files."""
+        paths = set(self.files)
+        for directory in self.directories:
+            try:
+                paths.update(
+                    path
+                    for path in directory.iterdir()
+                    if self._relevant(path) and path.is_file()
+                )
+            except OSError:
+                pass
+        snapshot = {}
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
@@ -0,0 +1,224 @@
+import errno
+import hashlib
+import os
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator
+
+from pydantic import BaseModel, Field
+
+from .timing import timed
+
+DEFAULT_MAX_WORKERS = 8
+# Large write buffer so streamed output reaches the disk in big blocks
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _create_temp(path: Path) -> tuple[int, Path]:
+    """Exclusively create a temporary file next to path, opened for writing.
+
+    Unlike mkstemp, which uses mode 0600, the file is created with mode 0666
+    so the kernel applies the umask as for any new file.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0)
+    for _ in range(100):
+        tmp = path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+        try:
+            return os.open(tmp, flags | getattr(os, "O_BINARY", 0), 0o666), tmp
+        except FileExistsError:
+            continue
+    raise FileExistsError(
+        errno.EEXIST, "No usable temporary file name", str(path.parent)
+    )
+
+
+@contextmanager
+def atomic_open(
+    path: Path, mode: str = "w", fsync: bool = False
+) -> Iterator[IO[Any]]:
+    """Open a temporary file next to path and move it over path on success.
+
+    Readers see either the previous file or the complete new one, never a
+    partially written file. On error the temporary file is removed and path
+    is left untouched. With fsync the data (and the rename) are flushed to
+    disk before returning.
+    """
+    with timed("write"):
+        fd, tmp = _create_temp(path)
+        try:
+            encoding = None if "b" in mode else "utf-8"
+            with os.fdopen(
+                fd, mode, buffering=WRITE_BUFFER_SIZE, encoding=encoding
+            ) as f:
+                yield f
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            # Keep the mode of the file being replaced; new files already
+            # have the default mode
+            try:
+                os.chmod(tmp, path.stat().st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        if fsync:
+            _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, content: str, fsync: bool = False) -> None:
+    with atomic_open(path, "w", fsync=fsync) as f:
+        f.write(content)
+
+
+def atomic_write_bytes(path: Path, data: bytes, fsync: bool = False) -> None:
+    with atomic_open(path, "wb", fsync=fsync) as f:
+        f.write(data)
+
+
+class WriteStats(BaseModel):
+    written: int = Field(0, description="Files created or whose content changed")
+    unchanged: int = Field(0, description="Files left untouched, content identical")
+    removed: int = Field(0, description="Orphaned files deleted")
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    """content_digest of the file at path, or None if it cannot be read."""
+    try:
+        return content_digest(path.read_bytes())
+    except OSError:
+        return None
+
+
+class FileWriter:
+    """Write text files under a root directory as they are produced.
+
+    Each add() hands its file to a thread pool right away. The pool writes
+    it atomically (see atomic_open), skipping files whose existing content
+    hashes the same so their mtimes stay untouched. At most max_pending files
+    wait to be written; add() blocks while the pool catches up, so memory
+    stays bounded by a few files however large the output. commit() waits
+    for the writes and, optionally, deletes files matching prune_globs that
+    were not written, along with emptied directories. Only the paths of
+    written files are remembered, for pruning.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_workers: int | None = DEFAULT_MAX_WORKERS,
+        fsync: bool = False,
+        max_pending: int | None = None,
+    ) -> None:
+        self.root = root
+        self.max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self.fsync = fsync
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * self.max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+        self._pending: list[Future[bool]] = []
+        self._paths: set[Path] = set()
+        self._parents: set[Path] = set()
+
+    def __enter__(self) -> "FileWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add(self, relative: Path | str, content: str) -> None:
+        path = self.root / relative
+        data = content.encode()
+        with timed("write"):
+            if path.parent not in self._parents:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                self._parents.add(path.parent)
+            self._slots.acquire()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            future = self._pool.submit(self._write_if_changed, path, data)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending.append(future)
+        self._paths.add(path)
+
+    def commit(self, prune_globs: Iterable[str] = ()) -> WriteStats:
+        with timed("write"):
+            return self._commit(prune_globs)
+
+    def close(self) -> None:
+        """Wait for queued writes and stop the pool's threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _commit(self, prune_globs: Iterable[str]) -> WriteStats:
+        stats = WriteStats()
+        pending, self._pending = self._pending, []
+        try:
+            for future in pending:
+                if future.result():
+                    stats.written += 1
+                else:
+                    stats.unchanged += 1
+        finally:
+            self.close()
+
+        for pattern in prune_globs:
+            stats.removed += self._prune(pattern)
+        self._paths.clear()
+        return stats
+
+    def _write_if_changed(self, path: Path, data: bytes) -> bool:
+        try:
+            if path.stat().st_size == len(data) and content_digest(
+                path.read_bytes()
+            ) == content_digest(data):
+                return False
+        except OSError:
+            pass
+        atomic_write_bytes(path, data, fsync=self.fsync)
+        return True
+
+    def _prune(self, pattern: str) -> int:
+        """Delete files matching pattern that this batch did not write."""
+        removed = 0
+        for path in list(self.root.glob(pattern)):
+            if path in self._paths or not path.is_file():
+                continue
+            path.unlink()
+            removed += 1
+            self._remove_empty_parents(path.parent)
+        return removed
+
+    def _remove_empty_parents(self, directory: Path) -> None:
+        while directory != self.root and self.root in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
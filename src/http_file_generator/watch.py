@@ -0,0 +1,381 @@
+import copy
+import fnmatch
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from urllib.parse import unquote
+
+from pydantic import BaseModel, Field
+
+from .http_file_generator import (
+    PRIVATE_ENV_FILENAME,
+    PUBLIC_ENV_FILENAME,
+    HtttpFileGenerator,
+    iter_refs,
+    local_dependencies,
+    local_ref_target,
+    read_spec,
+    resolve_spec,
+)
+from .models import Filemode, HttpSettings
+from .models.manifest import IncrementalStats
+from .models.manifest.batch_manifest import BATCH_MANIFEST_FILENAME
+from .models.utils.component_cache import ComponentCache, use_component_cache
+from .models.utils.watcher import FileWatcher
+from .models.utils.writer import file_digest
+
+
+class Regeneration(BaseModel):
+    """Outcome of regenerating the outputs of one watched spec."""
+
+    spec: Path = Field(..., description="The spec that was regenerated")
+    output: Path = Field(..., description="The .http file or output directory")
+    seconds: float = Field(..., description="Wall-clock time taken")
+    stats: IncrementalStats | None = Field(
+        None, description="Operations added, changed, removed and reused"
+    )
+    error: str | None = Field(None, description="Why regeneration failed, if it did")
+
+
+def _is_spec(path: Path) -> bool:
+    """Whether path holds an OpenAPI or Swagger document, or fails to parse."""
+    try:
+        data = read_spec(path)
+    except (OSError, ValueError):
+        # Reported when the spec is generated
+        return True
+    return isinstance(data, dict) and ("openapi" in data or "swagger" in data)
+
+
+def _pointer(document: Any, ref: str) -> Any:
+    """The value a local $ref such as #/components/schemas/X points to, if any."""
+    value = document
+    for token in ref.lstrip("#").split("/")[1:]:
+        token = unquote(token).replace("~1", "/").replace("~0", "~")
+        if isinstance(value, dict):
+            value = value.get(token)
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            return None
+    return value
+
+
+def _paths_reaching(
+    raw: dict, base_dir: Path, files: set[Path]
+) -> set[str] | None:
+    """Keys of the path items in raw whose $refs reach one of files.
+
+    References are followed through the spec's own components and through
+    other local files. None means that something other than path items and
+    the components they use does, so the whole spec has to be reloaded.
+    """
+    reaches_file: dict[Path, bool] = {}
+
+    def external(ref: str) -> bool:
+        path = local_ref_target(ref, base_dir)
+        if path is None:
+            return False
+        if path not in reaches_file:
+            reaches_file[path] = path in files or bool(
+                local_dependencies(path) & files
+            )
+        return reaches_file[path]
+
+    # Local pointers whose value reaches one of files, directly or through
+    # other pointers
+    edges: dict[str, set[str]] = {}
+    tainted: set[str] = set()
+    pending = [ref for ref in iter_refs(raw) if ref.startswith("#")]
+    while pending:
+        pointer = pending.pop()
+        if pointer in edges:
+            continue
+        refs = set(iter_refs(_pointer(raw, pointer)))
+        edges[pointer] = {ref for ref in refs if ref.startswith("#")}
+        pending.extend(edges[pointer])
+        if any(external(ref) for ref in refs if not ref.startswith("#")):
+            tainted.add(pointer)
+    referrers: dict[str, set[str]] = {}
+    for pointer, targets in edges.items():
+        for target in targets:
+            referrers.setdefault(target, set()).add(pointer)
+    pending = list(tainted)
+    while pending:
+        for pointer in referrers.get(pending.pop(), ()):
+            if pointer not in tainted:
+                tainted.add(pointer)
+                pending.append(pointer)
+
+    def reaches(value: Any) -> bool:
+        return any(
+            ref in tainted if ref.startswith("#") else external(ref)
+            for ref in iter_refs(value)
+        )
+
+    components = raw.get("components") or {}
+    others = {key: raw[key] for key in raw if key not in ("paths", "components")}
+    if reaches(others) or reaches(components.get("securitySchemes")):
+        return None
+    paths = raw.get("paths") or {}
+    return {key for key, item in paths.items() if reaches(item)}
+
+
+def _changed_paths(
+    previous: dict, raw: dict, base_dir: Path, files: set[Path]
+) -> set[str] | None:
+    """Keys of the path items to resolve again after the spec went from
+    previous to raw and the local files in files changed.
+
+    None means that more than path items changed, so the whole spec has to
+    be reloaded.
+    """
+    paths, previous_paths = raw.get("paths") or {}, previous.get("paths") or {}
+    if (
+        {key: value for key, value in raw.items() if key != "paths"}
+        != {key: value for key, value in previous.items() if key != "paths"}
+        or not isinstance(paths, dict)
+        or not isinstance(previous_paths, dict)
+    ):
+        return None
+    changed = {
+        key
+        for key in paths.keys() | previous_paths.keys()
+        if paths.get(key) != previous_paths.get(key)
+    }
+    if files:
+        reached = _paths_reaching(raw, base_dir, files)
+        if reached is None:
+            return None
+        changed |= reached
+    return changed
+
+
+@dataclass(slots=True)
+class _LoadedSpec:
+    """A spec as last loaded, kept so that edits only re-resolve what they touch."""
+
+    digest: str | None
+    raw: dict
+    resolved: dict
+    dependencies: dict[Path, str | None]
+    generator: HtttpFileGenerator
+
+
+def find_specs(directory: Path, patterns: Iterable[str]) -> list[Path]:
+    """Specs among the files in directory matching patterns.
+
+    Hidden files (such as incremental manifests), env files and documents
+    that are not OpenAPI specs themselves, such as shared components, are
+    left out.
+    """
+    patterns = list(patterns)
+    return sorted(
+        path.resolve()
+        for path in directory.iterdir()
+        if path.is_file()
+        and not path.name.startswith(".")
+        and path.name
+        not in (PUBLIC_ENV_FILENAME, PRIVATE_ENV_FILENAME, BATCH_MANIFEST_FILENAME)
+        and any(fnmatch.fnmatch(path.name, pattern) for pattern in patterns)
+        and _is_spec(path)
+    )
+
+
+class WatchSession:
+    """Generated outputs of a set of specs, kept up to date as files change.
+
+    The session stays warm between regenerations: every spec is kept parsed
+    and resolved, and an edit only re-resolves and re-validates the path
+    items it touches (all of the spec when more than path items change).
+    External documents and component samples live in one component cache,
+    and outputs are written incrementally, so only the affected operations
+    and files are rebuilt. Env files are written once, when missing, and never
+    overwritten. SHARDED mode is not supported, as it cannot be written
+    incrementally.
+    """
+
+    def __init__(
+        self,
+        settings: HttpSettings,
+        out: Path | None = None,
+        env: bool = True,
+        env_name: str = "dev",
+    ) -> None:
+        if settings.filemode == Filemode.SHARDED:
+            raise ValueError("Watching is not supported in SHARDED mode")
+        self.settings = settings
+        self.out = out
+        self.env = env
+        self.env_name = env_name
+        self.cache = ComponentCache()
+        # spec -> the local files it $refs
+        self.dependencies: dict[Path, set[Path]] = {}
+        self._loaded: dict[Path, _LoadedSpec] = {}
+
+    @property
+    def specs(self) -> list[Path]:
+        return sorted(self.dependencies)
+
+    def watched_files(self) -> set[Path]:
+        """The specs and every local file they depend on."""
+        files = set(self.dependencies)
+        for dependencies in self.dependencies.values():
+            files |= dependencies
+        return files
+
+    def set_specs(self, specs: Iterable[Path]) -> list[Path]:
+        """Watch exactly specs, and return those not watched before."""
+        wanted = {spec.resolve() for spec in specs}
+        for spec in set(self.dependencies) - wanted:
+            del self.dependencies[spec]
+            self._loaded.pop(spec, None)
+        added = sorted(wanted - set(self.dependencies))
+        for spec in added:
+            self.dependencies[spec] = local_dependencies(spec)
+        return added
+
+    def affected(self, changed: Iterable[Path]) -> list[Path]:
+        """Watched specs whose own file or dependencies are among changed."""
+        changed = {path.resolve() for path in changed}
+        return [
+            spec
+            for spec in self.specs
+            if spec in changed or self.dependencies[spec] & changed
+        ]
+
+    def output_path(self, spec: Path) -> Path:
+        if self.out is not None:
+            return self.out
+        if self.settings.filemode == Filemode.SINGLE:
+            return spec.with_suffix(".http")
+        return spec.parent / spec.stem
+
+    def regenerate(self, spec: Path) -> Regeneration:
+        """Bring the outputs of spec up to date; errors are returned, not raised."""
+        spec = spec.resolve()
+        out = self.output_path(spec)
+        start = time.perf_counter()
+        try:
+            with use_component_cache(self.cache):
+                gen = self._load(spec)
+                if self.settings.filemode == Filemode.SINGLE:
+                    out.parent.mkdir(parents=True, exist_ok=True)
+                else:
+                    out.mkdir(parents=True, exist_ok=True)
+                gen.to_http_file(out, incremental=True)
+                if self.env:
+                    self._write_env_files(gen, out)
+        except Exception as e:
+            return Regeneration(
+                spec=spec,
+                output=out,
+                seconds=time.perf_counter() - start,
+                error=str(e),
+            )
+        return Regeneration(
+            spec=spec,
+            output=out,
+            seconds=time.perf_counter() - start,
+            stats=gen.incremental_stats,
+        )
+
+    def _load(self, spec: Path) -> HtttpFileGenerator:
+        """A generator for the current content of spec and the files it $refs.
+
+        Only the path items that changed since the last successful load, or
+        that reach a changed file, are resolved and validated again; the
+        rest of the resolved spec is reused.
+        """
+        loaded = self._loaded.get(spec)
+        digest = file_digest(spec)
+        if loaded is not None and digest is not None and digest == loaded.digest:
+            raw: Any = loaded.raw
+        else:
+            try:
+                raw = read_spec(spec)
+            except Exception:
+                # Still watch the files a broken spec references
+                self.dependencies[spec] = local_dependencies(spec)
+                raise
+        dependencies = local_dependencies(spec, raw)
+        self.dependencies[spec] = dependencies
+        dependency_digests = {path: file_digest(path) for path in dependencies}
+        keys = None
+        if loaded is not None and isinstance(raw, dict):
+            changed_files = {
+                path
+                for path in dependency_digests.keys() | loaded.dependencies.keys()
+                if dependency_digests.get(path) != loaded.dependencies.get(path)
+            }
+            keys = _changed_paths(loaded.raw, raw, spec.parent, changed_files)
+        if loaded is not None and keys is not None and not keys:
+            resolved, gen = loaded.resolved, loaded.generator
+        elif loaded is not None and keys is not None:
+            resolved = self._resolve_paths(spec, raw, loaded.resolved, keys)
+            gen = HtttpFileGenerator.from_resolved(resolved, self.settings)
+        else:
+            resolved = resolve_spec(copy.copy(raw), base_url=spec.as_uri())
+            gen = HtttpFileGenerator.from_resolved(resolved, self.settings)
+        self._loaded[spec] = _LoadedSpec(
+            digest, raw, resolved, dependency_digests, gen
+        )
+        return gen
+
+    @staticmethod
+    def _resolve_paths(
+        spec: Path, raw: dict, previous: dict, keys: set[str]
+    ) -> dict:
+        """previous with the path items in keys resolved again from raw."""
+        paths = raw.get("paths") or {}
+        partial = {
+            **raw,
+            # Keep the version the whole spec was validated as
+            "openapi": previous.get("openapi", raw.get("openapi")),
+            "paths": {key: paths[key] for key in paths if key in keys},
+        }
+        resolved = resolve_spec(partial, base_url=spec.as_uri())
+        fresh, kept = resolved.get("paths") or {}, previous.get("paths") or {}
+        resolved["paths"] = {
+            key: fresh[key] if key in keys else kept[key] for key in paths
+        }
+        return resolved
+
+    def _write_env_files(self, gen: HtttpFileGenerator, out: Path) -> None:
+        env_dir = out.parent if self.settings.filemode == Filemode.SINGLE else out
+        public_env = env_dir / PUBLIC_ENV_FILENAME
+        private_env = env_dir / PRIVATE_ENV_FILENAME
+        if not public_env.exists() and not private_env.exists():
+            gen.to_env_files(public_env, private_env, env_name=self.env_name)
+
+    def run(
+        self,
+        watcher: FileWatcher,
+        on_result: Callable[[Regeneration], None],
+        debounce: float = 0.1,
+        stop: threading.Event | None = None,
+        discover: Callable[[], Iterable[Path]] | None = None,
+    ) -> None:
+        """Regenerate the affected specs after every change, until stop is set.
+
+        discover, when given, lists the specs to watch; it is called again
+        whenever a file that is not yet watched appears or a watched one
+        disappears, so specs can be added and removed while watching.
+        """
+        watcher.set_paths(self.watched_files(), watcher.directories)
+        while stop is None or not stop.is_set():
+            changed = watcher.wait(debounce, stop)
+            if not changed:
+                continue
+            if discover is not None:
+                watched = self.watched_files()
+                if any(
+                    path not in watched or not path.exists() for path in changed
+                ):
+                    self.set_specs(discover())
+            for spec in self.affected(changed):
+                if spec.exists():
+                    on_result(self.regenerate(spec))
+            watcher.set_paths(self.watched_files(), watcher.directories)
@@ -1,4 +1,6 @@
+from typing import Callable
 from typer.main import Typer
+from typer.testing import CliRunner, Result
 import sys
 from pathlib import Path
 import textwrap
@@ -86,3 +88,35 @@ def cli_app() -> Typer:
     from cli import app  # type: ignore
 
     return app
+
+
+@pytest.fixture()
+def write_spec() -> Callable[..., Path]:
+    """Factory writing a minimal OpenAPI 3.0 spec with a GET for each route."""
+
+    def write(path: Path, *routes: str) -> Path:
+        paths = "".join(
+            f"\n  /{route}:\n    get:\n      responses:\n"
+            "        '200':\n          description: ok"
+            for route in routes
+        )
+        path.write_text(
+            f"openapi: 3.0.3\ninfo:\n  title: {path.stem}\n  version: '1.0'\n"
+            f"servers:\n  - url: https://api.example.com\npaths:{paths}\n"
+        )
+        return path
+
+    return write
+
+
+@pytest.fixture()
+def run_batch(cli_app) -> Callable[..., Result]:
+    """Runner for `batch` over the *.yaml specs in a directory, with one job."""
+
+    def run(root: Path, *extra: str) -> Result:
+        return CliRunner().invoke(
+            cli_app,
+            ["batch", str(root), "--pattern", "*.yaml", "--jobs", "1", *extra],
+        )
+
+    return run
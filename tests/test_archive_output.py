@@ -0,0 +1,130 @@
+"""Tests for --archive (tar/zip output without writing the file tree)."""
+
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings
+from http_file_generator.models.utils.archive import ArchiveWriter, archive_format
+
+
+def test_archive_format_by_suffix():
+    assert archive_format(Path("out.zip")) == "zip"
+    assert archive_format(Path("out.tar.gz")) == "w:gz"
+    assert archive_format(Path("OUT.TGZ")) == "w:gz"
+    assert archive_format(Path("out.tar")) == "w"
+    with pytest.raises(ValueError):
+        archive_format(Path("out.gz"))
+
+
+def test_archive_writer_is_atomic(tmp_path: Path):
+    target = tmp_path / "out.zip"
+    target.write_bytes(b"previous")
+    with pytest.raises(RuntimeError):
+        with ArchiveWriter(target) as bundle:
+            bundle.add("a.http", "GET /")
+            raise RuntimeError("boom")
+    assert target.read_bytes() == b"previous"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_iter_output_files_matches_multi_tree(sample_spec_path: Path, tmp_path: Path):
+    gen = HtttpFileGenerator(
+        sample_spec_path, settings=HttpSettings(filemode=Filemode.MULTI)
+    )
+    out_path = tmp_path / "api.http"
+    files = dict(gen.iter_output_files(out_path))
+
+    gen.to_http_file(out_path)
+    on_disk = {
+        path.relative_to(tmp_path).as_posix(): path.read_text()
+        for path in tmp_path.rglob("*")
+        if path.is_file() and path != sample_spec_path
+    }
+    assert files == on_disk
+
+
+def test_cli_archive_multi_tar_gz(cli_app, sample_spec_path: Path, tmp_path: Path):
+    out = tmp_path / "api.http"
+    archive = tmp_path / "api.tar.gz"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--out",
+            str(out),
+            "--filemode",
+            "multi",
+            "--archive",
+            str(archive),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Archive written" in result.output
+    # Nothing but the archive is written
+    assert not out.exists()
+    assert not (tmp_path / "api").exists()
+
+    with tarfile.open(archive) as tar:
+        names = set(tar.getnames())
+        env = json.loads(tar.extractfile("api/http-client.env.json").read())
+    assert "api/items/index.http" in names
+    assert "api/http-client.private.env.json" in names
+    assert "dev" in env
+
+
+def test_cli_archive_zip_fan_out(cli_app, sample_spec_path: Path, tmp_path: Path):
+    out = tmp_path / "api.http"
+    archive = tmp_path / "api.zip"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--out",
+            str(out),
+            "--filemode",
+            "single",
+            "--filemode",
+            "multi",
+            "--archive",
+            str(archive),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    with zipfile.ZipFile(archive) as bundle:
+        names = set(bundle.namelist())
+        single = bundle.read("api.http").decode()
+    assert "http-client.env.json" in names
+    assert "api/items/index.http" in names
+    assert "api/http-client.env.json" in names
+    assert "### Request: GET /items" in single
+
+
+def test_cli_archive_rejects_incremental_and_unknown_type(
+    cli_app, sample_spec_path: Path, tmp_path: Path
+):
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--archive",
+            str(tmp_path / "out.zip"),
+            "--incremental",
+        ],
+    )
+    assert result.exit_code != 0
+    result = runner.invoke(
+        cli_app,
+        ["generate", str(sample_spec_path), "--archive", str(tmp_path / "out.rar")],
+    )
+    assert result.exit_code != 0
+    assert "Unsupported archive type" in result.output
@@ -0,0 +1,88 @@
+"""Tests for atomic temp-file-and-rename output writes."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import HttpSettings
+from http_file_generator.models.http_file.renderer import HttpRenderer
+from http_file_generator.models.utils import writer
+from http_file_generator.models.utils.writer import atomic_open, atomic_write_text
+
+
+def test_atomic_write_replaces_file(tmp_path: Path) -> None:
+    target = tmp_path / "out.http"
+    target.write_text("old")
+    atomic_write_text(target, "new")
+    assert target.read_text() == "new"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_failed_write_keeps_previous_content(tmp_path: Path) -> None:
+    target = tmp_path / "out.http"
+    target.write_text("old")
+    with pytest.raises(RuntimeError):
+        with atomic_open(target) as f:
+            f.write("partial")
+            raise RuntimeError("interrupted")
+    assert target.read_text() == "old"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_new_files_get_default_permissions(tmp_path: Path) -> None:
+    target = tmp_path / "new.http"
+    atomic_write_text(target, "content")
+    umask = os.umask(0)
+    os.umask(umask)
+    assert target.stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_writes_never_change_the_process_umask(tmp_path: Path, monkeypatch) -> None:
+    def fail(mask: int) -> int:
+        raise AssertionError("os.umask changes process-wide state")
+
+    umask = os.umask(0o027)
+    try:
+        monkeypatch.setattr(writer.os, "umask", fail)
+        target = tmp_path / "new.http"
+        atomic_write_text(target, "content")
+    finally:
+        monkeypatch.undo()
+        os.umask(umask)
+    assert target.stat().st_mode & 0o777 == 0o640
+
+
+def test_existing_permissions_are_kept(tmp_path: Path) -> None:
+    target = tmp_path / "out.http"
+    target.write_text("old")
+    target.chmod(0o640)
+    atomic_write_text(target, "new")
+    assert target.stat().st_mode & 0o777 == 0o640
+
+
+def test_fsync_flushes_file_and_directory(tmp_path: Path, monkeypatch) -> None:
+    synced: list[int] = []
+    monkeypatch.setattr(writer.os, "fsync", lambda fd: synced.append(fd))
+    atomic_write_text(tmp_path / "out.http", "content", fsync=True)
+    assert len(synced) == 2
+
+
+def test_interrupted_generation_leaves_previous_output(
+    sample_spec_path: Path, tmp_path: Path, monkeypatch
+) -> None:
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    out = out_dir / "api.http"
+    out.write_text("previous run")
+
+    def fail(self, request, sidecars=None):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(HttpRenderer, "render_request", fail)
+    gen = HtttpFileGenerator(sample_spec_path, settings=HttpSettings())
+    with pytest.raises(KeyboardInterrupt):
+        gen.to_http_file(out)
+    assert out.read_text() == "previous run"
+    assert list(out_dir.iterdir()) == [out]
@@ -0,0 +1,95 @@
+"""Tests for batch --report (per-spec stage timings and counters)."""
+
+import json
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator.models.manifest import BatchReport, SpecResult
+from http_file_generator.models.utils.timing import (
+    STAGES,
+    StageTimings,
+    record_stage_timings,
+    timed,
+    timed_iter,
+)
+
+
+def test_nested_stages_are_charged_to_the_innermost():
+    timings = StageTimings()
+    with record_stage_timings(timings):
+        with timed("render"):
+            time.sleep(0.02)
+            with timed("sample"):
+                time.sleep(0.05)
+    assert timings.seconds["sample"] >= 0.05
+    assert 0.02 <= timings.seconds["render"] < 0.05
+    # Nothing is recorded without active timings
+    with timed("load"):
+        pass
+    assert timings.seconds["load"] == 0.0
+
+
+def test_timed_iter_charges_item_production():
+    def slow():
+        time.sleep(0.02)
+        yield 1
+
+    timings = StageTimings()
+    with record_stage_timings(timings):
+        with timed("write"):
+            assert list(timed_iter("render", slow())) == [1]
+    assert timings.seconds["render"] >= 0.02
+    assert timings.seconds["write"] < 0.02
+
+
+def _write_specs(root: Path, sample_spec_path: Path) -> None:
+    (root / "good.yaml").write_text(sample_spec_path.read_text())
+    (root / "broken.yaml").write_text("openapi: 3.0.3\npaths: []\n")
+
+
+def test_batch_report_json(run_batch, sample_spec_path: Path, tmp_path: Path):
+    root = tmp_path / "specs"
+    root.mkdir()
+    _write_specs(root, sample_spec_path)
+    report_file = tmp_path / "report.json"
+    result = run_batch(root, "--report", str(report_file))
+    assert result.exit_code == 0, result.output
+
+    report = BatchReport.load(report_file)
+    results = {result.spec: result for result in report.results}
+    good = results["good.yaml"].metrics
+    assert good is not None
+    assert set(good.seconds) == set(STAGES)
+    assert good.seconds["render"] > 0 and good.seconds["resolve"] > 0
+    assert sum(good.seconds.values()) <= good.total_seconds
+    assert good.operations == 2
+    assert good.output_bytes == sum(
+        path.stat().st_size
+        for path in root.iterdir()
+        if path.name.startswith(("good.", "http-client"))
+        and path.suffix in (".http", ".json")
+    )
+    broken = results["broken.yaml"]
+    assert broken.status == "failed" and broken.error
+    assert broken.metrics is not None and broken.metrics.output_bytes == 0
+
+
+def test_batch_report_ndjson_streams_every_spec(
+    cli_app, sample_spec_path: Path, tmp_path: Path
+):
+    root = tmp_path / "specs"
+    root.mkdir()
+    _write_specs(root, sample_spec_path)
+    report_file = tmp_path / "report.ndjson"
+    result = CliRunner().invoke(
+        cli_app, ["batch", str(root), "--jobs", "2", "--report", str(report_file)]
+    )
+    assert result.exit_code == 0, result.output
+
+    lines = report_file.read_text().splitlines()
+    results = [SpecResult.model_validate(json.loads(line)) for line in lines]
+    assert [r.spec for r in results] == ["broken.yaml", "good.yaml"]
+    assert [r.status for r in results] == ["failed", "ok"]
+    assert results[1].metrics is not None and results[1].metrics.operations == 2
@@ -0,0 +1,47 @@
+"""Tests for batch --timeout-per-spec and the deadline process pool."""
+
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator.models.utils.process_pool import DeadlineProcessPool
+
+
+def test_deadline_pool_kills_only_overrunning_calls():
+    with DeadlineProcessPool(max_workers=2, timeout=0.5) as pool:
+        slow = pool.submit(time.sleep, 30)
+        fast = [pool.submit(pow, 2, n) for n in range(4)]
+        failing = pool.submit(int, "x")
+        started = time.monotonic()
+        with pytest.raises(TimeoutError, match="Timed out after"):
+            slow.result()
+        assert time.monotonic() - started < 10
+        assert [future.result() for future in fast] == [1, 2, 4, 8]
+        with pytest.raises(ValueError):
+            failing.result()
+
+
+def test_batch_timeout_records_failure_and_continues(cli_app, tmp_path: Path) -> None:
+    spec = tmp_path / "a.yaml"
+    spec.write_text(
+        "openapi: 3.0.3\ninfo:\n  title: A\n  version: '1.0'\npaths:\n"
+        "  /a:\n    get:\n      responses:\n        '200':\n          description: ok\n"
+    )
+    runner = CliRunner()
+    res = runner.invoke(
+        cli_app,
+        ["batch", str(tmp_path), "--pattern", "*.yaml", "--timeout-per-spec", "0.001"],
+    )
+    assert res.exit_code == 0, res.output
+    assert "Timed out after" in res.output
+    assert "Done. OK: 0  Failed: 1" in res.output
+    assert not (tmp_path / "a.http").exists()
+
+    res = runner.invoke(
+        cli_app,
+        ["batch", str(tmp_path), "--pattern", "*.yaml", "--timeout-per-spec", "60"],
+    )
+    assert "Done. OK: 1  Failed: 0" in res.output
+    assert (tmp_path / "a.http").exists()
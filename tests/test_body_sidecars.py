@@ -0,0 +1,171 @@
+"""Tests for externalising large bodies and examples to sidecar files."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings
+
+BIG = {"items": [{"id": i, "name": f"item {i}"} for i in range(50)]}
+SMALL = {"id": 1}
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Sidecars", "version": "1.0"},
+    "paths": {
+        "/items": {
+            "post": {
+                "requestBody": {"content": {"application/json": {"example": BIG}}},
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {"application/json": {"example": BIG}},
+                    }
+                },
+            },
+            "put": {
+                "requestBody": {"content": {"application/json": {"example": SMALL}}},
+                "responses": {"200": {"description": "OK"}},
+            },
+        }
+    },
+}
+
+
+def _generate(tmp_path: Path, **settings) -> Path:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    out = tmp_path / "api.http"
+    HtttpFileGenerator(spec, settings=HttpSettings(**settings)).to_http_file(out)
+    return out
+
+
+def test_bodies_are_inlined_by_default(tmp_path: Path) -> None:
+    content = _generate(tmp_path).read_text()
+    assert '"name": "item 49"' in content
+    assert "< ./bodies/" not in content
+    assert not (tmp_path / "bodies").exists()
+
+
+def test_large_body_is_written_to_sidecar(tmp_path: Path) -> None:
+    content = _generate(tmp_path, body_file_threshold=200).read_text()
+    assert (
+        "POST {{BASE_URL}}/items\n"
+        "Content-Type: application/json\n"
+        "\n"
+        "< ./bodies/post_items.json"
+    ) in content
+    assert json.loads((tmp_path / "bodies" / "post_items.json").read_text()) == BIG
+    # Small bodies stay inline
+    assert '"id": 1' in content
+    assert not (tmp_path / "bodies" / "put_items.json").exists()
+
+
+def test_large_examples_are_written_to_sidecars(tmp_path: Path) -> None:
+    out = _generate(
+        tmp_path, body_file_threshold=200, include_examples=True, include_schema=True
+    )
+    content = out.read_text()
+    assert "# <example in ./bodies/post_items.response_200_example.json>" in content
+    assert "# <example in ./bodies/post_items.request_example.json>" in content
+    sidecar = tmp_path / "bodies" / "post_items.response_200_example.json"
+    assert json.loads(sidecar.read_text()) == BIG
+    assert "# \"name\": \"item 49\"" not in content
+
+
+def test_multi_mode_sidecars_live_next_to_path_file(tmp_path: Path) -> None:
+    _generate(tmp_path, body_file_threshold=200, filemode=Filemode.MULTI)
+    index = tmp_path / "api" / "items" / "index.http"
+    assert "< ./bodies/post_items.json" in index.read_text()
+    assert (index.parent / "bodies" / "post_items.json").exists()
+
+
+def test_cli_body_file_threshold(cli_app, tmp_path: Path) -> None:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    out = tmp_path / "api.http"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(spec),
+            "--out",
+            str(out),
+            "--no-env",
+            "--incremental",
+            "--body-file-threshold",
+            "200",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "< ./bodies/post_items.json" in out.read_text()
+    assert (tmp_path / "bodies" / "post_items.json").exists()
+
+
+def _clashing_spec(*paths: str) -> dict:
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Clash", "version": "1.0"},
+        "paths": {
+            path: {
+                "post": {
+                    "requestBody": {
+                        "content": {"application/json": {"example": {"path": path}}}
+                    },
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+            for path in paths
+        },
+    }
+
+
+def _generate_incremental(tmp_path: Path, spec_data: dict) -> str:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(spec_data))
+    out = tmp_path / "api.http"
+    gen = HtttpFileGenerator(spec, settings=HttpSettings(body_file_threshold=1))
+    gen.to_http_file(out, incremental=True)
+    return out.read_text()
+
+
+def test_incremental_sidecar_names_are_unique_per_operation(tmp_path: Path) -> None:
+    content = _generate_incremental(tmp_path, _clashing_spec("/a-b", "/a_b"))
+    assert "< ./bodies/post_a_b.json" in content
+    assert "< ./bodies/post_a_b_2.json" in content
+    bodies = tmp_path / "bodies"
+    assert json.loads((bodies / "post_a_b.json").read_text()) == {"path": "/a-b"}
+    assert json.loads((bodies / "post_a_b_2.json").read_text()) == {"path": "/a_b"}
+
+    # A new clashing operation does not take the name of a reused one
+    content = _generate_incremental(tmp_path, _clashing_spec("/a-b", "/a_b", "/a.b"))
+    assert json.loads((bodies / "post_a_b.json").read_text()) == {"path": "/a-b"}
+    assert json.loads((bodies / "post_a_b_2.json").read_text()) == {"path": "/a_b"}
+    assert json.loads((bodies / "post_a_b_3.json").read_text()) == {"path": "/a.b"}
+
+
+def test_incremental_removes_sidecars_of_removed_operations(tmp_path: Path) -> None:
+    _generate_incremental(tmp_path, _clashing_spec("/a-b", "/c"))
+    (tmp_path / "bodies" / "other.json").write_text("{}")
+    content = _generate_incremental(tmp_path, _clashing_spec("/c"))
+    assert "post_a_b" not in content
+    assert sorted(p.name for p in (tmp_path / "bodies").iterdir()) == [
+        "other.json",
+        "post_c.json",
+    ]
+
+
+def test_incremental_multi_mode_removes_stale_sidecars(tmp_path: Path) -> None:
+    spec = tmp_path / "spec.json"
+    out = tmp_path / "api"
+    settings = HttpSettings(body_file_threshold=1, filemode=Filemode.MULTI)
+    spec.write_text(json.dumps(_clashing_spec("/a", "/c")))
+    HtttpFileGenerator(spec, settings=settings).to_http_file(out, incremental=True)
+    assert (out / "a" / "bodies" / "post_a.json").exists()
+    spec.write_text(json.dumps(_clashing_spec("/c")))
+    gen = HtttpFileGenerator(spec, settings=settings)
+    gen.to_http_file(out, incremental=True)
+    assert not (out / "a" / "bodies" / "post_a.json").exists()
+    assert (out / "c" / "bodies" / "post_c.json").exists()
@@ -0,0 +1,88 @@
+"""Tests for batch --incremental (skipping specs unchanged since the last run)."""
+
+import json
+from pathlib import Path
+
+from http_file_generator.models.manifest.batch_manifest import (
+    BATCH_MANIFEST_FILENAME,
+    BatchManifest,
+)
+
+
+def test_batch_incremental_skips_unchanged_specs(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    write_spec(tmp_path / "b.yaml", "b")
+
+    first = run_batch(tmp_path, "--incremental")
+    assert first.exit_code == 0, first.output
+    assert "Done. OK: 2  Up-to-date: 0  Failed: 0" in first.output
+    manifest = json.loads((tmp_path / BATCH_MANIFEST_FILENAME).read_text())
+    assert set(manifest["entries"]) == {"a.yaml", "b.yaml"}
+    assert "a.http" in manifest["entries"]["a.yaml"]["outputs"]
+
+    # Without --overwrite, a second run still succeeds and skips everything
+    second = run_batch(tmp_path, "--incremental")
+    assert second.exit_code == 0, second.output
+    assert "Done. OK: 0  Up-to-date: 2  Failed: 0" in second.output
+
+    write_spec(tmp_path / "b.yaml", "b2")
+    third = run_batch(tmp_path, "--incremental")
+    assert "Done. OK: 1  Up-to-date: 1  Failed: 0" in third.output
+    assert "/b2" in (tmp_path / "b.http").read_text()
+
+
+def test_batch_incremental_reruns_on_settings_or_missing_output(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    assert run_batch(tmp_path, "--incremental").exit_code == 0
+
+    changed = run_batch(tmp_path, "--incremental", "--mode", "kulala")
+    assert "Done. OK: 1  Up-to-date: 0  Failed: 0" in changed.output
+
+    (tmp_path / "a.http").unlink()
+    missing = run_batch(tmp_path, "--incremental", "--mode", "kulala")
+    assert "Done. OK: 1  Up-to-date: 0  Failed: 0" in missing.output
+    assert (tmp_path / "a.http").exists()
+
+
+def test_batch_incremental_reruns_when_only_a_referenced_file_changes(
+    run_batch, tmp_path: Path
+) -> None:
+    (tmp_path / "common").mkdir()
+    schemas = tmp_path / "common" / "schemas.yaml"
+    schemas.write_text("Thing:\n  $ref: 'fields.yaml#/Fields'\n")
+    fields = tmp_path / "common" / "fields.yaml"
+    fields.write_text(
+        "Fields:\n  type: object\n  properties:\n    name: {type: string}\n"
+    )
+    (tmp_path / "a.yaml").write_text(
+        "openapi: 3.0.3\ninfo:\n  title: a\n  version: '1.0'\npaths:\n  /things:\n"
+        "    post:\n      requestBody:\n        content:\n          application/json:\n"
+        "            schema:\n              $ref: 'common/schemas.yaml#/Thing'\n"
+        "      responses:\n        '200':\n          description: ok\n"
+    )
+    assert run_batch(tmp_path, "--incremental").exit_code == 0
+    entry = json.loads((tmp_path / BATCH_MANIFEST_FILENAME).read_text())["entries"]
+    assert set(entry["a.yaml"]["dependencies"]) == {
+        "common/schemas.yaml",
+        "common/fields.yaml",
+    }
+    unchanged = run_batch(tmp_path, "--incremental")
+    assert "Done. OK: 0  Up-to-date: 1  Failed: 0" in unchanged.output
+
+    # Only a file reached through another referenced file changes
+    fields.write_text(fields.read_text() + "    size: {type: integer}\n")
+    rerun = run_batch(tmp_path, "--incremental")
+    assert "Done. OK: 1  Up-to-date: 0  Failed: 0" in rerun.output, rerun.output
+    assert '"size"' in (tmp_path / "a.http").read_text()
+
+
+def test_batch_manifest_from_other_tool_version_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / BATCH_MANIFEST_FILENAME
+    BatchManifest(tool_version="0.0.0-old").save(path)
+    assert BatchManifest.load(path) is None
+    BatchManifest().save(path)
+    assert BatchManifest.load(path) is not None
@@ -0,0 +1,54 @@
+"""Tests for batch --jobs (specs processed in a worker process pool)."""
+
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+
+def test_batch_jobs_reports_in_input_order(
+    cli_app, write_spec, tmp_path: Path
+) -> None:
+    for name in ("c", "a", "b"):
+        spec_dir = tmp_path / name
+        spec_dir.mkdir()
+        write_spec(spec_dir / f"{name}.yaml", name)
+    (tmp_path / "b" / "broken.yaml").write_text("openapi: [")
+
+    res = CliRunner().invoke(
+        cli_app,
+        ["batch", str(tmp_path), "--pattern", "*/*.yaml", "--jobs", "3"],
+    )
+    assert res.exit_code == 0, res.output
+    for name in ("a", "b", "c"):
+        assert (tmp_path / name / f"{name}.http").exists()
+        assert (tmp_path / name / "http-client.env.json").exists()
+
+    generated = [
+        line.split("/")[-1] for line in res.output.splitlines() if "Generated:" in line
+    ]
+    assert generated == ["a.http", "b.http", "c.http"]
+    assert "Done. OK: 3  Failed: 1" in res.output
+    assert "broken.yaml" in res.output
+
+
+def test_batch_single_job_collects_failures(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    (tmp_path / "a.http").write_text("keep")
+
+    res = run_batch(tmp_path)
+    assert res.exit_code == 0, res.output
+    assert "Refusing to overwrite existing file without --overwrite" in res.output
+    assert (tmp_path / "a.http").read_text() == "keep"
+    assert "Done. OK: 0  Failed: 1" in res.output
+
+
+def test_batch_rejects_invalid_base_url(write_spec, run_batch, tmp_path: Path) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+
+    res = run_batch(tmp_path, "--base-url", "not a url")
+    assert res.exit_code == 1
+    assert isinstance(res.exception, SystemExit)
+    assert "Invalid settings" in res.output
+    assert not (tmp_path / "a.http").exists()
@@ -0,0 +1,60 @@
+"""Tests for batch checkpointing and --resume."""
+
+import json
+from pathlib import Path
+
+from http_file_generator.models.manifest import BatchJournal, BatchManifestEntry
+from http_file_generator.models.manifest.batch_journal import BATCH_JOURNAL_FILENAME
+
+
+def test_finished_batch_removes_journal(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    res = run_batch(tmp_path, "--no-env")
+    assert res.exit_code == 0, res.output
+    assert not (tmp_path / BATCH_JOURNAL_FILENAME).exists()
+
+
+def test_resume_skips_specs_completed_by_interrupted_run(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    write_spec(tmp_path / "b.yaml", "b")
+    # Run once to learn the digests, then fake a run interrupted after a.yaml
+    assert run_batch(tmp_path, "--no-env", "--incremental").exit_code == 0
+    manifest = json.loads((tmp_path / ".httpfilegen-batch-manifest.json").read_text())
+    journal = BatchJournal(tmp_path / BATCH_JOURNAL_FILENAME)
+    journal.open()
+    journal.record(
+        "a.yaml", BatchManifestEntry.model_validate(manifest["entries"]["a.yaml"])
+    )
+    journal.close(finished=False)
+    # A torn last line from the kill is ignored
+    with (tmp_path / BATCH_JOURNAL_FILENAME).open("a") as f:
+        f.write('{"spec": "b.ya')
+    (tmp_path / "a.http").write_text("from the interrupted run")
+
+    res = run_batch(tmp_path, "--no-env", "--resume", "--overwrite")
+    assert res.exit_code == 0, res.output
+    assert "Resumed: " in res.output
+    assert "Done. OK: 1  Resumed: 1  Failed: 0" in res.output
+    assert (tmp_path / "a.http").read_text() == "from the interrupted run"
+    assert "/b" in (tmp_path / "b.http").read_text()
+    assert not (tmp_path / BATCH_JOURNAL_FILENAME).exists()
+
+
+def test_resume_ignores_checkpoints_of_changed_specs(
+    write_spec, run_batch, tmp_path: Path
+) -> None:
+    write_spec(tmp_path / "a.yaml", "a")
+    journal = BatchJournal(tmp_path / BATCH_JOURNAL_FILENAME)
+    journal.open()
+    journal.record(
+        "a.yaml", BatchManifestEntry(spec_digest="old", settings_digest="old")
+    )
+    journal.close(finished=False)
+
+    res = run_batch(tmp_path, "--no-env", "--resume")
+    assert "Done. OK: 1  Resumed: 0  Failed: 0" in res.output
+    assert (tmp_path / "a.http").exists()
@@ -0,0 +1,96 @@
+"""Tests for batch --shard INDEX/COUNT and batch-merge."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator.models.utils.partition import partition_by_cost
+
+
+def test_partition_by_cost_balances_and_is_deterministic():
+    costs = {"a": 10, "b": 9, "c": 5, "d": 4, "e": 1}
+    parts = partition_by_cost(costs, 2)
+    assert parts == partition_by_cost(dict(reversed(costs.items())), 2)
+    assert sorted(key for part in parts for key in part) == sorted(costs)
+    totals = sorted(sum(costs[key] for key in part) for part in parts)
+    assert totals == [14, 15]
+    assert partition_by_cost({"a": 1}, 3) == [["a"], [], []]
+
+
+def test_batch_shards_cover_specs_once_and_merge(
+    cli_app, write_spec, run_batch, tmp_path: Path
+) -> None:
+    specs = tmp_path / "specs"
+    specs.mkdir()
+    for name, routes in (("a", 8), ("b", 1), ("c", 1), ("d", 6)):
+        write_spec(specs / f"{name}.yaml", *(f"r{i}" for i in range(routes)))
+    (specs / "e.yaml").write_text("openapi: [")
+
+    results = []
+    for index in (1, 2):
+        result = tmp_path / f"shard{index}.json"
+        res = run_batch(
+            specs, "--no-env", "--shard", f"{index}/2", "--result", str(result)
+        )
+        assert res.exit_code == 0, res.output
+        results.append(json.loads(result.read_text()))
+
+    shard_specs = [{r["spec"] for r in data["results"]} for data in results]
+    assert shard_specs[0].isdisjoint(shard_specs[1])
+    assert shard_specs[0] | shard_specs[1] == {
+        "a.yaml",
+        "b.yaml",
+        "c.yaml",
+        "d.yaml",
+        "e.yaml",
+    }
+    # The two large specs end up on different shards
+    assert ("a.yaml" in shard_specs[0]) != ("d.yaml" in shard_specs[0])
+
+    merged_path = tmp_path / "merged.json"
+    res = CliRunner().invoke(
+        cli_app,
+        [
+            "batch-merge",
+            str(tmp_path / "shard1.json"),
+            str(tmp_path / "shard2.json"),
+            "--out",
+            str(merged_path),
+        ],
+    )
+    assert res.exit_code == 0, res.output
+    assert "Done. OK: 4  Failed: 1" in res.output
+    assert "e.yaml" in res.output
+    merged = json.loads(merged_path.read_text())
+    assert [r["spec"] for r in merged["results"]] == sorted(
+        ["a.yaml", "b.yaml", "c.yaml", "d.yaml", "e.yaml"]
+    )
+
+
+def test_batch_merge_reports_missing_and_duplicate_shards(
+    cli_app, tmp_path: Path
+) -> None:
+    for index in (1, 3):
+        (tmp_path / f"s{index}.json").write_text(
+            json.dumps({"shard_index": index, "shard_count": 3, "results": []})
+        )
+    runner = CliRunner()
+    res = runner.invoke(
+        cli_app, ["batch-merge", str(tmp_path / "s1.json"), str(tmp_path / "s3.json")]
+    )
+    assert res.exit_code != 0
+    assert "2/3" in res.output
+
+    res = runner.invoke(
+        cli_app, ["batch-merge", str(tmp_path / "s1.json"), str(tmp_path / "s1.json")]
+    )
+    assert res.exit_code != 0
+    assert "given twice" in res.output
+
+
+def test_batch_rejects_invalid_shard(write_spec, run_batch, tmp_path: Path) -> None:
+    write_spec(tmp_path / "a.yaml", "r0")
+    res = run_batch(tmp_path, "--shard", "3/2")
+    assert res.exit_code != 0
+    assert "Invalid value for --shard" in res.output
@@ -0,0 +1,182 @@
+"""Tests for batch --urls (fetching spec URLs concurrently)."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from typer.testing import CliRunner
+
+from cli import _url_output_names
+
+COMMON = """
+components:
+  schemas:
+    Error:
+      type: object
+      properties:
+        message:
+          type: string
+"""
+
+
+def _spec(name: str) -> str:
+    return f"""
+openapi: 3.0.3
+info:
+  title: {name}
+  version: '1.0'
+servers:
+  - url: https://{name}.example.com
+paths:
+  /{name}:
+    post:
+      requestBody:
+        content:
+          application/json:
+            schema:
+              $ref: 'common.yaml#/components/schemas/Error'
+      responses:
+        '200':
+          description: ok
+"""
+
+
+class _SpecServer(ThreadingHTTPServer):
+    """Serves specs under /specs/ with artificial latency and counts overlap."""
+
+    daemon_threads = True
+    latency = 0.3
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SpecHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class _SpecHandler(BaseHTTPRequestHandler):
+    server: _SpecServer
+
+    def do_GET(self) -> None:
+        server = self.server
+        name = self.path.rsplit("/", 1)[-1]
+        if name == "common.yaml":
+            # Fetched while resolving, not by the batch itself
+            self._send(COMMON)
+            return
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            if name.startswith("missing"):
+                self.send_error(404)
+            else:
+                self._send(_spec(name.removesuffix(".yaml")))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, body: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/yaml")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture()
+def spec_server() -> Iterator[_SpecServer]:
+    server = _SpecServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _url_list(tmp_path: Path, urls: list[str]) -> Path:
+    path = tmp_path / "specs.txt"
+    path.write_text("# fleet\n\n" + "\n".join(urls) + "\n")
+    return path
+
+
+def test_url_output_names_are_distinct():
+    assert _url_output_names(
+        [
+            "https://a.example.com/v1/orders.yaml",
+            "https://b.example.com/v2/orders.yaml",
+            "https://c.example.com/",
+        ]
+    ) == ["orders", "orders-2", "c.example.com"]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_batch_urls_fetches_concurrently(
+    cli_app, spec_server, tmp_path: Path, jobs: str
+):
+    names = ["orders", "billing", "users", "stock"]
+    urls = _url_list(tmp_path, [f"{spec_server.url}/specs/{n}.yaml" for n in names])
+    out = tmp_path / "out"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "batch",
+            "--urls",
+            str(urls),
+            "--out-dir",
+            str(out),
+            "--fetch-concurrency",
+            "2",
+            "--jobs",
+            jobs,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "OK: 4" in result.output
+    # Fetches overlap, but never beyond the limit
+    assert spec_server.peak == 2
+    # Results are reported in list order
+    positions = [result.output.index(f"{name}.http") for name in names]
+    assert positions == sorted(positions)
+    # Relative $refs resolve against the spec's URL
+    content = (out / "orders.http").read_text()
+    assert "POST {{BASE_URL}}/orders" in content
+    assert '"message"' in content
+    assert (out / "http-client.env.json").exists()
+
+
+def test_batch_urls_reports_fetch_failures(cli_app, spec_server, tmp_path: Path):
+    spec_server.latency = 0
+    urls = _url_list(
+        tmp_path,
+        [f"{spec_server.url}/specs/missing.yaml", f"{spec_server.url}/specs/a.yaml"],
+    )
+    result = CliRunner().invoke(cli_app, ["batch", "--urls", str(urls)])
+    assert result.exit_code == 0, result.output
+    assert "OK: 1" in result.output and "Failed: 1" in result.output
+    assert "404" in result.output
+    assert (tmp_path / "a.http").exists()
+
+
+def test_batch_urls_rejects_path_and_incremental(
+    cli_app, sample_spec_path: Path, tmp_path: Path
+):
+    urls = _url_list(tmp_path, ["https://example.com/a.yaml"])
+    runner = CliRunner()
+    result = runner.invoke(
+        cli_app, ["batch", str(sample_spec_path), "--urls", str(urls)]
+    )
+    assert result.exit_code != 0
+    result = runner.invoke(cli_app, ["batch", "--urls", str(urls), "--incremental"])
+    assert result.exit_code != 0
+    assert "--urls cannot be combined" in result.output
@@ -1,9 +1,12 @@
 """Tests for --dry-run and validate CLI features."""
 
+import json
 from pathlib import Path
 
 from typer.testing import CliRunner
 
+from http_file_generator import HtttpFileGenerator
+
 
 class TestDryRun:
     """Tests for --dry-run option."""
@@ -119,6 +122,64 @@ class TestDryRun:
         assert result.exit_code == 0, result.output
         assert "Mode: MULTI" in result.output
 
+    def test_dry_run_reports_estimates(
+        self, cli_app, sample_spec_path, tmp_path: Path
+    ) -> None:
+        """Test that --dry-run reports operation count and estimated size."""
+        runner = CliRunner()
+        result = runner.invoke(
+            cli_app,
+            [
+                "generate",
+                str(sample_spec_path),
+                "--out",
+                str(tmp_path / "out.http"),
+                "--dry-run",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Operations: 2, estimated size:" in result.output
+        assert "truncated" not in result.output
+
+    def test_preview_stops_at_line_budget(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that the preview only builds the requests it needs to show."""
+        from http_file_generator.models.http_file.request import HttpRequest
+
+        paths = {
+            f"/items{i}": {"get": {"responses": {"200": {"description": "OK"}}}}
+            for i in range(50)
+        }
+        spec_file = tmp_path / "spec.json"
+        spec_file.write_text(
+            json.dumps(
+                {
+                    "openapi": "3.0.3",
+                    "info": {"title": "Big", "version": "1.0"},
+                    "paths": paths,
+                }
+            )
+        )
+        built: list[str] = []
+        original = HttpRequest._operation_fields.__func__
+
+        def spy(cls, **kwargs):
+            built.append(kwargs["path"])
+            return original(cls, **kwargs)
+
+        monkeypatch.setattr(HttpRequest, "_operation_fields", classmethod(spy))
+
+        preview = HtttpFileGenerator(spec_file).preview(max_lines=20)
+        assert len(preview.lines) == 20
+        assert preview.truncated
+        assert preview.operations == 50
+        assert len(built) == preview.rendered < 50
+        assert preview.estimated_size > preview.rendered_chars
+
+        full = HtttpFileGenerator(spec_file).preview(max_lines=10_000)
+        assert not full.truncated
+        assert full.operations == 50
+        assert full.lines[:20] == preview.lines
+
 
 class TestValidate:
     """Tests for validate command."""
@@ -0,0 +1,111 @@
+"""Tests for rendering several editor modes and filemodes from one build."""
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import EditorMode, Filemode, HttpSettings
+from http_file_generator.models.http_file.request import HttpRequest
+
+
+@pytest.fixture()
+def built(monkeypatch) -> list[str]:
+    """Record every operation that is actually built."""
+    calls: list[str] = []
+    original = HttpRequest._operation_fields.__func__
+
+    def spy(cls, **kwargs):
+        calls.append(f"{kwargs['method']} {kwargs['path']}")
+        return original(cls, **kwargs)
+
+    monkeypatch.setattr(HttpRequest, "_operation_fields", classmethod(spy))
+    return calls
+
+
+def test_with_settings_shares_built_requests(sample_spec_path: Path) -> None:
+    gen = HtttpFileGenerator(sample_spec_path, settings=HttpSettings())
+    requests = gen.requests
+    variant = gen.with_settings(
+        editor_mode=EditorMode.KULALA, filemode=Filemode.MULTI
+    )
+    assert variant.requests is requests
+    assert variant.settings.editor_mode == EditorMode.KULALA
+    assert gen.settings.editor_mode == EditorMode.DEFAULT
+
+
+def test_with_settings_rebuilds_on_selection_change(sample_spec_path: Path) -> None:
+    from http_file_generator.models import OperationSelection
+
+    gen = HtttpFileGenerator(sample_spec_path)
+    assert len(gen.requests) == 2
+    variant = gen.with_settings(selection=OperationSelection(methods=["POST"]))
+    assert [r.method for r in variant.requests] == ["POST"]
+
+
+def test_generate_fans_out_modes_and_filemodes(
+    cli_app, sample_spec_path: Path, tmp_path: Path, built: list[str]
+) -> None:
+    out = tmp_path / "api.http"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--out",
+            str(out),
+            "--mode",
+            "kulala",
+            "--mode",
+            "pycharm",
+            "--mode",
+            "httpyac",
+            "--filemode",
+            "single",
+            "--filemode",
+            "multi",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    # Each operation is built (and sampled) exactly once
+    assert sorted(built) == ["GET /items", "POST /items"]
+
+    headers = {
+        "kulala": "# Kulala.nvim HTTP file",
+        "pycharm": "# JetBrains HTTP Client file",
+        "httpyac": "# httpyac HTTP file",
+    }
+    for mode, header in headers.items():
+        single = tmp_path / f"api.{mode}.http"
+        multi = tmp_path / f"api.{mode}" / "items" / "index.http"
+        assert single.read_text().startswith(header)
+        assert multi.read_text().startswith(header)
+    # All outputs share the directory of the env files
+    assert (tmp_path / "http-client.env.json").exists()
+
+
+def test_single_mode_keeps_plain_output_name(
+    cli_app, sample_spec_path: Path, tmp_path: Path
+) -> None:
+    out = tmp_path / "api.http"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--out",
+            str(out),
+            "--no-env",
+            "--mode",
+            "kulala",
+            "--filemode",
+            "single",
+            "--filemode",
+            "multi",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert out.read_text().startswith("# Kulala.nvim HTTP file")
+    assert (tmp_path / "api" / "items" / "index.http").exists()
@@ -0,0 +1,148 @@
+"""Tests for the component cache shared by the specs of a batch."""
+
+import textwrap
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models.utils.component_cache import (
+    ComponentCache,
+    DocumentCache,
+    cached_sample,
+    use_component_cache,
+)
+
+COMMON = textwrap.dedent(
+    """
+    components:
+      schemas:
+        Error:
+          type: object
+          properties:
+            code:
+              type: integer
+            message:
+              type: string
+    """
+)
+
+
+def _service_spec(name: str) -> str:
+    return textwrap.dedent(
+        f"""
+        openapi: 3.0.3
+        info:
+          title: {name}
+          version: '1.0'
+        servers:
+          - url: https://{name}.example.com
+        paths:
+          /{name}:
+            post:
+              requestBody:
+                content:
+                  application/json:
+                    schema:
+                      $ref: 'common.yaml#/components/schemas/Error'
+              responses:
+                '200':
+                  description: OK
+        """
+    )
+
+
+def _write_services(root: Path, *names: str) -> list[Path]:
+    (root / "common.yaml").write_text(COMMON)
+    specs = []
+    for name in names:
+        spec = root / f"{name}.openapi.yaml"
+        spec.write_text(_service_spec(name))
+        specs.append(spec)
+    return specs
+
+
+def test_external_refs_resolve_relative_to_spec(tmp_path: Path):
+    (spec,) = _write_services(tmp_path, "orders")
+    gen = HtttpFileGenerator(spec)
+    (request,) = gen.requests
+    assert set(request.body) == {"code", "message"}
+
+
+def test_shared_documents_are_read_once(tmp_path: Path):
+    specs = _write_services(tmp_path, "orders", "billing")
+    cache = ComponentCache()
+    with use_component_cache(cache):
+        for spec in specs:
+            HtttpFileGenerator(spec)
+    assert cache.documents.hits > 0
+
+
+def test_document_cache_drops_changed_files(tmp_path: Path):
+    doc = tmp_path / "common.yaml"
+    doc.write_text("a: 1\n")
+    cache = DocumentCache()
+    key = (doc.as_uri(), True)
+    cache[key] = {"a": 1}
+    assert cache[key] == {"a": 1}
+
+    doc.write_text("a: 22\n")
+    assert key not in cache
+    assert cache.misses == 1
+    # Remote documents are kept as they are
+    cache[("https://example.com/common.yaml", True)] = {"b": 2}
+    assert cache[("https://example.com/common.yaml", True)] == {"b": 2}
+
+
+def test_samples_are_generated_once_and_copied():
+    cache = ComponentCache()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        return {"name": "x"}
+
+    schema = {"type": "object", "properties": {"name": {"type": "string"}}}
+    with use_component_cache(cache):
+        first = cached_sample("body", schema, generate)
+        first["name"] = "changed"
+        second = cached_sample("body", schema, generate)
+        # Different samplers do not share values
+        cached_sample("param", schema, generate)
+    assert second == {"name": "x"}
+    assert len(calls) == 2
+    assert (cache.sample_hits, cache.sample_misses) == (1, 2)
+    # Without an active cache every call generates
+    cached_sample("body", schema, generate)
+    assert len(calls) == 3
+
+
+def test_persistent_samples_survive_new_cache(tmp_path: Path):
+    schema = {"type": "string"}
+    ComponentCache(tmp_path).sample("body", schema, lambda: "stored")
+    assert list(tmp_path.glob("*/samples/*.json"))
+
+    cache = ComponentCache(tmp_path)
+    assert cache.sample("body", schema, lambda: "regenerated") == "stored"
+    assert cache.sample_hits == 1
+
+
+def test_cli_batch_with_shared_refs_and_cache_dir(cli_app, tmp_path: Path):
+    root = tmp_path / "specs"
+    root.mkdir()
+    _write_services(root, "orders", "billing")
+    cache_dir = tmp_path / "cache"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "batch",
+            str(root),
+            "--pattern",
+            "*.openapi.yaml",
+            "--cache-dir",
+            str(cache_dir),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "POST {{BASE_URL}}/billing" in (root / "billing.openapi.http").read_text()
+    assert list(cache_dir.glob("*/samples/*.json"))
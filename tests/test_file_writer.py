@@ -0,0 +1,157 @@
+"""Tests for the parallel write-if-changed writer used by MULTI output."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings
+from http_file_generator.models.utils.writer import FileWriter
+
+
+def _age(path: Path) -> None:
+    """Push the mtime into the past so rewrites are detectable."""
+    os.utime(path, (1_000_000, 1_000_000))
+
+
+class TestFileWriter:
+    def test_writes_new_files_and_creates_directories(self, tmp_path: Path) -> None:
+        writer = FileWriter(tmp_path)
+        writer.add("a/b/index.http", "one")
+        writer.add("c/index.http", "two")
+        stats = writer.commit()
+        assert (stats.written, stats.unchanged, stats.removed) == (2, 0, 0)
+        assert (tmp_path / "a" / "b" / "index.http").read_text() == "one"
+
+    def test_skips_unchanged_files(self, tmp_path: Path) -> None:
+        target = tmp_path / "index.http"
+        target.write_text("same")
+        _age(target)
+
+        writer = FileWriter(tmp_path)
+        writer.add("index.http", "same")
+        stats = writer.commit()
+        assert (stats.written, stats.unchanged) == (0, 1)
+        assert target.stat().st_mtime == 1_000_000
+
+        writer.add("index.http", "different")
+        assert writer.commit().written == 1
+        assert target.read_text() == "different"
+
+    def test_prunes_orphans_and_empty_directories(self, tmp_path: Path) -> None:
+        orphan = tmp_path / "gone" / "deeper" / "index.http"
+        orphan.parent.mkdir(parents=True)
+        orphan.write_text("old")
+        keep = tmp_path / "notes.txt"
+        keep.write_text("not generated")
+
+        writer = FileWriter(tmp_path)
+        writer.add("kept/index.http", "new")
+        stats = writer.commit(prune_globs=["**/index.http"])
+        assert stats.removed == 1
+        assert not (tmp_path / "gone").exists()
+        assert keep.exists()
+        assert (tmp_path / "kept" / "index.http").exists()
+
+    def test_writes_while_adding_with_bounded_pending_files(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        writer = FileWriter(tmp_path, max_workers=1, max_pending=2)
+        write = writer._write_if_changed
+        state = {"added": 0, "done": 0, "peak": 0}
+
+        def slow_write(path: Path, data: bytes) -> bool:
+            time.sleep(0.01)
+            result = write(path, data)
+            state["done"] += 1
+            return result
+
+        monkeypatch.setattr(writer, "_write_if_changed", slow_write)
+        for i in range(10):
+            writer.add(f"{i}/index.http", str(i))
+            state["added"] += 1
+            state["peak"] = max(state["peak"], state["added"] - state["done"])
+        # Files are written while others are still being added
+        assert (tmp_path / "0" / "index.http").read_text() == "0"
+        assert state["peak"] <= 2
+        assert writer.commit().written == 10
+        assert (tmp_path / "9" / "index.http").read_text() == "9"
+
+    def test_pending_writes_finish_when_adding_fails(self, tmp_path: Path) -> None:
+        (tmp_path / "blocked").write_text("a file, not a directory")
+        with pytest.raises(OSError):
+            with FileWriter(tmp_path) as writer:
+                writer.add("ok/index.http", "fine")
+                writer.add("blocked/index.http", "nope")
+        assert (tmp_path / "ok" / "index.http").read_text() == "fine"
+
+
+def _spec(paths: list[str]) -> dict:
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Writer", "version": "1.0"},
+        "paths": {
+            path: {"get": {"responses": {"200": {"description": "OK"}}}}
+            for path in paths
+        },
+    }
+
+
+def _generate(tmp_path: Path, paths: list[str], **settings) -> HtttpFileGenerator:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(_spec(paths)))
+    gen = HtttpFileGenerator(
+        spec, settings=HttpSettings(filemode=Filemode.MULTI, **settings)
+    )
+    gen.to_http_file(tmp_path / "api.http")
+    return gen
+
+
+def test_multi_mode_rewrites_only_changed_files(tmp_path: Path) -> None:
+    gen = _generate(tmp_path, ["/users", "/orders"])
+    assert gen.write_stats.written == 2
+    users = tmp_path / "api" / "users" / "index.http"
+    _age(users)
+
+    gen = _generate(tmp_path, ["/users", "/orders"])
+    assert (gen.write_stats.written, gen.write_stats.unchanged) == (0, 2)
+    assert users.stat().st_mtime == 1_000_000
+
+
+def test_multi_mode_prunes_removed_paths_on_request(tmp_path: Path) -> None:
+    _generate(tmp_path, ["/users", "/orders/open"])
+    orders = tmp_path / "api" / "orders"
+
+    _generate(tmp_path, ["/users"])
+    assert (orders / "open" / "index.http").exists()
+
+    gen = _generate(tmp_path, ["/users"], prune_orphans=True)
+    assert gen.write_stats.removed == 1
+    assert not orders.exists()
+
+
+def test_cli_generate_prune(cli_app, tmp_path: Path) -> None:
+    _generate(tmp_path, ["/users", "/orders"])
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(_spec(["/users"])))
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(spec),
+            "--out",
+            str(tmp_path / "api.http"),
+            "--filemode",
+            "multi",
+            "--no-env",
+            "--overwrite",
+            "--prune",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Files: 0 written, 1 unchanged, 1 removed" in result.output
+    assert not (tmp_path / "api" / "orders").exists()
@@ -0,0 +1,50 @@
+"""Tests for generating output in memory (iter_outputs / render_outputs)."""
+
+import json
+from pathlib import Path
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings
+
+
+def _written_files(root: Path, exclude: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): path.read_text()
+        for path in root.rglob("*")
+        if path.is_file() and path != exclude
+    }
+
+
+def test_render_outputs_single_matches_disk(sample_spec_path: Path, tmp_path: Path):
+    gen = HtttpFileGenerator(sample_spec_path)
+    # Build once so both renders use the same generated sample bodies
+    gen.build_requests()
+    outputs = gen.render_outputs("api.http")
+
+    gen.to_http_file(tmp_path / "api.http")
+    gen.to_env_files(
+        tmp_path / "http-client.env.json", tmp_path / "http-client.private.env.json"
+    )
+    assert outputs == _written_files(tmp_path, sample_spec_path)
+    assert not (tmp_path / "bodies").exists()
+
+
+def test_render_outputs_multi_puts_env_files_in_directory(sample_spec_path: Path):
+    gen = HtttpFileGenerator(
+        sample_spec_path, settings=HttpSettings(filemode=Filemode.MULTI)
+    )
+    outputs = gen.render_outputs("api.http", env_name="staging")
+    assert set(outputs) == {
+        "api/items/index.http",
+        "api/http-client.env.json",
+        "api/http-client.private.env.json",
+    }
+    assert "staging" in json.loads(outputs["api/http-client.env.json"])
+
+
+def test_iter_outputs_is_lazy_and_can_skip_env(sample_spec_path: Path):
+    gen = HtttpFileGenerator(sample_spec_path)
+    outputs = gen.iter_outputs("service.http", env_name=None)
+    # Nothing is built until the iterator is consumed
+    assert gen._requests is None
+    assert [name for name, _ in outputs] == ["service.http"]
@@ -0,0 +1,161 @@
+"""Tests for incremental regeneration based on per-operation fingerprints."""
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings
+from http_file_generator.models.http_file.request import HttpRequest
+
+
+def _spec(summary: str = "List users", with_orders: bool = True) -> dict:
+    paths: dict = {
+        "/users": {
+            "get": {"summary": summary, "responses": {"200": {"description": "OK"}}},
+            "post": {
+                "summary": "Create user",
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+    }
+    if with_orders:
+        paths["/orders"] = {
+            "get": {
+                "summary": "List orders",
+                "responses": {"200": {"description": "OK"}},
+            }
+        }
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Incremental", "version": "1.0"},
+        "paths": paths,
+    }
+
+
+@pytest.fixture()
+def built(monkeypatch) -> list[str]:
+    """Record every operation that is actually built into an HttpRequest."""
+    calls: list[str] = []
+    original = HttpRequest._operation_fields.__func__
+
+    def spy(cls, **kwargs):
+        calls.append(f"{kwargs['method']} {kwargs['path']}")
+        return original(cls, **kwargs)
+
+    monkeypatch.setattr(HttpRequest, "_operation_fields", classmethod(spy))
+    return calls
+
+
+def _generate(spec_file: Path, spec: dict, out: Path, **settings) -> HtttpFileGenerator:
+    spec_file.write_text(json.dumps(spec))
+    gen = HtttpFileGenerator(spec_file, settings=HttpSettings(**settings))
+    gen.to_http_file(out, incremental=True)
+    return gen
+
+
+class TestIncrementalSingle:
+    def test_first_run_builds_everything_and_writes_manifest(
+        self, tmp_path: Path, built: list[str]
+    ) -> None:
+        out = tmp_path / "api.http"
+        gen = _generate(tmp_path / "spec.json", _spec(), out)
+        assert len(built) == 3
+        assert gen.incremental_stats.added == 3
+        assert gen.manifest_path(out).exists()
+        # No samples are involved, so the output matches a full render
+        assert out.read_text() == gen.http_file.to_http_file()
+
+    def test_only_changed_operation_is_rebuilt(
+        self, tmp_path: Path, built: list[str]
+    ) -> None:
+        spec_file = tmp_path / "spec.json"
+        out = tmp_path / "api.http"
+        _generate(spec_file, _spec(), out)
+        built.clear()
+
+        gen = _generate(spec_file, _spec(summary="All users"), out)
+        assert built == ["GET /users"]
+        stats = gen.incremental_stats
+        assert (stats.added, stats.changed, stats.reused, stats.removed) == (
+            0,
+            1,
+            2,
+            0,
+        )
+        content = out.read_text()
+        assert "### Summary: All users" in content
+        assert "### Summary: List orders" in content
+
+    def test_removed_operation_drops_block(
+        self, tmp_path: Path, built: list[str]
+    ) -> None:
+        spec_file = tmp_path / "spec.json"
+        out = tmp_path / "api.http"
+        _generate(spec_file, _spec(), out)
+        built.clear()
+
+        gen = _generate(spec_file, _spec(with_orders=False), out)
+        assert built == []
+        assert gen.incremental_stats.removed == 1
+        assert "/orders" not in out.read_text()
+
+    def test_settings_change_rebuilds_everything(
+        self, tmp_path: Path, built: list[str]
+    ) -> None:
+        spec_file = tmp_path / "spec.json"
+        out = tmp_path / "api.http"
+        _generate(spec_file, _spec(), out)
+        built.clear()
+
+        _generate(spec_file, _spec(), out, include_examples=True)
+        assert len(built) == 3
+        assert "### Response Examples" in out.read_text()
+
+
+class TestIncrementalMulti:
+    def test_unchanged_files_are_not_rewritten(
+        self, tmp_path: Path, built: list[str]
+    ) -> None:
+        spec_file = tmp_path / "spec.json"
+        out = tmp_path / "api.http"
+        _generate(spec_file, _spec(), out, filemode=Filemode.MULTI)
+        users = tmp_path / "api" / "users" / "index.http"
+        orders = tmp_path / "api" / "orders" / "index.http"
+        assert users.exists() and orders.exists()
+        orders.write_text("untouched marker")
+
+        built.clear()
+        _generate(spec_file, _spec(summary="All users"), out, filemode=Filemode.MULTI)
+        assert built == ["GET /users"]
+        assert "### Summary: All users" in users.read_text()
+        assert orders.read_text() == "untouched marker"
+
+    def test_removed_path_file_is_deleted(self, tmp_path: Path) -> None:
+        spec_file = tmp_path / "spec.json"
+        out = tmp_path / "api.http"
+        _generate(spec_file, _spec(), out, filemode=Filemode.MULTI)
+        orders = tmp_path / "api" / "orders" / "index.http"
+        assert orders.exists()
+
+        _generate(spec_file, _spec(with_orders=False), out, filemode=Filemode.MULTI)
+        assert not orders.exists()
+
+
+def test_cli_generate_incremental(cli_app, tmp_path: Path) -> None:
+    spec_file = tmp_path / "spec.json"
+    spec_file.write_text(json.dumps(_spec()))
+    out = tmp_path / "api.http"
+    args = ["generate", str(spec_file), "--out", str(out), "--no-env", "--incremental"]
+
+    runner = CliRunner()
+    first = runner.invoke(cli_app, args)
+    assert first.exit_code == 0, first.output
+    assert "3 added" in first.output
+
+    # Second run succeeds without --overwrite and reuses everything
+    second = runner.invoke(cli_app, args)
+    assert second.exit_code == 0, second.output
+    assert "3 reused" in second.output
@@ -0,0 +1,33 @@
+"""Tests for MULTI mode rendering without re-validating request groups."""
+
+from pathlib import Path
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpFileData, HttpSettings
+
+
+def test_multi_mode_does_not_rebuild_http_file_data(
+    sample_spec_path: Path, tmp_path: Path, monkeypatch
+) -> None:
+    gen = HtttpFileGenerator(
+        sample_spec_path, settings=HttpSettings(filemode=Filemode.MULTI)
+    )
+
+    def fail(*args, **kwargs):
+        raise AssertionError("HttpFileData should not be constructed")
+
+    monkeypatch.setattr(HttpFileData, "__init__", fail)
+    gen.to_http_file(tmp_path / "api.http")
+
+    content = (tmp_path / "api" / "items" / "index.http").read_text()
+    assert "GET {{BASE_URL}}/items" in content
+    assert "POST {{BASE_URL}}/items" in content
+    assert gen._http_file is None
+
+
+def test_render_requests_matches_to_http_file(sample_spec_path: Path) -> None:
+    gen = HtttpFileGenerator(sample_spec_path)
+    data = gen.http_file
+    assert HttpFileData.render_requests(
+        data.requests, include_examples=True
+    ) == data.to_http_file(include_examples=True)
@@ -0,0 +1,142 @@
+"""Tests for operation subset selection (--tag, --path-glob, --operation-id, --method)."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import HttpSettings, OperationSelection
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Selection", "version": "1.0"},
+    "servers": [{"url": "https://api.example.com"}],
+    "paths": {
+        "/users": {
+            "get": {
+                "operationId": "listUsers",
+                "tags": ["users"],
+                "responses": {"200": {"description": "OK"}},
+            },
+            "post": {
+                "operationId": "createUser",
+                "tags": ["users", "admin"],
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+        "/orders/{id}": {
+            "get": {
+                "operationId": "getOrder",
+                "tags": ["orders"],
+                "parameters": [
+                    {
+                        "name": "id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string"},
+                    }
+                ],
+                "responses": {"200": {"description": "OK"}},
+            },
+        },
+    },
+}
+
+
+def _spec_file(tmp_path: Path) -> Path:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    return spec
+
+
+def _selected(tmp_path: Path, **selection) -> list[tuple[str, str]]:
+    settings = HttpSettings(selection=OperationSelection(**selection))
+    gen = HtttpFileGenerator(_spec_file(tmp_path), settings=settings)
+    return [(str(r.method), r.path.split("\n", 1)[0]) for r in gen.http_file.requests]
+
+
+class TestOperationSelection:
+    def test_empty_selection_keeps_everything(self, tmp_path: Path) -> None:
+        assert OperationSelection().is_empty
+        assert len(_selected(tmp_path)) == 3
+
+    def test_filter_by_tag(self, tmp_path: Path) -> None:
+        assert _selected(tmp_path, tags=["admin"]) == [("POST", "/users")]
+
+    def test_filter_by_path_glob(self, tmp_path: Path) -> None:
+        assert _selected(tmp_path, path_globs=["/orders/*"]) == [
+            ("GET", "/orders/{{id}}")
+        ]
+
+    def test_filter_by_operation_id(self, tmp_path: Path) -> None:
+        assert _selected(tmp_path, operation_ids=["listUsers", "getOrder"]) == [
+            ("GET", "/users"),
+            ("GET", "/orders/{{id}}"),
+        ]
+
+    def test_criteria_are_combined(self, tmp_path: Path) -> None:
+        assert _selected(tmp_path, tags=["users"], methods=["get"]) == [
+            ("GET", "/users")
+        ]
+
+    def test_unselected_operations_are_never_built(
+        self, tmp_path: Path, monkeypatch
+    ) -> None:
+        from http_file_generator.models.http_file.request import HttpRequest
+
+        built: list[str] = []
+        original = HttpRequest._operation_fields.__func__
+
+        def spy(cls, **kwargs):
+            built.append(f"{kwargs['method']} {kwargs['path']}")
+            return original(cls, **kwargs)
+
+        monkeypatch.setattr(HttpRequest, "_operation_fields", classmethod(spy))
+        _selected(tmp_path, operation_ids=["getOrder"])
+        assert built == ["GET /orders/{id}"]
+
+
+def test_cli_generate_with_filters(cli_app, tmp_path: Path) -> None:
+    out = tmp_path / "out.http"
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(_spec_file(tmp_path)),
+            "--out",
+            str(out),
+            "--no-env",
+            "--tag",
+            "users",
+            "--method",
+            "post",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    content = out.read_text()
+    assert "POST {{BASE_URL}}/users" in content
+    assert "GET {{BASE_URL}}/users" not in content
+    assert "/orders" not in content
+
+
+def test_cli_generate_rejects_unknown_method(cli_app, tmp_path: Path) -> None:
+    result = CliRunner().invoke(
+        cli_app,
+        ["generate", str(_spec_file(tmp_path)), "--method", "fetch", "--dry-run"],
+    )
+    assert result.exit_code != 0
+    assert "Unknown method" in result.output
+
+
+def test_cli_batch_with_filters(cli_app, tmp_path: Path) -> None:
+    spec = _spec_file(tmp_path)
+    result = CliRunner().invoke(
+        cli_app,
+        ["batch", str(tmp_path), "--no-env", "--path-glob", "/orders/*"],
+    )
+    assert result.exit_code == 0, result.output
+    content = spec.with_suffix(".http").read_text()
+    assert "GET {{BASE_URL}}/orders/{{id}}" in content
+    assert "/users" not in content
@@ -0,0 +1,113 @@
+"""Tests for --progress (operations, throughput and ETA on stderr)."""
+
+import io
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator.models.utils import progress as progress_module
+from http_file_generator.models.utils.progress import (
+    ProgressCounter,
+    ProgressDisplay,
+    count_operation,
+    track_progress,
+)
+
+
+class _Terminal(io.StringIO):
+    def isatty(self) -> bool:
+        return True
+
+
+def test_counter_throughput_and_eta():
+    counter = ProgressCounter(total_specs=4, total_operations=1000)
+    counter.start = 100.0
+    assert counter.eta(now=101.0) is None
+    counter.add_operations(250)
+    counter.finish_spec()
+    # 250 operations in 10s: 750 more take 30s
+    assert counter.eta(now=110.0) == 30.0
+    assert counter.describe(now=110.0) == (
+        "1/4 specs, 250/1,000 operations, 25 ops/s, ETA 0:30, elapsed 0:10"
+    )
+
+
+def test_eta_falls_back_to_specs():
+    counter = ProgressCounter(total_specs=3)
+    counter.start = 0.0
+    counter.finish_spec(operations=40)
+    assert counter.eta(now=5.0) == 10.0
+    assert counter.operations == 40
+
+
+def test_phase_until_begin():
+    counter = ProgressCounter(phase="loading spec")
+    counter.start = 0.0
+    assert counter.describe(now=65.0) == "loading spec, elapsed 1:05"
+    counter.begin(total_operations=10)
+    assert counter.describe().startswith("0/10 operations")
+
+
+def test_count_operation_only_while_tracked():
+    counter = ProgressCounter()
+    count_operation()
+    with track_progress(counter):
+        count_operation()
+        count_operation()
+    assert counter.operations == 2
+
+
+def test_display_appends_lines_outside_a_terminal(monkeypatch):
+    monkeypatch.setattr(progress_module, "LOG_INTERVAL", 0.01)
+    stream = io.StringIO()
+    counter = ProgressCounter(total_operations=10)
+    with ProgressDisplay(counter, stream=stream):
+        counter.add_operations(5)
+        time.sleep(0.05)
+    lines = stream.getvalue().splitlines()
+    assert lines and all(line.startswith("Progress: ") for line in lines)
+    assert "\r" not in stream.getvalue()
+
+
+def test_display_redraws_in_place_on_a_terminal(monkeypatch):
+    monkeypatch.setattr(progress_module, "TTY_INTERVAL", 0.01)
+    stream = _Terminal()
+    with ProgressDisplay(ProgressCounter(), stream=stream) as display:
+        time.sleep(0.05)
+        with display.suspended():
+            stream.write("message\n")
+            erased = stream.getvalue()
+        time.sleep(0.05)
+    assert erased.endswith("\r\x1b[Kmessage\n")
+    # The line is erased when the display stops
+    assert stream.getvalue().endswith("\r\x1b[K")
+
+
+def test_generate_progress(cli_app, sample_spec_path: Path, tmp_path: Path):
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(sample_spec_path),
+            "--out",
+            str(tmp_path / "api.http"),
+            "--no-env",
+            "--quiet",
+            "--progress",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Progress: 2/2 operations" in result.output
+
+
+def test_batch_progress(cli_app, sample_spec_path: Path, tmp_path: Path):
+    root = tmp_path / "specs"
+    root.mkdir()
+    for name in ("a", "b"):
+        (root / f"{name}.yaml").write_text(sample_spec_path.read_text())
+    result = CliRunner().invoke(
+        cli_app, ["batch", str(root), "--jobs", "2", "--progress"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Progress: 2/2 specs, 4 operations" in result.output
@@ -0,0 +1,51 @@
+"""Tests for the compiled per-editor-mode renderers."""
+
+from pathlib import Path
+
+import pytest
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import EditorMode, HttpFileData
+from http_file_generator.models.http_file.renderer import (
+    RENDERERS,
+    HttpRenderer,
+    get_renderer,
+)
+
+
+def test_every_editor_mode_has_a_renderer() -> None:
+    assert set(RENDERERS) == set(EditorMode)
+    for mode, renderer in RENDERERS.items():
+        assert issubclass(renderer, HttpRenderer)
+        assert renderer.editor_mode == mode
+
+
+def test_get_renderer_compiles_once_per_options() -> None:
+    renderer = get_renderer(EditorMode.KULALA, include_examples=True)
+    assert get_renderer(EditorMode.KULALA, include_examples=True) is renderer
+    assert get_renderer(EditorMode.KULALA) is not renderer
+    assert renderer.file_prefix.startswith("# Kulala.nvim HTTP file")
+
+
+def test_default_renderer_has_no_header() -> None:
+    assert get_renderer(EditorMode.DEFAULT).file_prefix == ""
+    assert get_renderer(EditorMode.DEFAULT).render_file([]) == ""
+
+
+@pytest.mark.parametrize("editor_mode", list(EditorMode))
+def test_render_file_matches_http_file_data(
+    sample_spec_path: Path, editor_mode: EditorMode
+) -> None:
+    requests = HtttpFileGenerator(sample_spec_path).http_file.requests
+    renderer = get_renderer(editor_mode, include_examples=True, include_schema=True)
+    assert renderer.render_file(requests) == HttpFileData.render_requests(
+        requests, include_examples=True, include_schema=True, editor_mode=editor_mode
+    )
+
+
+def test_base_url_is_part_of_the_compiled_request_line(
+    sample_spec_path: Path,
+) -> None:
+    request = HtttpFileGenerator(sample_spec_path).requests[0]
+    block = get_renderer(base_url="https://api.example.com").render_request(request)
+    assert f"{request.method} https://api.example.com{request.path}\n" in block
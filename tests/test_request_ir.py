@@ -0,0 +1,86 @@
+"""Tests for the compact internal request representation."""
+
+import json
+
+import pytest
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import HttpRequest, HttpVariable
+from http_file_generator.models.enums import METHOD
+from http_file_generator.models.http_file.ir import RequestIR
+from http_file_generator.models.http_file.var import VariableIR
+
+
+def _fields(variable=HttpVariable) -> dict:
+    return dict(
+        method=METHOD.POST,
+        path="/users/{{id}}",
+        headers={"Content-Type": "application/json"},
+        body={"name": "x"},
+        summary="Create",
+        description="Line one\nLine two",
+        params=[variable(name="id", value="1", description="User id")],
+        request_examples=[{"content_type": "application/json", "value": {"a": 1}}],
+        response_examples=[
+            {"status": "201", "content_type": None, "name": None, "value": None}
+        ],
+    )
+
+
+def test_request_ir_is_slotted() -> None:
+    ir = RequestIR(**_fields(VariableIR))
+    assert not hasattr(ir, "__dict__")
+    with pytest.raises(AttributeError):
+        ir.unknown = 1  # type: ignore[attr-defined]
+
+
+def test_request_ir_renders_like_http_request() -> None:
+    ir = RequestIR(**_fields(VariableIR))
+    model = HttpRequest(**_fields())
+    for kwargs in ({}, {"include_examples": True, "include_schema": True}):
+        assert ir.to_http_file(base_url="{{BASE_URL}}", **kwargs) == (
+            model.to_http_file(base_url="{{BASE_URL}}", **kwargs)
+        )
+
+
+def test_to_model_returns_validated_request() -> None:
+    model = RequestIR(**_fields(VariableIR)).to_model()
+    assert isinstance(model, HttpRequest)
+    assert model == HttpRequest(**_fields())
+    assert all(type(param) is HttpVariable for param in model.params)
+
+
+def test_generator_builds_ir_and_validates_only_on_access(sample_spec_path) -> None:
+    gen = HtttpFileGenerator(sample_spec_path)
+    assert all(isinstance(r, RequestIR) for r in gen.requests)
+    assert gen._http_file is None
+    models = gen.http_file.requests
+    assert [m.method for m in models] == [r.method for r in gen.requests]
+
+
+def test_generator_builds_params_as_variable_ir(tmp_path) -> None:
+    string = {"schema": {"type": "string"}}
+    spec = {
+        "openapi": "3.0.3",
+        "info": {"title": "Params", "version": "1.0"},
+        "paths": {
+            "/users/{id}": {
+                "get": {
+                    "parameters": [
+                        {"name": "id", "in": "path", "required": True, **string},
+                        {"name": "q", "in": "query", "description": "Q", **string},
+                        {"name": "X-Trace", "in": "header", **string},
+                    ],
+                    "responses": {"200": {"description": "OK"}},
+                }
+            }
+        },
+    }
+    path = tmp_path / "api.json"
+    path.write_text(json.dumps(spec))
+    gen = HtttpFileGenerator(path)
+    params = [param for request in gen.requests for param in request.params]
+    assert params and all(isinstance(param, VariableIR) for param in params)
+    assert [str(param) for param in params] == [
+        str(param) for model in gen.http_file.requests for param in model.params
+    ]
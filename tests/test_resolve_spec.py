@@ -0,0 +1,80 @@
+"""Tests for validating and resolving parsed specs."""
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.http_file_generator import resolve_spec
+
+
+def test_yaml_spec_with_external_refs_is_resolved(tmp_path: Path) -> None:
+    (tmp_path / "common.yaml").write_text(
+        textwrap.dedent(
+            """
+            Item:
+              type: object
+              properties:
+                name:
+                  type: string
+            """
+        )
+    )
+    spec = tmp_path / "api.yaml"
+    spec.write_text(
+        textwrap.dedent(
+            """
+            openapi: 3.0.3
+            info:
+              title: YAML
+              version: '1.0'
+            paths:
+              /items:
+                post:
+                  requestBody:
+                    content:
+                      application/json:
+                        schema:
+                          $ref: 'common.yaml#/Item'
+                  responses:
+                    '200':
+                      description: OK
+            """
+        )
+    )
+    gen = HtttpFileGenerator(spec)
+    body = gen.requests[0].body
+    assert list(body) == ["name"] and isinstance(body["name"], str)
+
+
+def test_openapi_31_features_are_retried_as_31() -> None:
+    data = {
+        "openapi": "3.0.3",
+        "info": {"title": "Nullable", "version": "1.0"},
+        "paths": {
+            "/items": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {
+                                "application/json": {
+                                    "schema": {"type": ["string", "null"]}
+                                }
+                            },
+                        }
+                    }
+                }
+            }
+        },
+    }
+    resolved = resolve_spec(data)
+    assert resolved["openapi"] == "3.1.0"
+    assert "/items" in resolved["paths"]
+
+
+def test_invalid_spec_reports_validation_error() -> None:
+    data = {"openapi": "3.0.0", "info": {"title": "Broken"}, "paths": {}}
+    with pytest.raises(ValueError, match="OpenAPI validation failed"):
+        resolve_spec(data)
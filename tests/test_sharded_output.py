@@ -0,0 +1,125 @@
+"""Tests for SHARDED filemode (tag, prefix and size bounded .http shards)."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import Filemode, HttpSettings, ShardBy
+from http_file_generator.models.utils.sharding import shard_filename, split_blocks
+
+
+def _operation(tag: str | None) -> dict:
+    operation: dict = {"responses": {"200": {"description": "OK"}}}
+    if tag:
+        operation["tags"] = [tag]
+    return operation
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Shards", "version": "1.0"},
+    "paths": {
+        "/users": {"get": _operation("users"), "post": _operation("users")},
+        "/users/{id}/orders": {
+            "parameters": [
+                {
+                    "name": "id",
+                    "in": "path",
+                    "required": True,
+                    "schema": {"type": "string"},
+                }
+            ],
+            "get": _operation("orders"),
+        },
+        "/orders": {"get": _operation("orders")},
+        "/health": {"get": _operation(None)},
+    },
+}
+
+
+def _shard(tmp_path: Path, **settings) -> tuple[Path, dict]:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    gen = HtttpFileGenerator(
+        spec, settings=HttpSettings(filemode=Filemode.SHARDED, **settings)
+    )
+    gen.to_http_file(tmp_path / "api.http")
+    out_dir = tmp_path / "api"
+    return out_dir, json.loads((out_dir / "index.json").read_text())
+
+
+def test_shard_by_tag(tmp_path: Path) -> None:
+    out_dir, index = _shard(tmp_path)
+    assert [(s["file"], s["requests"]) for s in index["shards"]] == [
+        ("users.http", 2),
+        ("orders.http", 2),
+        ("untagged.http", 1),
+    ]
+    assert index["requests"] == 5
+    orders = (out_dir / "orders.http").read_text()
+    assert "GET {{BASE_URL}}/orders" in orders
+    assert "### Request: GET /users/{id}/orders" in orders
+    for shard in index["shards"]:
+        assert (out_dir / shard["file"]).stat().st_size == shard["bytes"]
+
+
+def test_shard_by_prefix(tmp_path: Path) -> None:
+    _, index = _shard(tmp_path, shard_by=ShardBy.PREFIX)
+    assert [s["key"] for s in index["shards"]] == ["users", "orders", "health"]
+
+    _, index = _shard(tmp_path, shard_by=ShardBy.PREFIX, shard_prefix_depth=2)
+    assert [s["key"] for s in index["shards"]] == [
+        "users",
+        "users/{id}",
+        "orders",
+        "health",
+    ]
+
+
+def test_size_limits_split_shards_and_remove_stale_files(tmp_path: Path) -> None:
+    out_dir, index = _shard(tmp_path, shard_by=ShardBy.SIZE, shard_max_requests=2)
+    assert [(s["file"], s["requests"]) for s in index["shards"]] == [
+        ("requests.http", 2),
+        ("requests-2.http", 2),
+        ("requests-3.http", 1),
+    ]
+
+    _shard(tmp_path, shard_by=ShardBy.SIZE, shard_max_requests=3)
+    assert not (out_dir / "requests-3.http").exists()
+    assert (out_dir / "requests-2.http").exists()
+
+
+def test_split_blocks_by_bytes() -> None:
+    parts = list(split_blocks(["aaaa", "bb", "cccccc", "d"], max_bytes=6))
+    assert parts == [["aaaa", "bb"], ["cccccc"], ["d"]]
+
+
+def test_shard_filename_is_safe_and_unique() -> None:
+    taken: set[str] = set()
+    assert shard_filename("Pet Store/v1", taken) == "Pet_Store_v1.http"
+    assert shard_filename("Pet Store/v1", taken) == "Pet_Store_v1-2.http"
+    assert shard_filename("///", taken) == "shard.http"
+
+
+def test_cli_generate_sharded(cli_app, tmp_path: Path) -> None:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    result = CliRunner().invoke(
+        cli_app,
+        [
+            "generate",
+            str(spec),
+            "--out",
+            str(tmp_path / "api.http"),
+            "--no-env",
+            "--filemode",
+            "sharded",
+            "--shard-by",
+            "prefix",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "api" / "users.http").exists()
+    assert (tmp_path / "api" / "index.json").exists()
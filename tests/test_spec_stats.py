@@ -0,0 +1,141 @@
+"""Tests for the spec statistics used by the `stats` command."""
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from http_file_generator.models.utils.spec_stats import compute_spec_stats
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Stats", "version": "1.0"},
+    "paths": {
+        "/nodes": {
+            "get": {
+                "tags": ["tree"],
+                "parameters": [
+                    {
+                        "name": "kind",
+                        "in": "query",
+                        "schema": {"type": "string", "enum": ["a", "b", "c"]},
+                    },
+                    {
+                        "name": "limit",
+                        "in": "query",
+                        "example": 5,
+                        "schema": {"type": "integer"},
+                    },
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Node"}
+                            }
+                        },
+                    }
+                },
+            },
+            "post": {
+                "requestBody": {
+                    "content": {
+                        "application/json": {
+                            "schema": {"$ref": "#/components/schemas/Node"}
+                        }
+                    }
+                },
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+        "/ping": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {"text/plain": {"example": "pong"}},
+                    }
+                }
+            }
+        },
+    },
+    "components": {
+        "schemas": {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Node"},
+                    },
+                    "meta": {"$ref": "#/components/schemas/Meta"},
+                },
+            },
+            "Meta": {
+                "type": "object",
+                "properties": {"color": {"type": "string", "enum": ["r", "g"]}},
+            },
+        }
+    },
+}
+
+
+def test_counts_and_recursion() -> None:
+    stats = compute_spec_stats(SPEC)
+    assert stats["paths"] == 2
+    assert stats["operations"]["total"] == 3
+    assert stats["operations"]["by_method"] == {"GET": 2, "POST": 1}
+    assert stats["operations"]["by_tag"] == {"(untagged)": 2, "tree": 1}
+    assert stats["schemas"]["components"] == 2
+    assert stats["schemas"]["recursive"] == ["Node"]
+    assert stats["schemas"]["max_depth"] >= 3
+
+
+def test_refs_and_enums() -> None:
+    stats = compute_spec_stats(SPEC)
+    refs = stats["refs"]
+    assert refs["total"] == 4
+    assert refs["most_referenced"][0] == {
+        "ref": "#/components/schemas/Node",
+        "count": 3,
+    }
+    assert refs["max_fan_out"] == 2
+    enums = stats["enums"]
+    assert enums["count"] == 2
+    assert enums["max_size"] == 3
+    assert enums["largest"][0]["location"].endswith("/parameters/0/schema")
+
+
+def test_sampling_cost_ranks_operations() -> None:
+    stats = compute_spec_stats(SPEC, top=2)
+    sampling = stats["sampling"]
+    costs = {(op["method"], op["path"]): op for op in sampling["operations"]}
+    # Examples need no sampling
+    assert costs[("GET", "/ping")]["cost"] == 0
+    # Request bodies are sampled twice (body and request examples)
+    assert costs[("POST", "/nodes")]["sampled_schemas"] == 2
+    # Only the parameter without an example is sampled, plus the response
+    assert costs[("GET", "/nodes")]["sampled_schemas"] == 2
+    assert len(sampling["top_operations"]) == 2
+    assert sampling["top_operations"][0]["path"] == "/nodes"
+    assert sampling["total_cost"] == sum(op["cost"] for op in sampling["operations"])
+
+
+def test_cli_stats_json(cli_app, tmp_path: Path) -> None:
+    spec = tmp_path / "spec.json"
+    spec.write_text(json.dumps(SPEC))
+    result = CliRunner().invoke(cli_app, ["stats", str(spec), "--json", "--top", "1"])
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)
+    assert payload["operations"]["total"] == 3
+    assert len(payload["sampling"]["top_operations"]) == 1
+
+
+def test_cli_stats_text(cli_app, sample_spec_path: Path) -> None:
+    result = CliRunner().invoke(cli_app, ["stats", str(sample_spec_path)])
+    assert result.exit_code == 0, result.output
+    assert "Operations: 2" in result.output
+    assert "most expensive operations" in result.output
@@ -0,0 +1,56 @@
+"""Tests for chunked rendering of .http output into text streams."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from http_file_generator import HtttpFileGenerator
+from http_file_generator.models import EditorMode, HttpFileData, HttpSettings
+
+
+@pytest.mark.parametrize("editor_mode", list(EditorMode))
+def test_render_into_matches_to_http_file(
+    sample_spec_path: Path, editor_mode: EditorMode
+) -> None:
+    http_file = HtttpFileGenerator(sample_spec_path).http_file
+    expected = http_file.to_http_file(
+        include_examples=True, include_schema=True, editor_mode=editor_mode
+    )
+
+    stream = io.StringIO()
+    http_file.render_into(
+        stream, include_examples=True, include_schema=True, editor_mode=editor_mode
+    )
+    assert stream.getvalue() == expected
+
+
+def test_request_render_into_matches_to_http_file(sample_spec_path: Path) -> None:
+    for request in HtttpFileGenerator(sample_spec_path).http_file.requests:
+        stream = io.StringIO()
+        request.render_into(stream, "{{BASE_URL}}", include_examples=True)
+        assert stream.getvalue() == request.to_http_file(
+            "{{BASE_URL}}", include_examples=True
+        )
+
+
+@pytest.mark.parametrize("editor_mode", [EditorMode.DEFAULT, EditorMode.KULALA])
+def test_iter_blocks_matches_join_blocks(editor_mode: EditorMode) -> None:
+    for blocks in ([], ["a"], ["a", "b", "c"]):
+        assert "".join(
+            HttpFileData.iter_blocks(blocks, editor_mode=editor_mode)
+        ) == HttpFileData.join_blocks(blocks, editor_mode=editor_mode)
+
+
+def test_single_file_is_streamed_without_building_request_list(
+    sample_spec_path: Path, tmp_path: Path
+) -> None:
+    gen = HtttpFileGenerator(sample_spec_path, settings=HttpSettings())
+    out = tmp_path / "out.http"
+    gen.to_http_file(out)
+
+    # Requests are rendered as they are built, not collected first
+    assert gen._requests is None
+    content = out.read_text()
+    assert content.count("### Request: ") == len(gen.http_file.requests)
+    assert "GET {{BASE_URL}}/items" in content
@@ -0,0 +1,373 @@
+"""Tests for the watch command and the file watcher behind it."""
+
+import json
+import os
+import re
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from http_file_generator import watch
+from http_file_generator.http_file_generator import local_dependencies, read_spec
+from http_file_generator.models import HttpSettings
+from http_file_generator.models.settings.settings import Filemode
+from http_file_generator.models.utils.watcher import FileWatcher
+from http_file_generator.watch import Regeneration, WatchSession, find_specs
+
+SPEC = textwrap.dedent(
+    """
+    openapi: 3.0.3
+    info:
+      title: Watched
+      version: '1.0'
+    servers:
+      - url: https://api.example.com
+    paths:
+      /errors:
+        post:
+          requestBody:
+            content:
+              application/json:
+                schema:
+                  $ref: 'common.yaml#/components/schemas/Error'
+          responses:
+            '200':
+              description: OK
+      /health:
+        get:
+          responses:
+            '200':
+              description: OK
+    """
+)
+
+
+WRAPPED = textwrap.dedent(
+    """
+      /wrapped:
+        get:
+          responses:
+            '200':
+              description: OK
+              content:
+                application/json:
+                  schema:
+                    $ref: '#/components/schemas/Wrapper'
+    components:
+      schemas:
+        Wrapper:
+          type: object
+          properties:
+            error:
+              $ref: 'common.yaml#/components/schemas/Error'
+    """
+).lstrip("\n")
+
+
+def _common(*fields: str) -> str:
+    properties = "".join(
+        f"        {field}:\n          type: string\n" for field in fields
+    )
+    return (
+        "components:\n  schemas:\n    Error:\n      type: object\n"
+        f"      properties:\n{properties}"
+    )
+
+
+def _write_watched_spec(root: Path) -> Path:
+    """Write SPEC and the common.yaml it $refs, and return the spec."""
+    (root / "common.yaml").write_text(_common("message"))
+    spec = root / "api.yaml"
+    spec.write_text(SPEC)
+    return spec
+
+
+def _replace(path: Path, content: str) -> None:
+    """Save like editors that write a new file and rename it over the old."""
+    temp = path.with_name(f".{path.name}.swp")
+    temp.write_text(content)
+    os.replace(temp, path)
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watcher_reports_replaced_file(tmp_path: Path, polling: bool):
+    spec = _write_watched_spec(tmp_path)
+    with FileWatcher([spec], polling=polling, poll_interval=0.02) as watcher:
+        threading.Timer(0.05, _replace, (spec, SPEC + "\n")).start()
+        assert watcher.wait(debounce=0.05) == {spec.resolve()}
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watcher_debounces_a_burst_of_saves(tmp_path: Path, polling: bool):
+    spec = _write_watched_spec(tmp_path)
+
+    def burst() -> None:
+        for i in range(5):
+            spec.write_text(SPEC + "\n" * (i + 1))
+            time.sleep(0.02)
+
+    with FileWatcher([spec], polling=polling, poll_interval=0.01) as watcher:
+        threading.Timer(0.05, burst).start()
+        assert watcher.wait(debounce=0.2) == {spec.resolve()}
+        stop = threading.Event()
+        stop.set()
+        assert watcher.wait(debounce=0.2, stop=stop) == set()
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watcher_ignores_files_not_matching_patterns(tmp_path: Path, polling: bool):
+    with FileWatcher(
+        [], [tmp_path], ["*.yaml"], polling=polling, poll_interval=0.02
+    ) as watcher:
+
+        def write() -> None:
+            (tmp_path / "api.http").write_text("GET /\n")
+            time.sleep(0.05)
+            (tmp_path / "new.yaml").write_text(SPEC)
+
+        threading.Timer(0.05, write).start()
+        assert watcher.wait(debounce=0.05) == {(tmp_path / "new.yaml").resolve()}
+
+
+def test_local_dependencies_follow_refs_transitively(tmp_path: Path):
+    spec = _write_watched_spec(tmp_path)
+    (tmp_path / "common.yaml").write_text(
+        _common("message")
+        + "    Detail:\n      $ref: 'nested/detail.yaml#/Detail'\n"
+    )
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "detail.yaml").write_text(
+        "Detail:\n  $ref: 'https://example.com/remote.yaml#/Remote'\n"
+    )
+    assert local_dependencies(spec) == {
+        (tmp_path / "common.yaml").resolve(),
+        (tmp_path / "nested" / "detail.yaml").resolve(),
+    }
+
+
+def test_find_specs_skips_shared_documents_and_outputs(tmp_path: Path):
+    spec = _write_watched_spec(tmp_path)
+    (tmp_path / "broken.yaml").write_text("openapi: [broken")
+    (tmp_path / "http-client.env.json").write_text("{}")
+    (tmp_path / ".api.http.manifest.json").write_text("{}")
+    assert find_specs(tmp_path, ["*.yaml", "*.json"]) == [
+        spec.resolve(),
+        (tmp_path / "broken.yaml").resolve(),
+    ]
+
+
+def test_session_regenerates_only_operations_a_dependency_edit_affects(
+    tmp_path: Path,
+):
+    spec = _write_watched_spec(tmp_path)
+    session = WatchSession(HttpSettings())
+    session.set_specs([spec])
+    first = session.regenerate(spec)
+    assert first.error is None and first.stats.added == 2
+    out = tmp_path / "api.http"
+    assert (tmp_path / "http-client.env.json").exists()
+
+    results: list[Regeneration] = []
+    updated = threading.Event()
+
+    def on_result(result: Regeneration) -> None:
+        results.append(result)
+        updated.set()
+
+    stop = threading.Event()
+    with FileWatcher(
+        session.watched_files(), polling=False, poll_interval=0.02
+    ) as watcher:
+        thread = threading.Thread(
+            target=session.run, args=(watcher, on_result, 0.05, stop)
+        )
+        thread.start()
+        try:
+            start = time.monotonic()
+            _replace(tmp_path / "common.yaml", _common("message", "detail"))
+            assert updated.wait(5)
+            assert time.monotonic() - start < 1
+        finally:
+            stop.set()
+            thread.join(5)
+
+    assert len(results) == 1
+    assert results[0].error is None
+    assert results[0].stats.changed == 1
+    assert results[0].stats.reused == 1
+    assert '"detail"' in out.read_text()
+
+
+@pytest.fixture()
+def resolved_paths(monkeypatch) -> list[list[str]]:
+    """The path items every resolve_spec call of a watch session resolves."""
+    calls: list[list[str]] = []
+    resolve_spec = watch.resolve_spec
+
+    def recording(data, base_url=None):
+        calls.append(list(data.get("paths") or {}))
+        return resolve_spec(data, base_url=base_url)
+
+    monkeypatch.setattr(watch, "resolve_spec", recording)
+    return calls
+
+
+def test_session_resolves_only_path_items_an_edit_reaches(
+    tmp_path: Path, resolved_paths: list[list[str]]
+):
+    spec = _write_watched_spec(tmp_path)
+    # /wrapped reaches common.yaml only through the spec's own components
+    _replace(spec, SPEC + WRAPPED)
+    session = WatchSession(HttpSettings(), env=False)
+    session.set_specs([spec])
+    assert session.regenerate(spec).error is None
+    assert resolved_paths == [["/errors", "/health", "/wrapped"]]
+
+    _replace(tmp_path / "common.yaml", _common("message", "detail"))
+    result = session.regenerate(spec)
+    assert result.error is None and result.stats.changed == 2
+    assert resolved_paths[-1] == ["/errors", "/wrapped"]
+
+    _replace(spec, spec.read_text().replace("description: OK", "description: Fine"))
+    assert session.regenerate(spec).stats.changed == 3
+    assert resolved_paths[-1] == ["/errors", "/health", "/wrapped"]
+
+    # Nothing changed at all: the loaded generator is reused as it is
+    assert session.regenerate(spec).stats.reused == 3
+    assert len(resolved_paths) == 3
+
+    # Anything outside paths reloads the whole spec
+    _replace(spec, spec.read_text().replace("title: Watched", "title: Renamed"))
+    assert session.regenerate(spec).error is None
+    assert resolved_paths[-1] == ["/errors", "/health", "/wrapped"]
+
+    fresh = tmp_path / "fresh"
+    fresh.mkdir()
+    WatchSession(HttpSettings(), out=fresh / "api.http", env=False).regenerate(spec)
+    # Sample values are random, everything else matches a cold load
+    samples = re.compile(r'": ".*"')
+    assert samples.sub("", (fresh / "api.http").read_text()) == samples.sub(
+        "", (tmp_path / "api.http").read_text()
+    )
+
+
+def test_session_keeps_last_good_spec_after_a_broken_edit(
+    tmp_path: Path, resolved_paths: list[list[str]]
+):
+    spec = _write_watched_spec(tmp_path)
+    session = WatchSession(HttpSettings(), env=False)
+    session.set_specs([spec])
+    assert session.regenerate(spec).error is None
+
+    health = "  /health:\n    get:\n      responses:\n"
+    _replace(spec, SPEC.replace(health, "  /health:\n    get: {}\n"))
+    assert session.regenerate(spec).error is not None
+    _replace(spec, SPEC.replace("/health", "/status"))
+    result = session.regenerate(spec)
+    assert result.error is None
+    assert result.stats.added == 1 and result.stats.removed == 1
+    assert resolved_paths[-1] == ["/status"]
+
+
+def test_session_regenerates_a_large_spec_within_a_second(tmp_path: Path):
+    spec = _write_watched_spec(tmp_path)
+    data = read_spec(spec)
+    for i in range(500):
+        data["paths"][f"/items{i}/{{id}}"] = {
+            "get": {
+                "parameters": [
+                    {
+                        "name": "id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string"},
+                    }
+                ],
+                "responses": {"200": {"description": "OK"}},
+            }
+        }
+    spec = tmp_path / "api.json"
+    spec.write_text(json.dumps(data))
+    session = WatchSession(HttpSettings(), env=False)
+    session.set_specs([spec])
+    first = session.regenerate(spec)
+    assert first.error is None
+
+    _replace(tmp_path / "common.yaml", _common("message", "detail"))
+    result = session.regenerate(spec)
+    assert result.error is None and result.stats.changed == 1
+    # Well within the sub-second goal, and far from reloading the spec
+    assert result.seconds < 1
+    assert result.seconds < first.seconds / 4
+
+
+def test_session_discovers_new_specs_and_reports_errors(tmp_path: Path):
+    (tmp_path / "common.yaml").write_text(_common("message"))
+    session = WatchSession(HttpSettings(filemode=Filemode.MULTI), env=False)
+    results: list[Regeneration] = []
+    done = threading.Event()
+
+    def on_result(result: Regeneration) -> None:
+        results.append(result)
+        if len(results) == 2:
+            done.set()
+
+    stop = threading.Event()
+    discover = lambda: find_specs(tmp_path, ["*.yaml"])  # noqa: E731
+    session.set_specs(discover())
+    assert session.specs == []
+    with FileWatcher(
+        [], [tmp_path], ["*.yaml"], polling=True, poll_interval=0.02
+    ) as watcher:
+        thread = threading.Thread(
+            target=session.run, args=(watcher, on_result, 0.05, stop, discover)
+        )
+        thread.start()
+        try:
+            (tmp_path / "api.yaml").write_text(SPEC)
+            time.sleep(0.3)
+            (tmp_path / "api.yaml").write_text("openapi: [broken")
+            assert done.wait(5)
+        finally:
+            stop.set()
+            thread.join(5)
+
+    assert results[0].error is None
+    assert results[0].output == (tmp_path / "api").resolve()
+    assert (tmp_path / "api" / "errors" / "index.http").exists()
+    assert results[1].error is not None
+
+
+def test_session_rejects_sharded_mode():
+    with pytest.raises(ValueError):
+        WatchSession(HttpSettings(filemode=Filemode.SHARDED))
+
+
+def test_watch_cli_validation(cli_app, tmp_path: Path):
+    runner = CliRunner()
+    result = runner.invoke(cli_app, ["watch", str(tmp_path / "missing.yaml")])
+    assert result.exit_code != 0
+    assert "Path not found" in result.output
+
+    result = runner.invoke(
+        cli_app, ["watch", str(tmp_path), "--out", str(tmp_path / "x.http")]
+    )
+    assert result.exit_code != 0
+    assert "--out" in result.output
+
+    result = runner.invoke(
+        cli_app, ["watch", str(tmp_path), "--filemode", "sharded"]
+    )
+    assert result.exit_code != 0
+    assert "SHARDED" in result.output
+
+    result = runner.invoke(
+        cli_app, ["watch", str(tmp_path), "--base-url", "not a url"]
+    )
+    assert result.exit_code == 1
+    assert isinstance(result.exception, SystemExit)
+    assert "Invalid settings" in result.output